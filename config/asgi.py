@@ -8,10 +8,13 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 
 import os
+import threading
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 from django.core.asgi import get_asgi_application
 from soundscore.urls.group import websocket_urlpatterns  # Direct import
+from soundscore.urls.notifications import websocket_urlpatterns as notification_websocket_urlpatterns
+from soundscore.services.autocomplete import get_autocomplete_index
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
@@ -19,7 +22,10 @@ application = ProtocolTypeRouter({
     "http": get_asgi_application(),
     "websocket": AuthMiddlewareStack(
         URLRouter(
-            websocket_urlpatterns
+            websocket_urlpatterns + notification_websocket_urlpatterns
         )
     ),
 })
+
+# Warm the typeahead index in the background so the first keystroke is fast
+threading.Thread(target=get_autocomplete_index, daemon=True).start()
@@ -51,6 +51,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'soundscore.middleware.SupabaseUserMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -149,8 +150,27 @@ AUTH_USER_MODEL = 'soundscore.User'
 
 LOGIN_URL = 'login'
 
+# Direct Postgres connection to the Supabase database, used only to apply the
+# SQL in supabase/migrations (functions, triggers and tables read over PostgREST)
+SUPABASE_DB_URL = config('SUPABASE_DB_URL', default='')
+SUPABASE_MIGRATIONS_DIR = BASE_DIR / 'supabase' / 'migrations'
+
 SPOTIFY_CLIENT_ID = config('SPOTIFY_CLIENT_ID')
 SPOTIFY_CLIENT_SECRET = config('SPOTIFY_CLIENT_SECRET')
+# Overridable so the client can be pointed at a local fake Spotify server
+SPOTIFY_API_URL = config('SPOTIFY_API_URL', default='https://api.spotify.com/v1')
+SPOTIFY_TOKEN_URL = config('SPOTIFY_TOKEN_URL', default='https://accounts.spotify.com/api/token')
+
+# Client-side rate limiting shared by all workers through Redis
+SPOTIFY_RATE_LIMIT = config('SPOTIFY_RATE_LIMIT', default=5, cast=float)  # requests per second
+SPOTIFY_RATE_BURST = config('SPOTIFY_RATE_BURST', default=10, cast=int)
+SPOTIFY_MAX_WAIT = config('SPOTIFY_MAX_WAIT', default=3, cast=float)  # seconds a request may spend waiting
+SPOTIFY_MAX_RETRIES = config('SPOTIFY_MAX_RETRIES', default=3, cast=int)
+
+# Spotify search results cache (in-process LRU, optionally shared through Redis)
+SPOTIFY_SEARCH_CACHE_TTL = config('SPOTIFY_SEARCH_CACHE_TTL', default=60 * 60 * 6, cast=int)
+SPOTIFY_SEARCH_CACHE_SIZE = config('SPOTIFY_SEARCH_CACHE_SIZE', default=512, cast=int)
+SPOTIFY_SEARCH_CACHE_REDIS = config('SPOTIFY_SEARCH_CACHE_REDIS', default=False, cast=bool)
 
 INSTALLED_APPS += ['channels']
 
@@ -160,15 +180,26 @@ ASGI_APPLICATION = 'soundscore.asgi.application'
 REDIS_HOST = os.environ.get('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.environ.get('REDIS_PORT', 6379))
 REDIS_PASSWORD = os.environ.get('REDIS_PASSWORD')
+REDIS_URL = f"rediss://default:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}"
 CHANNEL_LAYERS = {
     'default': {
         'BACKEND': 'channels_redis.core.RedisChannelLayer',
         'CONFIG': {
-            'hosts': [f"rediss://default:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}"],
+            'hosts': [REDIS_URL],
         },
     },
 }
 
+# Shared by every worker process, so cached lookups, refresh locks and
+# invalidations are seen by all of them rather than one process each
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'soundscore',
+    },
+}
+
 # Configuração opcional do REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
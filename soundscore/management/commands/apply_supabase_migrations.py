@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import psycopg2
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Same history table the Supabase CLI uses, so `supabase db push` and this
+# command agree on what has already been applied
+HISTORY_SQL = """
+CREATE SCHEMA IF NOT EXISTS supabase_migrations;
+CREATE TABLE IF NOT EXISTS supabase_migrations.schema_migrations (
+    version text PRIMARY KEY,
+    statements text[],
+    name text
+);
+"""
+
+# Arbitrary key for pg_advisory_lock so two deploys never apply in parallel
+LOCK_KEY = 7306148
+
+
+def _migration_files(directory):
+    """(version, name, path) for every supabase/migrations/<version>_<name>.sql, oldest first"""
+    files = []
+    for path in sorted(Path(directory).glob('*.sql')):
+        version, _, name = path.stem.partition('_')
+        if not version.isdigit():
+            raise CommandError(f"Migration file name must start with a numeric version: {path.name}")
+        files.append((version, name, path))
+    return files
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply the SQL in supabase/migrations (tables, triggers and RPCs the app "
+        "calls through PostgREST) to the Supabase Postgres database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help="Fail if any migration is pending instead of applying it")
+
+    def handle(self, *args, **options):
+        db_url = settings.SUPABASE_DB_URL
+        if not db_url:
+            if options['check']:
+                raise CommandError("SUPABASE_DB_URL is not set; it must point at the Supabase Postgres database")
+            # Lets the same startup command run where the Supabase schema is
+            # managed elsewhere (local development, preview environments)
+            self.stderr.write(self.style.WARNING("SUPABASE_DB_URL is not set; skipping Supabase migrations"))
+            return
+
+        migrations = _migration_files(settings.SUPABASE_MIGRATIONS_DIR)
+
+        try:
+            connection = psycopg2.connect(db_url)
+        except psycopg2.Error as e:
+            raise CommandError(f"Could not connect to the Supabase database: {e}")
+
+        try:
+            with connection, connection.cursor() as cursor:
+                cursor.execute(HISTORY_SQL)
+            with connection, connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(%s)", [LOCK_KEY])
+                cursor.execute("SELECT version FROM supabase_migrations.schema_migrations")
+                applied = {row[0] for row in cursor.fetchall()}
+
+            pending = [migration for migration in migrations if migration[0] not in applied]
+            if options['check']:
+                if pending:
+                    names = ", ".join(path.name for _, _, path in pending)
+                    raise CommandError(f"Pending Supabase migrations: {names}")
+                self.stdout.write(self.style.SUCCESS("Supabase schema is up to date"))
+                return
+
+            for version, name, path in pending:
+                # Each file and its history row commit together or not at all
+                try:
+                    with connection, connection.cursor() as cursor:
+                        cursor.execute(path.read_text())
+                        cursor.execute(
+                            "INSERT INTO supabase_migrations.schema_migrations (version, name) VALUES (%s, %s)",
+                            [version, name],
+                        )
+                except psycopg2.Error as e:
+                    raise CommandError(f"Supabase migration {path.name} failed: {e}")
+                self.stdout.write(f"Applied {path.name}")
+
+            self.stdout.write(self.style.SUCCESS(f"Applied {len(pending)} Supabase migration(s)"))
+        finally:
+            connection.close()
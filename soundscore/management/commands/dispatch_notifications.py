@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+from soundscore.services.feed.notification_queue import pop_batch, dispatch_batch
+
+
+# Seconds to wait after a failed iteration before polling again
+RETRY_DELAY = 5
+
+
+class Command(BaseCommand):
+    help = "Drain the notification queue in Redis and bulk insert into Supabase"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--timeout', type=int, default=5, help="Seconds to block waiting for events")
+        parser.add_argument('--once', action='store_true', help="Process the queue until it is empty, then exit")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self.stdout.write(f"Dispatching notifications in batches of {batch_size}")
+
+        while True:
+            # One bad batch or a Redis/Supabase outage must not kill the worker
+            try:
+                events = pop_batch(batch_size=batch_size, timeout=options['timeout'])
+                if not events:
+                    if options['once']:
+                        break
+                    continue
+
+                inserted, requeued, dead = dispatch_batch(events)
+                self.stdout.write(f"Inserted {inserted}, requeued {requeued}, dead-lettered {dead}")
+            except Exception as e:
+                self.stderr.write(f"Notification dispatch loop error: {e}")
+                if options['once']:
+                    raise
+                time.sleep(RETRY_DELAY)
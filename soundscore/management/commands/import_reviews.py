@@ -0,0 +1,84 @@
+import json
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from soundscore.services.user.supabase_client import authenticate_with_jwt
+from soundscore.services.user.user_lookup import get_supabase_user_id
+from soundscore.services.review.review_import import (
+    IMPORT_CHUNK_SIZE, ReviewImporter, detect_format, iter_review_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream reviews from a CSV or NDJSON export into a user's account"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or - for stdin")
+        parser.add_argument('--user', required=True, help="Username that will own the reviews")
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help="Defaults to the file extension")
+        parser.add_argument('--scale', type=float, default=5, help="Highest rating in the source (e.g. 10)")
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument('--overwrite', action='store_true', help="Replace reviews the user already has")
+        parser.add_argument('--checkpoint', help="File recording progress, to resume an interrupted import")
+
+    def handle(self, *args, **options):
+        client = authenticate_with_jwt()
+        if not client:
+            raise CommandError("Failed to authenticate with Supabase")
+
+        user_id = get_supabase_user_id(options['user'])
+        if not user_id:
+            raise CommandError(f"User '{options['user']}' not found")
+
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        checkpoint = options['checkpoint']
+        resume_from = self._read_checkpoint(checkpoint, path)
+        if resume_from:
+            self.stdout.write(f"Resuming after row {resume_from}")
+
+        importer = ReviewImporter(
+            client, user_id,
+            scale=options['scale'],
+            chunk_size=options['chunk_size'],
+            overwrite=options['overwrite'],
+        )
+
+        def report(importer):
+            self._write_checkpoint(checkpoint, path, importer.rows_done)
+            stats = importer.stats
+            self.stdout.write(
+                f"{importer.rows_done} rows: {stats['imported']} imported, {stats['existing']} already reviewed, "
+                f"{stats['unresolved']} unresolved, {stats['invalid']} invalid, {stats['duplicate']} duplicate"
+            )
+
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8-sig', newline='')
+        try:
+            stats = importer.run(iter_review_rows(stream, fmt), resume_from=resume_from, on_chunk=report)
+        except Exception as e:
+            raise CommandError(f"Import stopped after row {importer.rows_done}: {e}")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(self.style.SUCCESS(f"Imported {stats['imported']} review(s) from {stats['rows']} row(s)"))
+
+    def _read_checkpoint(self, checkpoint, path):
+        if not checkpoint or not os.path.exists(checkpoint):
+            return 0
+        with open(checkpoint) as f:
+            state = json.load(f)
+        if state.get('source') != os.path.abspath(path):
+            raise CommandError(f"Checkpoint {checkpoint} belongs to {state.get('source')}")
+        return int(state.get('rows_done', 0))
+
+    def _write_checkpoint(self, checkpoint, path, rows_done):
+        if not checkpoint:
+            return
+        tmp_path = f"{checkpoint}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'source': os.path.abspath(path), 'rows_done': rows_done}, f)
+        os.replace(tmp_path, checkpoint)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+from soundscore.services.user.supabase_client import authenticate_with_jwt
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-album rating aggregates from soundscore_review"
+
+    def handle(self, *args, **options):
+        client = authenticate_with_jwt()
+        if not client:
+            raise CommandError("Failed to authenticate with Supabase")
+
+        response = client.rpc('rebuild_album_stats', {}).execute()
+        rebuilt = response.data or 0
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating aggregates for {rebuilt} album(s)"))
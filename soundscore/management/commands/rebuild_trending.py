@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from soundscore.services.review.trending import rebuild_trending
+
+
+class Command(BaseCommand):
+    help = "Recompute the trending album rankings in Redis and age out old reviews"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0,
+                            help="Keep running and rebuild every N seconds (default: rebuild once)")
+
+    def handle(self, *args, **options):
+        while True:
+            ranked = rebuild_trending()
+            if "error" in ranked:
+                if not options['interval']:
+                    raise CommandError(ranked["error"])
+                self.stderr.write(ranked["error"])
+            else:
+                summary = ", ".join(f"{window}: {count}" for window, count in ranked.items())
+                self.stdout.write(self.style.SUCCESS(f"Rebuilt trending rankings ({summary})"))
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+from soundscore.services.user.supabase_client import authenticate_with_jwt
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-user review stats from soundscore_review"
+
+    def handle(self, *args, **options):
+        client = authenticate_with_jwt()
+        if not client:
+            raise CommandError("Failed to authenticate with Supabase")
+
+        response = client.rpc('rebuild_user_stats', {}).execute()
+        rebuilt = response.data or 0
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt review stats for {rebuilt} user(s)"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+from soundscore.services.user.supabase_client import authenticate_with_jwt
+
+
+class Command(BaseCommand):
+    help = "Recompute like_count and comment_count on every review and repair any drift"
+
+    def handle(self, *args, **options):
+        client = authenticate_with_jwt()
+        if not client:
+            raise CommandError("Failed to authenticate with Supabase")
+
+        response = client.rpc('reconcile_review_counters', {}).execute()
+        repaired = response.data or 0
+        self.stdout.write(self.style.SUCCESS(f"Repaired counters on {repaired} review(s)"))
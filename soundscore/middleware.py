@@ -0,0 +1,39 @@
+from .services.user.user_lookup import get_supabase_user_id
+
+SESSION_USER_ID_KEY = "supabase_user_id"
+SESSION_USERNAME_KEY = "supabase_username"
+
+
+class SupabaseUserMiddleware:
+    """
+    Resolves the logged-in user's soundscore_user id once per session and
+    exposes it as ``request.supabase_user_id`` (None for anonymous users).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.supabase_user_id = self.resolve(request)
+        return self.get_response(request)
+
+    def resolve(self, request):
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return None
+
+        session = request.session
+        # The username check catches renames made from the account page
+        if session.get(SESSION_USERNAME_KEY) == user.username and session.get(SESSION_USER_ID_KEY):
+            return session[SESSION_USER_ID_KEY]
+
+        try:
+            user_id = get_supabase_user_id(user.username)
+        except Exception as e:
+            print(f"Error resolving Supabase user id for {user.username}: {e}")
+            return None
+
+        if user_id is not None:
+            session[SESSION_USER_ID_KEY] = user_id
+            session[SESSION_USERNAME_KEY] = user.username
+        return user_id
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-18 09:04
+
+from django.db import migrations, models
+
+
+# The counter triggers and reconcile_review_counters() are Supabase objects;
+# their SQL lives in supabase/migrations (apply_supabase_migrations).
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soundscore', '0002_initial_schema'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+
+# The Supabase side (column, index, mark_notifications_read() and the
+# soundscore_notification_inbox view) lives in supabase/migrations.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soundscore', '0003_review_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='notifications_read_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-18 09:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# The trigger that maintains these aggregates and rebuild_album_stats() are
+# Supabase objects; their SQL lives in supabase/migrations.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soundscore', '0005_notification_read_watermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlbumStats',
+            fields=[
+                ('album', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='soundscore.album')),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('rating_1', models.PositiveIntegerField(default=0)),
+                ('rating_2', models.PositiveIntegerField(default=0)),
+                ('rating_3', models.PositiveIntegerField(default=0)),
+                ('rating_4', models.PositiveIntegerField(default=0)),
+                ('rating_5', models.PositiveIntegerField(default=0)),
+                ('avg_rating', models.FloatField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-avg_rating', '-rating_count'], name='albumstats_top_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 09:23
+
+from django.db import migrations, models
+
+
+# The same index on the Supabase table is created in supabase/migrations.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soundscore', '0006_album_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', 'id'], name='review_user_id_idx'),
+        ),
+    ]
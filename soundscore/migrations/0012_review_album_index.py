@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-18 09:26
+
+from django.db import migrations, models
+
+
+# The same index on the Supabase table is created in supabase/migrations.
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soundscore', '0011_user_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['album', '-created_at', '-id'], name='review_album_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 09:57
+
+from django.db import migrations, models
+
+
+# The Supabase column (with the catalog search index) is added in supabase/migrations.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soundscore', '0012_review_album_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='album',
+            name='release_date',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+    ]
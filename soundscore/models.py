@@ -31,6 +31,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    # Read watermark: notifications created before this are read
+    notifications_read_at = models.DateTimeField(blank=True, null=True)
     
     objects = UserManager()
     
@@ -45,6 +47,7 @@ class Album(models.Model):
     title = models.CharField(max_length=255)
     artist = models.CharField(max_length=255)
     cover_image = models.URLField(blank=True, null=True)
+    release_date = models.CharField(max_length=20, blank=True, null=True)
     
     def __str__(self):
         return f"{self.title} by {self.artist}"
@@ -57,11 +60,61 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_favorite = models.BooleanField(default=False)  # For marking favorite albums
+    # Denormalized counters, kept in sync by database triggers on likes/comments
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
     
     class Meta:
         # Ensure a user can only review an album once
         unique_together = ('user', 'album')
+        indexes = [
+            # Keyset pagination over one user's reviews
+            models.Index(fields=['user', 'id'], name='review_user_id_idx'),
+            # Profile pages, newest first, paginated by (created_at, id)
+            models.Index(fields=['user', '-created_at', '-id'], name='review_user_recent_idx'),
+            models.Index(fields=['user', '-created_at'], name='review_user_favorites_idx',
+                         condition=models.Q(is_favorite=True)),
+            # Album pages, same keyset
+            models.Index(fields=['album', '-created_at', '-id'], name='review_album_recent_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username}'s review of {self.album.title}"
-    
\ No newline at end of file
+    
+class UserStats(models.Model):
+    """Per-user review aggregates, maintained by a trigger on soundscore_review"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    favorite_count = models.PositiveIntegerField(default=0)
+    # Rating histogram
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Stats for {self.user.username}"
+
+class AlbumStats(models.Model):
+    """Per-album rating aggregates, maintained by a trigger on soundscore_review"""
+    album = models.OneToOneField(Album, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    # Rating histogram
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+    # Stored so top albums is an index scan instead of a full aggregate
+    avg_rating = models.FloatField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-avg_rating', '-rating_count'], name='albumstats_top_idx'),
+        ]
+
+    def __str__(self):
+        return f"Stats for {self.album.title}"
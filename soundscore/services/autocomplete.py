@@ -0,0 +1,207 @@
+import bisect
+import threading
+import unicodedata
+
+from django.db.models import Count
+
+# Keep scanning cost per keystroke bounded on very short, very common prefixes
+MAX_CANDIDATES = 400
+MAX_RESULTS = 20
+
+
+def normalize(text):
+    """Lowercase, accent-free form used for index keys and queries"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold().strip()
+
+
+def _full_key(label):
+    return " ".join(normalize(label).split())
+
+
+def _index_keys(label):
+    """The full label plus every word-start suffix, so "comp" finds "OK Computer" """
+    words = _full_key(label).split(" ")
+    return {" ".join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+class PrefixIndex:
+    """
+    In-memory typeahead index over albums, artists and users.
+
+    Keys live in one sorted list searched with bisect, so a lookup is two
+    binary searches plus a short scan. Each entry's popularity (number of
+    reviews) decides the ranking. Readers never lock; writers take a lock and
+    the list is only ever replaced or mutated under it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []          # sorted list of (key, kind, entry_id)
+        self._entries = {}       # (kind, entry_id) -> result dict
+        self._popularity = {}    # (kind, entry_id) -> int
+        self.built = False
+
+    # Building
+
+    def build(self, items):
+        """Replace the whole index with (kind, entry_id, label, extra, popularity) items"""
+        keys, entries, popularity = [], {}, {}
+        for kind, entry_id, label, extra, score in items:
+            ref = (kind, entry_id)
+            entries[ref] = {"type": kind, "id": entry_id, "label": label, **extra}
+            popularity[ref] = popularity.get(ref, 0) + score
+            keys.extend((key, kind, entry_id) for key in _index_keys(label))
+        keys.sort()
+        with self._lock:
+            self._keys, self._entries, self._popularity = keys, entries, popularity
+            self.built = True
+
+    # Incremental updates
+
+    def add(self, kind, entry_id, label, extra=None, popularity=0):
+        """Insert an entry, or update it in place (re-keying it if the label changed)"""
+        ref = (kind, entry_id)
+        with self._lock:
+            entry = self._entries.get(ref)
+            if entry is None:
+                self._popularity[ref] = popularity
+            elif _full_key(entry["label"]) != _full_key(label):
+                self._unindex(entry["label"], kind, entry_id)
+            else:
+                entry.update({"label": label, **(extra or {})})
+                return
+            self._entries[ref] = {**(entry or {}), "type": kind, "id": entry_id, "label": label, **(extra or {})}
+            for key in _index_keys(label):
+                bisect.insort(self._keys, (key, kind, entry_id))
+
+    def remove(self, kind, entry_id):
+        ref = (kind, entry_id)
+        with self._lock:
+            entry = self._entries.pop(ref, None)
+            self._popularity.pop(ref, None)
+            if entry is not None:
+                self._unindex(entry["label"], kind, entry_id)
+
+    def _unindex(self, label, kind, entry_id):
+        for key in _index_keys(label):
+            position = bisect.bisect_left(self._keys, (key, kind, entry_id))
+            if position < len(self._keys) and self._keys[position] == (key, kind, entry_id):
+                del self._keys[position]
+
+    def bump(self, kind, entry_id, delta=1):
+        ref = (kind, entry_id)
+        with self._lock:
+            if ref in self._popularity:
+                self._popularity[ref] = max(self._popularity[ref] + delta, 0)
+
+    # Lookup
+
+    def search(self, query, limit=8, kinds=None):
+        prefix = " ".join(normalize(query).split())
+        if not prefix:
+            return []
+        keys = self._keys
+        start = bisect.bisect_left(keys, (prefix,))
+
+        matches = {}
+        for key, kind, entry_id in keys[start:start + MAX_CANDIDATES]:
+            if not key.startswith(prefix):
+                break
+            if kinds and kind not in kinds:
+                continue
+            ref = (kind, entry_id)
+            # A match on the start of the full label ranks above a later word
+            entry = self._entries.get(ref)
+            full_match = entry is not None and key == _full_key(entry["label"])
+            matches[ref] = matches.get(ref, False) or full_match
+
+        ranked = sorted(
+            matches.items(),
+            key=lambda item: (item[1], self._popularity.get(item[0], 0)),
+            reverse=True,
+        )
+        results = []
+        for ref, _ in ranked[:min(limit, MAX_RESULTS)]:
+            entry = self._entries.get(ref)
+            if entry is not None:
+                results.append({**entry, "popularity": self._popularity.get(ref, 0)})
+        return results
+
+
+_index = PrefixIndex()
+_build_lock = threading.Lock()
+
+
+def _load_items():
+    from ..models import Album, User
+
+    albums = Album.objects.filter(spotify_id__isnull=False) \
+        .annotate(review_count=Count('reviews')) \
+        .values('spotify_id', 'title', 'artist', 'cover_image', 'review_count')
+    artists = {}
+    for album in albums:
+        yield ("album", album['spotify_id'], album['title'],
+               {"artist": album['artist'], "cover_url": album['cover_image']}, album['review_count'])
+        artists[album['artist']] = artists.get(album['artist'], 0) + album['review_count']
+    for artist, review_count in artists.items():
+        yield ("artist", normalize(artist), artist, {}, review_count)
+
+    # Users are keyed by username: the write hooks only know Supabase ids,
+    # which differ from the local ids, and the username is the same in both
+    users = User.objects.filter(is_active=True) \
+        .annotate(review_count=Count('reviews')) \
+        .values('username', 'profile_picture', 'review_count')
+    for user in users:
+        yield ("user", user['username'], user['username'],
+               {"profile_picture": user['profile_picture'] or None}, user['review_count'])
+
+
+def get_autocomplete_index():
+    """The process-wide index, built from the local database on first use"""
+    if not _index.built:
+        with _build_lock:
+            if not _index.built:
+                _index.build(_load_items())
+    return _index
+
+
+def rebuild_autocomplete_index():
+    _index.build(_load_items())
+    return _index
+
+
+def autocomplete(query, limit=8, kinds=None):
+    return get_autocomplete_index().search(query, limit=limit, kinds=kinds)
+
+
+# Write hooks; they are no-ops until the index has been built, since the
+# build reads the database and will pick the change up anyway
+
+def album_indexed(spotify_id, title, artist, cover_url=None):
+    if not _index.built or not spotify_id:
+        return
+    _index.add("album", spotify_id, title, {"artist": artist, "cover_url": cover_url})
+    if artist:
+        _index.add("artist", normalize(artist), artist)
+
+
+def review_indexed(spotify_id, artist, username, delta=1):
+    if not _index.built:
+        return
+    if spotify_id:
+        _index.bump("album", spotify_id, delta)
+    if artist:
+        _index.bump("artist", normalize(artist), delta)
+    if username:
+        _index.bump("user", username, delta)
+
+
+def user_indexed(username, profile_picture=None):
+    if _index.built and username:
+        _index.add("user", username, username, {"profile_picture": profile_picture})
+
+
+def user_removed(username):
+    if _index.built and username:
+        _index.remove("user", username)
@@ -0,0 +1,71 @@
+from collections import defaultdict
+
+
+class FeedAssembler:
+    """
+    Fills a page of feed reviews with the newest comments and the viewer's
+    liked flags. Like and comment counts come from the denormalized
+    ``like_count`` / ``comment_count`` columns on the review row.
+
+    Uses a fixed number of batched queries no matter how many reviews are on
+    the page; ``query_count`` tells how many a page actually cost.
+    """
+
+    def __init__(self, client, viewer_id=None, comments_per_review=3):
+        self.client = client
+        self.viewer_id = viewer_id
+        self.comments_per_review = comments_per_review
+        self.query_count = 0
+
+    def assemble(self, reviews):
+        review_ids = [review["id"] for review in reviews]
+        if not review_ids:
+            return reviews
+
+        comments_by_review = self._fetch_comments(review_ids)
+        liked_review_ids = self._fetch_viewer_likes(review_ids)
+
+        for review in reviews:
+            review_id = review["id"]
+            review["comments"] = comments_by_review.get(review_id, [])
+            review["is_liked"] = review_id in liked_review_ids
+
+        return reviews
+
+    def _fetch_comments(self, review_ids):
+        """
+        One query for the newest comments of every review on the page. The
+        per-review limit is applied by recent_review_comments() in the
+        database, so the result stays within page size * comments_per_review
+        rows and under PostgREST's max-rows cap.
+        """
+        comments_by_review = defaultdict(list)
+        if self.comments_per_review <= 0:
+            return comments_by_review
+        try:
+            self.query_count += 1
+            response = self.client.rpc("recent_review_comments", {
+                "p_review_ids": review_ids,
+                "p_per_review": self.comments_per_review,
+            }).select("*, soundscore_user(id, username, profile_picture)").execute()
+            for comment in response.data or []:
+                comments_by_review[comment["review_id"]].append(comment)
+        except Exception as e:
+            print(f"Error fetching feed comments: {e}")
+        return comments_by_review
+
+    def _fetch_viewer_likes(self, review_ids):
+        """One query for which of these reviews the viewer has liked"""
+        if not self.viewer_id:
+            return set()
+        try:
+            self.query_count += 1
+            response = self.client.table("soundscore_review_like") \
+                .select("review_id") \
+                .eq("user_id", self.viewer_id) \
+                .in_("review_id", review_ids) \
+                .execute()
+            return {like["review_id"] for like in response.data or []}
+        except Exception as e:
+            print(f"Error fetching feed likes: {e}")
+            return set()
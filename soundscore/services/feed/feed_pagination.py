@@ -0,0 +1,43 @@
+# Same (created_at, id) cursor as profile and album pages; decode_cursor
+# checks created_at is a timestamp before it is put into the or_() filter
+from ..review.review_pages import decode_cursor, encode_cursor
+
+# Only what a feed card shows: soundscore_user also holds password and email,
+# and feed pages are returned to the browser as JSON
+FEED_SELECT = (
+    'id, user_id, album_id, rating, text, created_at, like_count, comment_count, '
+    'soundscore_album(id, spotify_id, title, artist, cover_image), '
+    'soundscore_user(id, username, profile_picture)'
+)
+
+
+def fetch_feed_page(client, cursor=None, page_size=5, sort_order="desc"):
+    """
+    Fetch one feed page with keyset pagination on (created_at, id).
+
+    One extra row is requested to know whether another page exists, so every
+    page costs the same single query no matter how deep the user scrolls.
+    Returns (reviews, next_cursor, has_more).
+    """
+    desc = sort_order != "asc"
+    query = client.table('soundscore_review').select(FEED_SELECT)
+
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, review_id = position
+        op = "lt" if desc else "gt"
+        query = query.or_(
+            f'created_at.{op}."{created_at}",and(created_at.eq."{created_at}",id.{op}.{review_id})'
+        )
+
+    response = query \
+        .order('created_at', desc=desc) \
+        .order('id', desc=desc) \
+        .limit(page_size + 1) \
+        .execute()
+
+    rows = response.data or []
+    has_more = len(rows) > page_size
+    reviews = rows[:page_size]
+    next_cursor = encode_cursor(reviews[-1]) if reviews and has_more else None
+    return reviews, next_cursor, has_more
@@ -0,0 +1,124 @@
+import sqlite3
+
+
+def toggle_review_like(client, user_id, review_id):
+    """
+    Atomically flip the user's like on a review in one round trip.
+
+    Calls the ``toggle_review_like`` Postgres function, which locks the review
+    row, deletes or inserts the like and returns the new state together with
+    the trigger-maintained like_count and the review author.
+    Returns {"liked", "like_count", "author_id"} or {"error": ...}.
+    """
+    try:
+        response = client.rpc('toggle_review_like', {
+            'p_user_id': int(user_id),
+            'p_review_id': int(review_id),
+        }).execute()
+    except Exception as e:
+        print(f"Error toggling like: {e}")
+        return {"error": str(e)}
+
+    rows = response.data or []
+    if not rows or rows[0].get('author_id') is None:
+        return {"error": "Review not found"}
+
+    row = rows[0]
+    return {
+        "liked": bool(row['liked']),
+        "like_count": row['like_count'] or 0,
+        "author_id": row['author_id'],
+    }
+
+
+class SQLiteLikeStore:
+    """
+    Local stand-in for the ``toggle_review_like`` RPC, for tests and offline
+    development. Mirrors the Supabase tables it touches and gives the same
+    atomic behaviour through an immediate SQLite transaction. Pass
+    ``store.as_client()`` to ``toggle_review_like`` in place of a Supabase client.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS soundscore_review (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        like_count INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS soundscore_review_like (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        review_id INTEGER NOT NULL REFERENCES soundscore_review(id),
+        UNIQUE (user_id, review_id)
+    );
+    """
+
+    def __init__(self, path=":memory:"):
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.executescript(self.SCHEMA)
+
+    def add_review(self, review_id, author_id):
+        self.connection.execute(
+            "INSERT INTO soundscore_review (id, user_id) VALUES (?, ?)", (review_id, author_id)
+        )
+
+    def toggle(self, p_user_id, p_review_id):
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            review = cursor.execute(
+                "SELECT user_id FROM soundscore_review WHERE id = ?", (p_review_id,)
+            ).fetchone()
+            if review is None:
+                cursor.execute("COMMIT")
+                return []
+
+            cursor.execute(
+                "DELETE FROM soundscore_review_like WHERE user_id = ? AND review_id = ?",
+                (p_user_id, p_review_id),
+            )
+            if cursor.rowcount:
+                liked = False
+                cursor.execute(
+                    "UPDATE soundscore_review SET like_count = MAX(like_count - 1, 0) WHERE id = ?",
+                    (p_review_id,),
+                )
+            else:
+                liked = True
+                cursor.execute(
+                    "INSERT INTO soundscore_review_like (user_id, review_id) VALUES (?, ?)",
+                    (p_user_id, p_review_id),
+                )
+                cursor.execute(
+                    "UPDATE soundscore_review SET like_count = like_count + 1 WHERE id = ?",
+                    (p_review_id,),
+                )
+
+            like_count = cursor.execute(
+                "SELECT like_count FROM soundscore_review WHERE id = ?", (p_review_id,)
+            ).fetchone()[0]
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+        return [{"liked": liked, "like_count": like_count, "author_id": review[0]}]
+
+    def as_client(self):
+        """Minimal object exposing ``rpc(name, params).execute().data``"""
+        store = self
+
+        class _Call:
+            def __init__(self, name, params):
+                self.name, self.params = name, params
+
+            def execute(self):
+                if self.name != 'toggle_review_like':
+                    raise NotImplementedError(self.name)
+                return type("Response", (), {"data": store.toggle(**self.params)})()
+
+        class _Client:
+            def rpc(self, name, params):
+                return _Call(name, params)
+
+        return _Client()
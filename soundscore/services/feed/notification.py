@@ -1,4 +1,41 @@
 from ..user.supabase_client import authenticate_with_jwt
+from datetime import datetime
+from .notification_counter import (
+    get_cached_unread_count, set_unread_count,
+    notifications_created, notification_read, all_notifications_read,
+)
+
+
+def build_notification_row(recipient_id, actor_id, notification_type, review_id=None, comment_id=None, message=None):
+    """Build the soundscore_notification row for a notification event"""
+    # Ensure we have integer IDs
+    recipient_id = int(recipient_id) if recipient_id else None
+    actor_id = int(actor_id) if actor_id else None
+    review_id = int(review_id) if review_id else None
+    comment_id = int(comment_id) if comment_id else None
+    
+    if not message:
+        # Default messages based on notification type
+        if notification_type == 'like':
+            message = f"Someone liked your review!"
+        elif notification_type == 'comment':
+            message = f"Someone commented on your review!"
+    
+    notification_data = {
+        'recipient_id': recipient_id,
+        'actor_id': actor_id,
+        'notification_type': notification_type,
+        'message': message
+    }
+    
+    # Add optional fields only if they exist
+    if review_id:
+        notification_data['review_id'] = review_id
+    
+    if comment_id:
+        notification_data['comment_id'] = comment_id
+
+    return notification_data
 
 
 def create_notification(recipient_id, actor_id, notification_type, review_id=None, comment_id=None, message=None):
@@ -6,60 +43,83 @@ def create_notification(recipient_id, actor_id, notification_type, review_id=Non
     client = authenticate_with_jwt()
     
     try:
-        # Ensure we have integer IDs
-        recipient_id = int(recipient_id) if recipient_id else None
-        actor_id = int(actor_id) if actor_id else None
-        review_id = int(review_id) if review_id else None
-        comment_id = int(comment_id) if comment_id else None
-        
-        if not message:
-            # Default messages based on notification type
-            if notification_type == 'like':
-                message = f"Someone liked your review!"
-            elif notification_type == 'comment':
-                message = f"Someone commented on your review!"
-        
-        notification_data = {
-            'recipient_id': recipient_id,
-            'actor_id': actor_id,
-            'notification_type': notification_type,
-            'message': message
-        }
-        
-        # Add optional fields only if they exist
-        if review_id:
-            notification_data['review_id'] = review_id
-        
-        if comment_id:
-            notification_data['comment_id'] = comment_id
+        notification_data = build_notification_row(
+            recipient_id, actor_id, notification_type, review_id, comment_id, message
+        )
         
         # Insert into Supabase
         result = client.table('soundscore_notification').insert(notification_data).execute()
+        notifications_created(result.data or [])
         return result.data[0] if result.data else None
     except Exception as e:
         print(f"Notification creation error: {e}")
         print(f"Data that failed: {notification_data if 'notification_data' in locals() else 'Not created'}")
         return None
 
+
+def create_notifications_bulk(rows):
+    """Insert several prepared notification rows in one request"""
+    client = authenticate_with_jwt()
+    if not client:
+        raise RuntimeError("Failed to authenticate with Supabase")
+    result = client.table('soundscore_notification').insert(rows).execute()
+    notifications_created(result.data or [])
+    return result.data or []
+
+def _parse_timestamp(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def get_read_watermark(user_id, client=None):
+    """Return the user's notifications_read_at as an ISO string (or None)"""
+    client = client or authenticate_with_jwt()
+    result = client.table('soundscore_user').select('notifications_read_at').eq('id', int(user_id)).limit(1).execute()
+    return result.data[0].get('notifications_read_at') if result.data else None
+
+
+def is_notification_read(notification, watermark):
+    """A notification is read if it has its own flag or predates the watermark"""
+    if notification.get('is_read'):
+        return True
+    created_at = _parse_timestamp(notification.get('created_at'))
+    read_at = _parse_timestamp(watermark)
+    return bool(created_at and read_at and created_at <= read_at)
+
+
+_NOTIFICATION_EMBEDS = (
+    '*, soundscore_user!actor_id(*), soundscore_review!review_id(*), soundscore_comment!comment_id(*)'
+)
+
+
 def get_user_notifications(user_id, limit=20, offset=0, unread_only=False):
     """Get notifications for a user with proper joins"""
     client = authenticate_with_jwt()
     try:
         user_id = int(user_id)
-        
-        # Use the correct join syntax - table name must match exactly
-        query = client.table('soundscore_notification').select('''
-            *,
-            soundscore_user!actor_id(*),
-            soundscore_review!review_id(*),
-            soundscore_comment!comment_id(*)
-        ''').eq('recipient_id', user_id).order('created_at', desc=True)
-        
+
         if unread_only:
-            query = query.eq('is_read', False)
-        
-        result = query.range(offset, offset + limit - 1).execute()
-        return result.data
+            # Bounded by the read watermark in the database, so only rows
+            # newer than the last "mark all as read" are visited
+            result = client.rpc('unread_notifications', {
+                'p_user_id': user_id, 'p_limit': limit, 'p_offset': offset,
+            }).select(_NOTIFICATION_EMBEDS).execute()
+            return result.data or []
+
+        # The inbox view applies the read watermark, so this is one round trip
+        result = client.table('soundscore_notification_inbox').select(_NOTIFICATION_EMBEDS) \
+            .eq('recipient_id', user_id) \
+            .order('created_at', desc=True) \
+            .range(offset, offset + limit - 1) \
+            .execute()
+        notifications = result.data or []
+        for notification in notifications:
+            notification['is_read'] = notification.pop('seen')
+        return notifications
     except Exception as e:
         print(f"Error getting notifications: {e}")
         return []
@@ -69,28 +129,46 @@ def mark_notification_as_read(notification_id):
     client = authenticate_with_jwt()
     try:
         notification_id = int(notification_id)
-        return client.table('soundscore_notification').update({'is_read': True}).eq('id', notification_id).execute()
+        # Only rows that were still unread come back, so the counter moves once per notification
+        result = client.table('soundscore_notification').update({'is_read': True}) \
+            .eq('id', notification_id).eq('is_read', False).execute()
+        for row in result.data or []:
+            # Rows older than the watermark were already counted as read
+            if not is_notification_read({'created_at': row.get('created_at')}, get_read_watermark(row['recipient_id'], client)):
+                notification_read(row['recipient_id'])
+        return result
     except Exception as e:
         print(f"Error marking notification as read: {e}")
         return None
 
 def mark_all_as_read(user_id):
-    """Mark all notifications as read for a user"""
+    """Mark all notifications as read for a user by moving their read watermark"""
     client = authenticate_with_jwt()
     try:
         user_id = int(user_id)
-        return client.table('soundscore_notification').update({'is_read': True}).eq('recipient_id', user_id).execute()
+        # One constant-cost write, however many notifications the user has,
+        # stamped with the database clock that also sets created_at
+        result = client.rpc('mark_notifications_read', {'p_user_id': user_id}).execute()
+        all_notifications_read(user_id)
+        return result
     except Exception as e:
         print(f"Error marking all notifications as read: {e}")
         return None
 
 def get_unread_count(user_id):
-    """Get count of unread notifications for a user"""
-    client = authenticate_with_jwt()
+    """Get count of unread notifications for a user, served from the per-user counter"""
     try:
         user_id = int(user_id)
-        result = client.table('soundscore_notification').select('id', count='exact').eq('recipient_id', user_id).eq('is_read', False).execute()
-        return result.count if hasattr(result, 'count') else 0
+        cached = get_cached_unread_count(user_id)
+        if cached is not None:
+            return cached
+
+        # Counter missing or expired: count what is newer than the watermark and seed it
+        client = authenticate_with_jwt()
+        result = client.rpc('count_unread_notifications', {'p_user_id': user_id}).execute()
+        count = result.data or 0
+        set_unread_count(user_id, count)
+        return count
     except Exception as e:
         print(f"Error getting unread count: {e}")
         return 0
@@ -0,0 +1,93 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from ..redis_client import get_redis_client
+
+# Counters expire so a missed update heals itself on the next recount
+UNREAD_COUNTER_TTL = 60 * 60 * 24 * 7
+
+# Only bump counters that are already seeded, otherwise a fresh INCR would
+# start from 0 and under-report users with older unread notifications
+_INCR_IF_EXISTS = """
+if redis.call('exists', KEYS[1]) == 1 then
+    return redis.call('incrby', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+def unread_counter_key(user_id):
+    return f"soundscore:unread:{user_id}"
+
+
+def notification_group_name(user_id):
+    return f"notifications_{user_id}"
+
+
+def get_cached_unread_count(user_id):
+    try:
+        value = get_redis_client().get(unread_counter_key(user_id))
+        return int(value) if value is not None else None
+    except Exception as e:
+        print(f"Unread counter read error: {e}")
+        return None
+
+
+def set_unread_count(user_id, count):
+    try:
+        get_redis_client().set(unread_counter_key(user_id), max(int(count), 0), ex=UNREAD_COUNTER_TTL)
+    except Exception as e:
+        print(f"Unread counter write error: {e}")
+
+
+def adjust_unread_count(user_id, delta):
+    """Add delta to a seeded counter; returns the new value or None if unknown"""
+    try:
+        redis_client = get_redis_client()
+        value = redis_client.eval(_INCR_IF_EXISTS, 1, unread_counter_key(user_id), int(delta))
+        if value is None:
+            return None
+        if int(value) < 0:
+            redis_client.set(unread_counter_key(user_id), 0, ex=UNREAD_COUNTER_TTL)
+            return 0
+        return int(value)
+    except Exception as e:
+        print(f"Unread counter update error: {e}")
+        return None
+
+
+def push_notification_update(user_id, unread_count=None, notification=None):
+    """Send the new unread count (and optionally the notification) to the user's sockets"""
+    try:
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        async_to_sync(channel_layer.group_send)(
+            notification_group_name(user_id),
+            {
+                "type": "notification_update",
+                "unread_count": unread_count,
+                "notification": notification,
+            }
+        )
+    except Exception as e:
+        print(f"Notification push error: {e}")
+
+
+def notifications_created(notifications):
+    """Bump counters and push payloads for freshly inserted notification rows"""
+    for notification in notifications:
+        recipient_id = notification.get('recipient_id')
+        if not recipient_id:
+            continue
+        unread_count = adjust_unread_count(recipient_id, 1)
+        push_notification_update(recipient_id, unread_count, notification)
+
+
+def notification_read(user_id):
+    push_notification_update(user_id, adjust_unread_count(user_id, -1))
+
+
+def all_notifications_read(user_id):
+    set_unread_count(user_id, 0)
+    push_notification_update(user_id, 0)
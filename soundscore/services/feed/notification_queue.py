@@ -0,0 +1,84 @@
+import json
+import time
+
+from ..redis_client import get_redis_client
+from .notification import build_notification_row, create_notification, create_notifications_bulk
+
+QUEUE_KEY = "soundscore:notifications"
+DEAD_LETTER_KEY = "soundscore:notifications:dead"
+MAX_ATTEMPTS = 5
+
+
+def enqueue_notification(recipient_id, actor_id, notification_type, review_id=None, comment_id=None, message=None):
+    """
+    Queue a notification for the dispatch worker instead of writing it on the
+    request path. Falls back to an inline insert if Redis is unreachable so
+    the notification is not lost.
+    """
+    row = build_notification_row(recipient_id, actor_id, notification_type, review_id, comment_id, message)
+    try:
+        get_redis_client().lpush(QUEUE_KEY, json.dumps({"row": row, "attempts": 0}))
+        return True
+    except Exception as e:
+        print(f"Notification enqueue error, creating inline: {e}")
+        return create_notification(recipient_id, actor_id, notification_type, review_id, comment_id, message) is not None
+
+
+def pop_batch(batch_size=100, timeout=5):
+    """Block until at least one event is queued, then take up to batch_size"""
+    redis_client = get_redis_client(blocking=True)
+    first = redis_client.brpop(QUEUE_KEY, timeout=timeout)
+    if not first:
+        return []
+    events = [json.loads(first[1])]
+    if batch_size > 1:
+        more = redis_client.rpop(QUEUE_KEY, batch_size - 1) or []
+        events.extend(json.loads(raw) for raw in more)
+    return events
+
+
+def dispatch_batch(events):
+    """
+    Bulk insert a batch of events. If the bulk insert fails the events are
+    retried one by one, so a single bad row does not hold back the rest; only
+    the events that still fail go back on the queue with their attempt count
+    bumped, or to the dead-letter list once they have used up MAX_ATTEMPTS.
+    Returns (inserted, requeued, dead).
+    """
+    if not events:
+        return 0, 0, 0
+    try:
+        create_notifications_bulk([event["row"] for event in events])
+        return len(events), 0, 0
+    except Exception as e:
+        print(f"Notification dispatch error, retrying row by row: {e}")
+
+    # A batch of one has already been tried on its own
+    failed = events if len(events) == 1 else []
+    if len(events) > 1:
+        for event in events:
+            try:
+                create_notifications_bulk([event["row"]])
+            except Exception as e:
+                print(f"Notification dispatch error: {e}")
+                failed.append(event)
+    inserted = len(events) - len(failed)
+    if not failed:
+        return inserted, 0, 0
+
+    redis_client = get_redis_client()
+    requeued = dead = 0
+    pipe = redis_client.pipeline()
+    for event in failed:
+        event["attempts"] = event.get("attempts", 0) + 1
+        if event["attempts"] >= MAX_ATTEMPTS:
+            pipe.lpush(DEAD_LETTER_KEY, json.dumps(event))
+            dead += 1
+        else:
+            pipe.lpush(QUEUE_KEY, json.dumps(event))
+            requeued += 1
+    pipe.execute()
+    # Back off a little so a Supabase outage does not become a hot loop
+    if not inserted:
+        time.sleep(min(2 ** max(event["attempts"] for event in failed), 30))
+    return inserted, requeued, dead
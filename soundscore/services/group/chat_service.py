@@ -0,0 +1,67 @@
+from ..user.async_supabase_client import select_rows, select_one, insert_row, call_rpc
+
+DEFAULT_PROFILE_PICTURE = "/static/images/default.jpg"
+
+
+async def get_user_by_username(username):
+    """Fetch id, username and profile picture for a chat participant"""
+    return await select_one(
+        "soundscore_user",
+        "id, username, profile_picture",
+        filters={"username": username},
+    )
+
+
+async def save_message(group_id, user_id, content):
+    return await insert_row("chat_group_message", {
+        "group_id": group_id,
+        "user_id": user_id,
+        "content": content,
+    })
+
+
+async def set_online_status(group_id, user_id, is_online):
+    try:
+        await call_rpc("upsert_group_user_online", {
+            "_group_id": group_id,
+            "_user_id": user_id,
+            "_is_online": is_online
+        })
+    except Exception as e:
+        print(f"CHAT: Error in set_online_status RPC call: {e}")
+
+
+async def get_members_with_online_status(group_id):
+    """Return every member of the group with their current online status"""
+    members = await select_rows(
+        "chat_group_member",
+        "user_id, soundscore_user(username, profile_picture)",
+        filters={"group_id": group_id},
+    )
+    if not members:
+        return []
+
+    member_details_map = {}
+    for m in members:
+        user = m.get("soundscore_user") or {}
+        member_details_map[m["user_id"]] = {
+            "username": user.get("username", "Unknown User"),
+            "profile_picture": user.get("profile_picture") or DEFAULT_PROFILE_PICTURE,
+        }
+
+    online_rows = await select_rows(
+        "group_user_online",
+        "user_id, is_online",
+        filters={"group_id": group_id},
+        in_filters={"user_id": member_details_map.keys()},
+    )
+    online_status_map = {row["user_id"]: row["is_online"] for row in online_rows}
+
+    return [
+        {
+            "username": details["username"],
+            "profile_picture": details["profile_picture"],
+            "is_online": online_status_map.get(user_id, False),
+        }
+        for user_id, details in member_details_map.items()
+    ]
@@ -0,0 +1,31 @@
+import threading
+
+import redis
+from django.conf import settings
+
+_lock = threading.Lock()
+_clients = {}
+
+
+def get_redis_client(blocking=False):
+    """
+    Shared connection-pooled client for the Redis instance used by Channels.
+
+    Request-path calls get a 5 second socket timeout. ``blocking=True`` returns
+    a separate client without one, for workers whose BRPOP can legitimately
+    wait longer than that; TCP keepalive still notices a dead connection.
+    """
+    client = _clients.get(blocking)
+    if client is None:
+        with _lock:
+            client = _clients.get(blocking)
+            if client is None:
+                client = redis.Redis.from_url(
+                    settings.REDIS_URL,
+                    decode_responses=True,
+                    socket_timeout=None if blocking else 5,
+                    socket_connect_timeout=2,
+                    socket_keepalive=blocking,
+                )
+                _clients[blocking] = client
+    return client
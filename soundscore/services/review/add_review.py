@@ -1,85 +1,53 @@
 from ..user.supabase_client import authenticate_with_jwt
-from datetime import datetime
+from .trending import review_added, review_changed
+from .home_data import invalidate_home_data
+from .review_writes import save_review
+from ..autocomplete import album_indexed, review_indexed
+from ..user.profile import invalidate_profile
+from .album_detail import invalidate_album
 
 def add_review_supabase(user_id, album_id, rating, album_title=None, album_artist=None, 
-                       album_cover=None, text=None, is_favorite=False):
+                       album_cover=None, text=None, is_favorite=False, client=None, username=None):
     # Use authenticated client instead of anonymous client
-    client = authenticate_with_jwt()
+    client = client or authenticate_with_jwt()
     if not client:
         return {"error": "Failed to authenticate with Supabase"}
     
     try:
-        # Step 1: Check if album exists
-        album_response = client.table('soundscore_album').select('*').eq('spotify_id', album_id).execute()
-        
-        # Step 2: Create album if it doesn't exist
-        if not album_response.data:
-            if not album_title or not album_artist:
-                return {"error": "Album title and artist are required to create a new album"}
-                
-            album_data = {
-                'spotify_id': album_id,
-                'title': album_title,
-                'artist': album_artist,
-                'cover_image': album_cover,
-            }
-            
-            album_insert = client.table('soundscore_album').insert(album_data).execute()
-            if not album_insert.data:
-                return {"error": "Failed to create album record"}
-                
-            album_record = album_insert.data[0]
-            db_album_id = album_record.get('id')
-        else:
-            # Album exists, get its ID
-            db_album_id = album_response.data[0].get('id')
-        
-        # Step 3: Check if user has already reviewed this album
-        existing_review = client.table('soundscore_review').select('*')\
-            .eq('user_id', user_id).eq('album_id', db_album_id).execute()
-        
-        if existing_review.data:
-            # Update existing review
-            review_update = client.table('soundscore_review')\
-                .update({
-                    'rating': rating,
-                    'text': text or "",
-                    'is_favorite': is_favorite,
-                    'updated_at': datetime.now().isoformat()
-                })\
-                .eq('id', existing_review.data[0].get('id'))\
-                .execute()
-                
-            if review_update.data:
-                return {
-                    "success": True,
-                    "message": "Review updated successfully",
-                    "review": review_update.data[0]
-                }
-            else:
-                return {"error": "Failed to update review"}
-        
-        # Step 4: Create new review
-        review_data = {
-            'user_id': user_id,
-            'album_id': db_album_id,
-            'rating': rating,
-            'text': text or "",
-            'is_favorite': is_favorite,
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
+        # Album upsert and review upsert happen in one transaction on the server
+        result = save_review(
+            client, user_id, album_id, rating,
+            text=text, is_favorite=is_favorite,
+            album_title=album_title, album_artist=album_artist, album_cover=album_cover,
+        )
+        if "error" in result:
+            return result
+
+        if result["album_created"]:
+            album_indexed(album_id, album_title, album_artist, album_cover)
+
+        review = {
+            "id": result["review_id"],
+            "album_id": result["album_id"],
+            "rating": result["rating"],
+            "created_at": result["created_at"],
         }
-        
-        review_insert = client.table('soundscore_review').insert(review_data).execute()
-        
-        if review_insert.data:
-            return {
-                "success": True,
-                "message": "Review added successfully",
-                "review": review_insert.data[0]
-            }
+        if result["review_created"]:
+            review_added(review)
+            review_indexed(album_id, result["album_artist"], username)
+            message = "Review added successfully"
         else:
-            return {"error": "Failed to add review"}
+            review_changed({**review, "rating": result["previous_rating"]}, review)
+            message = "Review updated successfully"
+        invalidate_home_data()
+        invalidate_profile(user_id)
+        invalidate_album(album_id)
+
+        return {
+            "success": True,
+            "message": message,
+            "review": review
+        }
             
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        return {"error": str(e)}
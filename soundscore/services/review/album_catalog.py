@@ -0,0 +1,97 @@
+import re
+
+from ..user.supabase_client import authenticate_with_jwt
+from .spotify import search_albums
+from ..autocomplete import album_indexed
+
+# Local results needed before Spotify is skipped entirely
+LOCAL_RESULTS_SUFFICIENT = 5
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _query_terms(query):
+    return _WORD_RE.findall((query or "").lower())[:8]
+
+
+def _to_result(row):
+    return {
+        "id": row["spotify_id"],
+        "title": row["title"],
+        "artist": row["artist"],
+        "cover_url": row.get("cover_image"),
+        "release_date": row.get("release_date") or "Unknown",
+    }
+
+
+def search_catalog(query, limit=10):
+    """
+    Full-text search over the albums we already know, best match first.
+
+    Every term must match the start of a word in the title or artist, so
+    partial input like "radio ok" finds "OK Computer" by Radiohead. Runs the
+    search_album_catalog function against the tsvector index in Supabase.
+    """
+    terms = _query_terms(query)
+    if not terms:
+        return []
+
+    try:
+        client = authenticate_with_jwt()
+        result = client.rpc('search_album_catalog', {
+            'p_query': " & ".join(f"{term}:*" for term in terms),
+            'p_limit': limit,
+        }).execute()
+        return [_to_result(row) for row in result.data or []]
+    except Exception as e:
+        print(f"Album catalog search error: {e}")
+        return []
+
+
+def record_albums(albums):
+    """Upsert Spotify-shaped album dicts into the catalog by spotify_id"""
+    rows = {}
+    for album in albums or []:
+        spotify_id = album.get("id") or album.get("spotify_id")
+        if spotify_id and album.get("title"):
+            release_date = album.get("release_date")
+            rows[spotify_id] = {
+                "spotify_id": spotify_id,
+                "title": album["title"],
+                "artist": album.get("artist") or "Unknown Artist",
+                "cover_image": album.get("cover_url") or album.get("cover_image"),
+                "release_date": release_date if release_date != "Unknown" else None,
+            }
+    if not rows:
+        return
+    try:
+        client = authenticate_with_jwt()
+        client.table('soundscore_album') \
+            .upsert(list(rows.values()), on_conflict='spotify_id') \
+            .execute()
+    except Exception as e:
+        print(f"Album catalog update error: {e}")
+        return
+
+    for album in rows.values():
+        album_indexed(album["spotify_id"], album["title"], album["artist"], album["cover_image"])
+
+
+def search_albums_catalog_first(query, limit=10):
+    """
+    Answer an album search from the local catalog, calling Spotify only when
+    the catalog has too few matches. Spotify results are merged in after the
+    local ones and recorded so the next search for them stays local.
+    """
+    local = search_catalog(query, limit)
+    if len(local) >= min(limit, LOCAL_RESULTS_SUFFICIENT):
+        return local
+
+    remote = search_albums(query)
+    if isinstance(remote, dict) and "error" in remote:
+        return local if local else remote
+
+    record_albums(remote)
+    seen = {album["id"] for album in local}
+    merged = local + [album for album in remote if album["id"] not in seen]
+    return merged[:limit]
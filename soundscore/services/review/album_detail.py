@@ -0,0 +1,95 @@
+from ..swr_cache import StaleWhileRevalidateCache
+from ..user.supabase_client import authenticate_with_jwt
+from . import spotify
+from .review_pages import REVIEWS_PAGE_SIZE, paginate_reviews
+
+_REVIEW_COLUMNS = (
+    'id, rating, text, is_favorite, created_at, like_count, comment_count, '
+    'soundscore_user(id, username, profile_picture)'
+)
+_STATS_COLUMNS = 'rating_count, avg_rating, rating_1, rating_2, rating_3, rating_4, rating_5'
+
+
+def _stats_from_row(row):
+    row = row or {}
+    review_count = row.get('rating_count') or 0
+    return {
+        "review_count": review_count,
+        "average_rating": round(row['avg_rating'], 1) if review_count else None,
+        "histogram": {rating: row.get(f'rating_{rating}') or 0 for rating in range(1, 6)},
+    }
+
+
+def get_album_reviews_page(client, album_id, cursor=None, page_size=REVIEWS_PAGE_SIZE):
+    """One page of an album's reviews, newest first, served by review_album_recent_idx"""
+    query = client.table('soundscore_review') \
+        .select(_REVIEW_COLUMNS) \
+        .eq('album_id', int(album_id))
+    return paginate_reviews(query, cursor, page_size)
+
+
+def _load_album(spotify_id):
+    client = authenticate_with_jwt()
+    if not client:
+        return {"error": "Could not connect to Supabase"}
+
+    # Album and its precomputed soundscore_albumstats row in one request
+    response = client.table('soundscore_album') \
+        .select(f'id, spotify_id, title, artist, cover_image, soundscore_albumstats({_STATS_COLUMNS})') \
+        .eq('spotify_id', spotify_id) \
+        .limit(1) \
+        .execute()
+
+    if not response.data:
+        # Nobody has reviewed it yet; show what Spotify knows
+        try:
+            album = spotify.get_albums([spotify_id]).get(spotify_id)
+        except spotify.SpotifyUnavailable as e:
+            return {"error": f"Album lookup failed: {str(e)}"}
+        if not album:
+            return {"error": "Album not found"}
+        return {
+            "album": {
+                "id": None,
+                "spotify_id": spotify_id,
+                "title": album["title"],
+                "artist": album["artist"],
+                "cover_image": album.get("cover_url"),
+            },
+            "stats": _stats_from_row(None),
+            "first_page": {"reviews": [], "next_cursor": None},
+        }
+
+    album = response.data[0]
+    stats = album.pop('soundscore_albumstats', None)
+    # One-to-one embeds come back as an object or a one-item list depending on the PostgREST version
+    if isinstance(stats, list):
+        stats = stats[0] if stats else None
+
+    return {
+        "album": album,
+        "stats": _stats_from_row(stats),
+        "first_page": get_album_reviews_page(client, album['id']),
+    }
+
+
+def _album_cache(spotify_id):
+    return StaleWhileRevalidateCache(f"album:{spotify_id}", lambda: _load_album(spotify_id), fresh_for=60)
+
+
+def get_album_detail(spotify_id):
+    """
+    The cached album header, rating aggregate, 1-5 histogram and first page
+    of reviews, or {"error": ...}. Its cost does not depend on how many
+    reviews the album has.
+    """
+    try:
+        return _album_cache(spotify_id).get()
+    except Exception as e:
+        return {"error": f"Error loading album: {str(e)}"}
+
+
+def invalidate_album(spotify_id):
+    """Drop an album's cached detail after a review of it is written"""
+    if spotify_id:
+        _album_cache(spotify_id).clear()
@@ -0,0 +1,38 @@
+from ..user.supabase_client import authenticate_with_jwt
+
+
+def get_album_ratings(spotify_ids):
+    """
+    Average rating and review count for many albums in one request, read
+    from the same soundscore_albumstats rows as the album page.
+
+    Returns {spotify_id: {"avg_rating": float rounded to 1 decimal,
+    "review_count": int}}; albums without reviews are left out.
+    """
+    spotify_ids = {spotify_id for spotify_id in spotify_ids if spotify_id}
+    if not spotify_ids:
+        return {}
+
+    client = authenticate_with_jwt()
+    if not client:
+        print("Could not connect to Supabase for album ratings")
+        return {}
+
+    response = client.table('soundscore_album') \
+        .select('spotify_id, soundscore_albumstats(rating_count, avg_rating)') \
+        .in_('spotify_id', sorted(spotify_ids)) \
+        .execute()
+
+    ratings = {}
+    for album in response.data or []:
+        stats = album.get('soundscore_albumstats')
+        # One-to-one embeds come back as an object or a one-item list depending on the PostgREST version
+        if isinstance(stats, list):
+            stats = stats[0] if stats else None
+        if not stats or not stats.get('rating_count'):
+            continue
+        ratings[album['spotify_id']] = {
+            "avg_rating": round(stats['avg_rating'], 1),
+            "review_count": stats['rating_count'],
+        }
+    return ratings
@@ -1,26 +1,37 @@
 from ..user.supabase_client import authenticate_with_jwt
+from ..user.user_lookup import get_supabase_user_id
+from .trending import review_removed
+from .home_data import invalidate_home_data
+from .review_writes import delete_review
+from ..autocomplete import review_indexed
+from ..user.profile import invalidate_profile
+from .album_detail import invalidate_album
 
-def delete_review_supabase(user, review_id):
-    client = authenticate_with_jwt()
+def delete_review_supabase(user, review_id, client=None):
+    client = client or authenticate_with_jwt()
     if not client:
         return {"error": "Failed to authenticate with Supabase"}
     
-    user_id = client.table('soundscore_user').select('id').eq('username', user).execute()
+    supabase_user_id = get_supabase_user_id(user)
+    if not supabase_user_id:
+        return {"error": "User not found"}
 
-    supabase_user_id = user_id.data[0]['id']
-    review_response = client.table('soundscore_review').select('*').eq('user_id', supabase_user_id).eq('id', review_id).execute()
-    print(review_response)
+    # Scoped to the owner, so deleting someone else's review reports not found
+    result = delete_review(client, supabase_user_id, review_id)
+    if "error" in result:
+        return result
 
-    if not review_response.data:
-        return {"error": "Review not found"}
-    
-
-    review_delete = client.table('soundscore_review').delete().eq('id', review_response.data[0].get('id')).execute()
-
-    if not review_delete.data:
-        return {"error": "Failed to delete review"}
+    review_removed({
+        "album_id": result["album_id"],
+        "rating": result["rating"],
+        "created_at": result["created_at"],
+    })
+    review_indexed(result["spotify_id"], result["album_artist"], user, delta=-1)
+    invalidate_home_data()
+    invalidate_profile(supabase_user_id)
+    invalidate_album(result["spotify_id"])
 
     return {
         "success": True,
         "message": "Review deleted successfully"
-    }
\ No newline at end of file
+    }
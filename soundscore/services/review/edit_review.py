@@ -1,37 +1,45 @@
 from ..user.supabase_client import authenticate_with_jwt
-from datetime import datetime
+from .trending import review_changed
+from .home_data import invalidate_home_data
+from .review_writes import edit_review
+from ..user.profile import invalidate_profile
+from .album_detail import invalidate_album
 
-def edit_review_supabase(review_id, rating, text=None, is_favorite=False):
+def edit_review_supabase(review_id, rating, text=None, is_favorite=False, user_id=None, client=None):
 
-   client = authenticate_with_jwt()
+   if not user_id:
+       return {"error": "Review owner is required"}
+
+   client = client or authenticate_with_jwt()
    if not client:
        return {"error": "Failed to authenticate with Supabase"}
    
    try:
        if not 1 <= rating <= 5:
            return {"error": "Rating must be between 1 and 5"}
-       
-       update_data = {
-              'rating': rating,
-              'text': text or "",
-              'is_favorite': is_favorite,
-              'updated_at': datetime.now().isoformat()
-       }
 
-       update_response = client.table('soundscore_review')\
-            .update(update_data)\
-            .eq('id', review_id)\
-            .execute()
-       
-       if not update_response.data:
-           return {"error": "Failed to update review"}
+       # Ownership check and update in one round trip
+       result = edit_review(client, user_id, review_id, rating, text=text, is_favorite=is_favorite)
+       if "error" in result:
+           return result
+
+       review = {
+           "id": result["review_id"],
+           "album_id": result["album_id"],
+           "rating": result["rating"],
+           "created_at": result["created_at"],
+       }
+       review_changed({**review, "rating": result["previous_rating"]}, review)
+       invalidate_home_data()
+       invalidate_profile(user_id)
+       invalidate_album(result["spotify_id"])
        
        return {
            "success": True,
            "message": "Review updated successfully",
-           "review": update_response.data[0]
+           "review": review
        }
    
    except Exception as e:
          print(f"Error updating review: {e}")
-         return {"error": str(e)}
\ No newline at end of file
+         return {"error": str(e)}
@@ -0,0 +1,20 @@
+from ..swr_cache import StaleWhileRevalidateCache
+from .latest_reviews import get_latest_reviews
+from .top_albums import get_top_3_albums
+
+_latest_reviews = StaleWhileRevalidateCache("home:latest_reviews", lambda: get_latest_reviews(limit=3), fresh_for=30)
+_top_albums = StaleWhileRevalidateCache("home:top_albums", get_top_3_albums, fresh_for=300)
+
+
+def get_home_latest_reviews():
+    return _latest_reviews.get()
+
+
+def get_home_top_albums():
+    return _top_albums.get()
+
+
+def invalidate_home_data():
+    """Called after any review write so the home page picks it up on the next hit"""
+    _latest_reviews.invalidate()
+    _top_albums.invalidate()
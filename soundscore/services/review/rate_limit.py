@@ -0,0 +1,121 @@
+import threading
+import time
+
+from ..redis_client import get_redis_client
+
+# After a Redis error, use the local bucket for this long before trying again
+REDIS_RETRY_AFTER = 30
+
+# Refill the bucket and try to take one token. Uses the Redis clock so every
+# worker agrees on elapsed time. Returns the seconds to wait (0 = acquired)
+_TAKE_TOKEN = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('time')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('hmget', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('hset', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('expire', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RateLimited(Exception):
+    """Raised when a call would have to wait longer than its budget allows"""
+
+    def __init__(self, retry_in):
+        super().__init__(f"Rate limited, retry in {retry_in:.1f}s")
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every worker through Redis.
+
+    ``rate`` tokens are added per second up to ``capacity``. A server-imposed
+    pause (e.g. from a ``Retry-After`` header) is stored next to the bucket
+    so all workers hold off together. If Redis is unreachable the bucket
+    degrades to a per-process one instead of letting calls through unchecked.
+    """
+
+    def __init__(self, name, rate, capacity):
+        self.bucket_key = f"soundscore:ratelimit:{name}"
+        self.pause_key = f"soundscore:ratelimit:{name}:pause"
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._lock = threading.Lock()
+        self._local_tokens = self.capacity
+        self._local_ts = time.monotonic()
+        self._local_pause_until = 0
+        self._redis_down_until = 0
+
+    def acquire(self, deadline):
+        """Block until a token is taken; raise RateLimited if that would pass ``deadline``"""
+        while True:
+            wait = self._pause_remaining() or self._take()
+            if not wait:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimited(wait)
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Make every worker wait ``seconds`` before the next call"""
+        self._local_pause_until = max(self._local_pause_until, time.monotonic() + seconds)
+        redis_client = self._redis()
+        if redis_client is None:
+            return
+        try:
+            redis_client.set(self.pause_key, 1, px=max(int(seconds * 1000), 1))
+        except Exception as e:
+            self._redis_failed(e)
+
+    def _pause_remaining(self):
+        local = max(self._local_pause_until - time.monotonic(), 0)
+        redis_client = self._redis()
+        if redis_client is None:
+            return local
+        try:
+            remaining_ms = redis_client.pttl(self.pause_key)
+            return max(remaining_ms / 1000 if remaining_ms > 0 else 0, local)
+        except Exception as e:
+            self._redis_failed(e)
+            return local
+
+    def _take(self):
+        redis_client = self._redis()
+        if redis_client is None:
+            return self._take_local()
+        try:
+            return float(redis_client.eval(_TAKE_TOKEN, 1, self.bucket_key, self.capacity, self.rate))
+        except Exception as e:
+            self._redis_failed(e)
+            return self._take_local()
+
+    def _redis(self):
+        if time.monotonic() < self._redis_down_until:
+            return None
+        return get_redis_client()
+
+    def _redis_failed(self, error):
+        print(f"Rate limit Redis error, using local bucket for {REDIS_RETRY_AFTER}s: {error}")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+
+    def _take_local(self):
+        with self._lock:
+            now = time.monotonic()
+            self._local_tokens = min(self.capacity, self._local_tokens + (now - self._local_ts) * self.rate)
+            self._local_ts = now
+            if self._local_tokens >= 1:
+                self._local_tokens -= 1
+                return 0
+            return (1 - self._local_tokens) / self.rate
@@ -0,0 +1,110 @@
+import csv
+import io
+import itertools
+import json
+
+EXPORT_CHUNK_SIZE = 500
+
+# Same column names the importer reads, so an export can be imported back
+EXPORT_FIELDS = ["spotify_id", "title", "artist", "rating", "text", "is_favorite", "created_at", "updated_at"]
+
+# First cell of the last CSV line when the stream broke off part way
+EXPORT_ERROR_MARKER = "#error"
+
+
+def iter_user_reviews(client, user_id, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield a user's reviews oldest first, fetched in keyset-paginated chunks.
+
+    Each request asks for ids after the last one seen (served by the
+    (user_id, id) index), so only one chunk is held at a time and deep pages
+    cost the same as the first.
+    """
+    last_id = 0
+    while True:
+        response = client.table('soundscore_review') \
+            .select('id, rating, text, is_favorite, created_at, updated_at, '
+                    'soundscore_album(spotify_id, title, artist)') \
+            .eq('user_id', int(user_id)) \
+            .gt('id', last_id) \
+            .order('id') \
+            .limit(chunk_size) \
+            .execute()
+        rows = response.data or []
+        for review in rows:
+            album = review.get('soundscore_album') or {}
+            yield {
+                "spotify_id": album.get('spotify_id'),
+                "title": album.get('title'),
+                "artist": album.get('artist'),
+                "rating": review.get('rating'),
+                "text": review.get('text') or "",
+                "is_favorite": bool(review.get('is_favorite')),
+                "created_at": review.get('created_at'),
+                "updated_at": review.get('updated_at'),
+            }
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1]['id']
+
+
+def open_user_reviews(client, user_id, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    iter_user_reviews with the first chunk already fetched, so a Supabase
+    failure raises here, before any response has been started.
+    """
+    reviews = iter_user_reviews(client, user_id, chunk_size)
+    first = next(reviews, None)
+    if first is None:
+        return iter(())
+    return itertools.chain([first], reviews)
+
+
+def _guarded(reviews, render, error_line):
+    # Headers are already sent once streaming starts, so a later failure ends
+    # the file with a marker line instead of passing for a complete export
+    try:
+        for review in reviews:
+            yield render(review)
+    except Exception as e:
+        print(f"Review export stopped: {e}")
+        yield error_line(f"Export incomplete: {e}")
+
+
+def export_csv(reviews):
+    """Yield CSV text (header first), one line per review"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+
+    def flush():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return line
+
+    def render(review):
+        writer.writerow(review)
+        return flush()
+
+    def error_line(message):
+        csv.writer(buffer).writerow([f"{EXPORT_ERROR_MARKER} {message}"])
+        return flush()
+
+    writer.writeheader()
+    yield flush()
+    yield from _guarded(reviews, render, error_line)
+
+
+def export_ndjson(reviews):
+    """Yield one JSON object per line"""
+    yield from _guarded(
+        reviews,
+        lambda review: json.dumps(review, ensure_ascii=False) + "\n",
+        lambda message: json.dumps({"error": message}, ensure_ascii=False) + "\n",
+    )
+
+
+EXPORT_FORMATS = {
+    "csv": (export_csv, "text/csv; charset=utf-8"),
+    "ndjson": (export_ndjson, "application/x-ndjson; charset=utf-8"),
+}
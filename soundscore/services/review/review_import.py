@@ -0,0 +1,284 @@
+import csv
+import json
+import math
+from datetime import datetime, timezone
+from itertools import islice
+
+from . import spotify
+from .album_catalog import search_catalog
+from ..autocomplete import album_indexed
+from .home_data import invalidate_home_data
+from .trending import review_added
+from ..user.profile import invalidate_profile
+from .album_detail import invalidate_album
+
+IMPORT_CHUNK_SIZE = 200
+
+_TRUE_VALUES = {"1", "true", "yes", "y", "x"}
+
+
+def iter_review_rows(stream, fmt="csv"):
+    """Yield one dict per line of a CSV (with header) or NDJSON text stream"""
+    if fmt == "ndjson":
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield {}
+    else:
+        yield from csv.DictReader(stream)
+
+
+def detect_format(filename):
+    return "ndjson" if filename and filename.lower().endswith((".ndjson", ".jsonl", ".json")) else "csv"
+
+
+def _text(value):
+    return str(value).strip() if value is not None else ""
+
+
+def normalize_row(raw, scale=5):
+    """
+    Map a source row onto our review fields, or return None if it is unusable.
+
+    Ratings on another scale (e.g. 10 or 100) are converted to 1-5 stars.
+    """
+    # An NDJSON line can hold any JSON value, not just an object
+    if not isinstance(raw, dict):
+        return None
+    row = {str(key).strip().lower(): value for key, value in raw.items() if key is not None}
+    spotify_id = _text(row.get("spotify_id")) or None
+    title = _text(row.get("title") or row.get("album")) or None
+    artist = _text(row.get("artist")) or None
+    if not spotify_id and not title:
+        return None
+
+    try:
+        rating = float(row.get("rating"))
+    except (TypeError, ValueError):
+        return None
+    # float() accepts "nan" and "inf", which round() cannot handle
+    if not math.isfinite(rating) or rating <= 0 or rating > scale:
+        return None
+    stars = min(max(round(rating / scale * 5), 1), 5)
+
+    created_at = _text(row.get("created_at") or row.get("date")) or None
+    if created_at:
+        try:
+            created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00')).isoformat()
+        except ValueError:
+            created_at = None
+
+    favorite = row.get("is_favorite")
+    return {
+        "spotify_id": spotify_id,
+        "title": title,
+        "artist": artist,
+        "rating": stars,
+        "text": _text(row.get("text") or row.get("review")),
+        "is_favorite": favorite is True or _text(favorite).lower() in _TRUE_VALUES,
+        "created_at": created_at,
+    }
+
+
+class ReviewImporter:
+    """
+    Streams review rows into Supabase in fixed-size chunks, so memory use
+    does not grow with the size of the file.
+
+    Per chunk: albums without a Spotify id are matched against the local
+    catalog and then Spotify search; known spotify_ids are looked up in one
+    query and only the missing albums are upserted (details fetched from
+    Spotify 20 at a time); reviews are written in one bulk upsert on
+    (user_id, album_id). Existing reviews are kept unless ``overwrite``.
+
+    ``stats`` has rows, imported, existing, unresolved, invalid and duplicate
+    counts, and every row lands in exactly one of the last five.
+    ``rows_done`` is the resume point after the last committed chunk.
+    """
+
+    def __init__(self, client, user_id, scale=5, chunk_size=IMPORT_CHUNK_SIZE, overwrite=False):
+        self.client = client
+        self.user_id = int(user_id)
+        self.scale = scale
+        self.chunk_size = chunk_size
+        self.overwrite = overwrite
+        self.rows_done = 0
+        self.stats = {"rows": 0, "imported": 0, "existing": 0, "unresolved": 0, "invalid": 0, "duplicate": 0}
+
+    def run(self, rows, resume_from=0, on_chunk=None):
+        """Import an iterable of raw rows; ``on_chunk(importer)`` runs after each commit"""
+        rows = iter(rows)
+        if resume_from:
+            # Skip already imported rows without holding them in memory
+            for _ in islice(rows, resume_from):
+                pass
+            self.rows_done = resume_from
+
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self._import_chunk(chunk)
+            self.rows_done += len(chunk)
+            if on_chunk:
+                on_chunk(self)
+
+        if self.stats["imported"]:
+            invalidate_home_data()
+            invalidate_profile(self.user_id)
+        return self.stats
+
+    def _import_chunk(self, raw_rows):
+        self.stats["rows"] += len(raw_rows)
+        rows = []
+        for raw in raw_rows:
+            row = normalize_row(raw, self.scale)
+            if row is None:
+                self.stats["invalid"] += 1
+            else:
+                rows.append(row)
+
+        resolved = self._resolve_spotify_ids(rows)
+        album_ids = self._album_ids(resolved)
+
+        # One review per album per chunk; a later line wins
+        reviews = {}
+        for row in resolved:
+            album_id = album_ids.get(row["spotify_id"])
+            if album_id is None:
+                self.stats["unresolved"] += 1
+                continue
+            if album_id in reviews:
+                self.stats["duplicate"] += 1
+            reviews[album_id] = row
+        self._write_reviews(reviews)
+
+    def _resolve_spotify_ids(self, rows):
+        """Fill in spotify_id for rows that only have a title/artist"""
+        lookups = {}
+        for row in rows:
+            if row["spotify_id"]:
+                continue
+            key = (row["title"].casefold(), (row["artist"] or "").casefold())
+            if key not in lookups:
+                lookups[key] = self._find_album(row["title"], row["artist"])
+            album = lookups[key]
+            if album:
+                row["spotify_id"] = album["id"]
+                row["title"], row["artist"] = album["title"], album["artist"]
+                row["cover_url"] = album.get("cover_url")
+
+        resolved = [row for row in rows if row["spotify_id"]]
+        self.stats["unresolved"] += len(rows) - len(resolved)
+        return resolved
+
+    def _find_album(self, title, artist):
+        for album in search_catalog(f"{title} {artist or ''}", limit=5):
+            if album["title"].lower() != title.lower():
+                continue
+            if not artist or album["artist"].lower() == artist.lower():
+                return album
+        try:
+            return spotify.find_album(title, artist)
+        except spotify.SpotifyUnavailable as e:
+            print(f"Import album lookup failed for {title!r}: {e}")
+            return None
+
+    def _album_ids(self, rows):
+        """Map spotify_id -> soundscore_album.id, creating the albums we lack"""
+        wanted = {row["spotify_id"]: row for row in rows}
+        if not wanted:
+            return {}
+
+        response = self.client.table('soundscore_album') \
+            .select('id, spotify_id') \
+            .in_('spotify_id', list(wanted)) \
+            .execute()
+        album_ids = {album['spotify_id']: album['id'] for album in response.data or []}
+
+        missing = [spotify_id for spotify_id in wanted if spotify_id not in album_ids]
+        if not missing:
+            return album_ids
+
+        # Rows given only a spotify_id need their details from Spotify
+        need_details = [spotify_id for spotify_id in missing if not wanted[spotify_id]["title"]]
+        try:
+            details = spotify.get_albums(need_details) if need_details else {}
+        except spotify.SpotifyUnavailable as e:
+            print(f"Import album details failed: {e}")
+            details = {}
+
+        new_albums = []
+        for spotify_id in missing:
+            row = wanted[spotify_id]
+            album = details.get(spotify_id) or {
+                "title": row["title"], "artist": row["artist"], "cover_url": row.get("cover_url")
+            }
+            if not album.get("title"):
+                continue
+            new_albums.append({
+                "spotify_id": spotify_id,
+                "title": album["title"],
+                "artist": album.get("artist") or "Unknown Artist",
+                "cover_image": album.get("cover_url"),
+                "release_date": album.get("release_date") if album.get("release_date") != "Unknown" else None,
+            })
+
+        if new_albums:
+            inserted = self.client.table('soundscore_album') \
+                .upsert(new_albums, on_conflict='spotify_id') \
+                .execute()
+            for album in inserted.data or []:
+                album_ids[album['spotify_id']] = album['id']
+            for album in new_albums:
+                album_indexed(album["spotify_id"], album["title"], album["artist"], album["cover_image"])
+
+        return album_ids
+
+    def _write_reviews(self, reviews):
+        if not reviews:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+
+        # An overwrite must carry over the columns the import does not own,
+        # since a bulk upsert writes every column it is given
+        existing = {}
+        if self.overwrite:
+            response = self.client.table('soundscore_review') \
+                .select('album_id, created_at, like_count, comment_count') \
+                .eq('user_id', self.user_id) \
+                .in_('album_id', list(reviews)) \
+                .execute()
+            existing = {review['album_id']: review for review in response.data or []}
+
+        payload = []
+        for album_id, row in reviews.items():
+            current = existing.get(album_id, {})
+            payload.append({
+                'user_id': self.user_id,
+                'album_id': album_id,
+                'rating': row["rating"],
+                'text': row["text"],
+                'is_favorite': row["is_favorite"],
+                'created_at': current.get('created_at') or row["created_at"] or now,
+                'updated_at': now,
+                'like_count': current.get('like_count', 0),
+                'comment_count': current.get('comment_count', 0),
+            })
+
+        # Without overwrite, existing reviews are left alone and not returned
+        response = self.client.table('soundscore_review') \
+            .upsert(payload, on_conflict='user_id,album_id', ignore_duplicates=not self.overwrite) \
+            .execute()
+        written = response.data or []
+        self.stats["imported"] += len(written)
+        self.stats["existing"] += len(payload) - len(written)
+
+        for review in written:
+            invalidate_album(reviews[review['album_id']]["spotify_id"])
+            if not self.overwrite:
+                review_added(review)
@@ -0,0 +1,50 @@
+import base64
+import binascii
+from datetime import datetime
+
+REVIEWS_PAGE_SIZE = 20
+
+
+def encode_cursor(review):
+    raw = f"{review['created_at']}|{review['id']}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """(created_at, id) of the last review on the previous page, or None if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, review_id = raw.rsplit("|", 1)
+        datetime.fromisoformat(created_at)
+        return created_at, int(review_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+
+def paginate_reviews(query, cursor=None, page_size=REVIEWS_PAGE_SIZE):
+    """
+    Run a filtered soundscore_review query as one page, newest first.
+
+    Pages are keyed on (created_at, id) rather than an offset, so with a
+    matching (..., created_at, id) index every page is a range scan however
+    deep it is. Returns {"reviews": [...], "next_cursor": str or None}; a
+    malformed cursor starts from the first page.
+    """
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, review_id = position
+        query = query.or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{review_id})')
+
+    # One extra row tells us whether there is another page
+    response = query \
+        .order('created_at', desc=True) \
+        .order('id', desc=True) \
+        .limit(page_size + 1) \
+        .execute()
+    reviews = response.data or []
+
+    next_cursor = None
+    if len(reviews) > page_size:
+        reviews = reviews[:page_size]
+        next_cursor = encode_cursor(reviews[-1])
+    return {"reviews": reviews, "next_cursor": next_cursor}
@@ -0,0 +1,242 @@
+import sqlite3
+from datetime import datetime, timezone
+
+
+def _call(client, function_name, params):
+    try:
+        response = client.rpc(function_name, params).execute()
+    except Exception as e:
+        print(f"Error calling {function_name}: {e}")
+        return {"error": getattr(e, "message", None) or str(e)}
+    rows = response.data or []
+    return rows[0] if rows else None
+
+
+def save_review(client, user_id, spotify_id, rating, text="", is_favorite=False,
+                album_title=None, album_artist=None, album_cover=None):
+    """
+    Create or update the user's review of an album in one round trip.
+
+    The ``save_review`` function upserts the album on spotify_id and the
+    review on (user, album) inside one transaction. Returns the row with
+    review_id, album_id, spotify_id, album_artist, album_created,
+    review_created, previous_rating, rating and created_at, or {"error": ...}.
+    """
+    row = _call(client, 'save_review', {
+        'p_user_id': int(user_id),
+        'p_spotify_id': spotify_id,
+        'p_rating': int(rating),
+        'p_text': text or "",
+        'p_is_favorite': bool(is_favorite),
+        'p_album_title': album_title,
+        'p_album_artist': album_artist,
+        'p_album_cover': album_cover,
+    })
+    if row is None:
+        return {"error": "Failed to save review"}
+    return row
+
+
+def edit_review(client, user_id, review_id, rating, text="", is_favorite=False):
+    """
+    Update a review owned by ``user_id`` in one round trip. Returns review_id,
+    album_id, spotify_id, album_artist, previous_rating, rating and created_at,
+    or {"error": ...} if the review does not exist or belongs to someone else.
+    """
+    row = _call(client, 'edit_review', {
+        'p_user_id': int(user_id),
+        'p_review_id': int(review_id),
+        'p_rating': int(rating),
+        'p_text': text or "",
+        'p_is_favorite': bool(is_favorite),
+    })
+    if row is None:
+        return {"error": "Review not found"}
+    return row
+
+
+def delete_review(client, user_id, review_id):
+    """
+    Delete a review owned by ``user_id`` in one round trip. Returns the deleted
+    review's review_id, album_id, spotify_id, album_artist, rating and
+    created_at, or {"error": ...}.
+    """
+    row = _call(client, 'delete_review', {
+        'p_user_id': int(user_id),
+        'p_review_id': int(review_id),
+    })
+    if row is None:
+        return {"error": "Review not found"}
+    return row
+
+
+class SQLiteReviewStore:
+    """
+    Local stand-in for the ``save_review`` / ``edit_review`` /
+    ``delete_review`` RPCs, for tests and offline development. Mirrors the
+    tables they touch and runs each call in an immediate SQLite transaction.
+    Pass ``store.as_client()`` wherever a Supabase client is expected.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS soundscore_album (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        spotify_id TEXT UNIQUE,
+        title TEXT NOT NULL,
+        artist TEXT NOT NULL,
+        cover_image TEXT
+    );
+    CREATE TABLE IF NOT EXISTS soundscore_review (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        album_id INTEGER NOT NULL REFERENCES soundscore_album(id),
+        rating INTEGER NOT NULL CHECK (rating BETWEEN 1 AND 5),
+        text TEXT NOT NULL DEFAULT '',
+        is_favorite INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        UNIQUE (user_id, album_id)
+    );
+    """
+
+    def __init__(self, path=":memory:"):
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(self.SCHEMA)
+
+    def _transaction(self, work):
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(cursor)
+            cursor.execute("COMMIT")
+            return result
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _check_rating(rating):
+        if not 1 <= rating <= 5:
+            raise ValueError("Rating must be between 1 and 5")
+
+    def save_review(self, p_user_id, p_spotify_id, p_rating, p_text="", p_is_favorite=False,
+                    p_album_title=None, p_album_artist=None, p_album_cover=None):
+        self._check_rating(p_rating)
+
+        def work(cursor):
+            album = cursor.execute(
+                "SELECT id, artist FROM soundscore_album WHERE spotify_id = ?", (p_spotify_id,)
+            ).fetchone()
+            album_created = False
+            if album is None:
+                if p_album_title is None or p_album_artist is None:
+                    raise ValueError("Album title and artist are required to create a new album")
+                cursor.execute(
+                    "INSERT INTO soundscore_album (spotify_id, title, artist, cover_image) VALUES (?, ?, ?, ?)",
+                    (p_spotify_id, p_album_title, p_album_artist, p_album_cover),
+                )
+                album = {"id": cursor.lastrowid, "artist": p_album_artist}
+                album_created = True
+
+            previous = cursor.execute(
+                "SELECT rating FROM soundscore_review WHERE user_id = ? AND album_id = ?",
+                (p_user_id, album["id"]),
+            ).fetchone()
+            now = datetime.now(timezone.utc).isoformat()
+            cursor.execute(
+                "INSERT INTO soundscore_review "
+                "(user_id, album_id, rating, text, is_favorite, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_id, album_id) DO UPDATE SET "
+                "rating = excluded.rating, text = excluded.text, "
+                "is_favorite = excluded.is_favorite, updated_at = excluded.updated_at",
+                (p_user_id, album["id"], p_rating, p_text or "", int(p_is_favorite), now, now),
+            )
+            review = cursor.execute(
+                "SELECT id, created_at FROM soundscore_review WHERE user_id = ? AND album_id = ?",
+                (p_user_id, album["id"]),
+            ).fetchone()
+            return [{
+                "review_id": review["id"],
+                "album_id": album["id"],
+                "spotify_id": p_spotify_id,
+                "album_artist": album["artist"],
+                "album_created": album_created,
+                "review_created": previous is None,
+                "previous_rating": previous["rating"] if previous else None,
+                "rating": p_rating,
+                "created_at": review["created_at"],
+            }]
+
+        return self._transaction(work)
+
+    def edit_review(self, p_user_id, p_review_id, p_rating, p_text="", p_is_favorite=False):
+        self._check_rating(p_rating)
+
+        def work(cursor):
+            review = cursor.execute(
+                "SELECT r.rating, r.album_id, r.created_at, a.spotify_id, a.artist "
+                "FROM soundscore_review r JOIN soundscore_album a ON a.id = r.album_id "
+                "WHERE r.id = ? AND r.user_id = ?",
+                (p_review_id, p_user_id),
+            ).fetchone()
+            if review is None:
+                return []
+            cursor.execute(
+                "UPDATE soundscore_review SET rating = ?, text = ?, is_favorite = ?, updated_at = ? WHERE id = ?",
+                (p_rating, p_text or "", int(p_is_favorite), datetime.now(timezone.utc).isoformat(), p_review_id),
+            )
+            return [{
+                "review_id": p_review_id,
+                "album_id": review["album_id"],
+                "spotify_id": review["spotify_id"],
+                "album_artist": review["artist"],
+                "previous_rating": review["rating"],
+                "rating": p_rating,
+                "created_at": review["created_at"],
+            }]
+
+        return self._transaction(work)
+
+    def delete_review(self, p_user_id, p_review_id):
+        def work(cursor):
+            review = cursor.execute(
+                "SELECT r.id, r.rating, r.album_id, r.created_at, a.spotify_id, a.artist "
+                "FROM soundscore_review r JOIN soundscore_album a ON a.id = r.album_id "
+                "WHERE r.id = ? AND r.user_id = ?",
+                (p_review_id, p_user_id),
+            ).fetchone()
+            if review is None:
+                return []
+            cursor.execute("DELETE FROM soundscore_review WHERE id = ?", (p_review_id,))
+            return [{
+                "review_id": review["id"],
+                "album_id": review["album_id"],
+                "spotify_id": review["spotify_id"],
+                "album_artist": review["artist"],
+                "rating": review["rating"],
+                "created_at": review["created_at"],
+            }]
+
+        return self._transaction(work)
+
+    def as_client(self):
+        """Minimal object exposing ``rpc(name, params).execute().data``"""
+        store = self
+
+        class _Call:
+            def __init__(self, name, params):
+                self.name, self.params = name, params
+
+            def execute(self):
+                if self.name not in ('save_review', 'edit_review', 'delete_review'):
+                    raise NotImplementedError(self.name)
+                data = getattr(store, self.name)(**self.params)
+                return type("Response", (), {"data": data})()
+
+        class _Client:
+            def rpc(self, name, params):
+                return _Call(name, params)
+
+        return _Client()
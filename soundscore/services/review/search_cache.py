@@ -0,0 +1,133 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from ..redis_client import get_redis_client
+
+
+def normalize_query(query):
+    """Case- and whitespace-insensitive form of a search query"""
+    return " ".join((query or "").casefold().split())
+
+
+class SearchResultCache:
+    """
+    Bounded cache for external search results, keyed by normalized query and
+    result type.
+
+    The first tier is an in-process LRU with a per-entry TTL. When
+    ``use_redis`` is on, misses fall through to a shared Redis tier so every
+    worker benefits from a search any of them made. Redis errors only cost a
+    miss. ``stats`` counts hits per tier and misses.
+
+    Expired entries are kept for another ``stale_for`` seconds and returned
+    only when asked with ``allow_stale``, as a fallback when the upstream API
+    is unavailable.
+    """
+
+    def __init__(self, namespace, ttl=3600, max_entries=512, use_redis=False, stale_for=None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_for = ttl if stale_for is None else stale_for
+        self.max_entries = max_entries
+        self.use_redis = use_redis
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.stats = {"hits": 0, "redis_hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0}
+
+    def make_key(self, query, search_type):
+        return f"{search_type}:{normalize_query(query)}"
+
+    def get(self, query, search_type, allow_stale=False):
+        key = self.make_key(query, search_type)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                fresh_until, value = entry
+                if fresh_until > now:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return value
+                if fresh_until + self.stale_for <= now:
+                    del self._entries[key]
+                elif allow_stale:
+                    self.stats["stale_hits"] += 1
+                    return value
+
+        entry = self._redis_get(key)
+        if entry is not None:
+            fresh_until, value = entry
+            if fresh_until > now:
+                self._store_local(key, value, fresh_until)
+                self.stats["redis_hits"] += 1
+                return value
+            if allow_stale:
+                self.stats["stale_hits"] += 1
+                return value
+
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, query, search_type, value):
+        key = self.make_key(query, search_type)
+        fresh_until = time.time() + self.ttl
+        self._store_local(key, value, fresh_until)
+        self._redis_set(key, value, fresh_until)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        lookups = stats["hits"] + stats["redis_hits"] + stats["stale_hits"] + stats["misses"]
+        stats["size"] = len(self._entries)
+        stats["hit_ratio"] = round((stats["hits"] + stats["redis_hits"]) / lookups, 3) if lookups else 0
+        return stats
+
+    def _store_local(self, key, value, fresh_until):
+        with self._lock:
+            self._entries[key] = (fresh_until, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def _redis_key(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return f"soundscore:{self.namespace}:{digest}"
+
+    def _redis_get(self, key):
+        if not self.use_redis:
+            return None
+        try:
+            raw = get_redis_client().get(self._redis_key(key))
+            if not raw:
+                return None
+            entry = json.loads(raw)
+            return entry["f"], entry["v"]
+        except Exception as e:
+            print(f"Search cache read error: {e}")
+            return None
+
+    def _redis_set(self, key, value, fresh_until):
+        if not self.use_redis:
+            return
+        try:
+            payload = json.dumps({"f": fresh_until, "v": value})
+            get_redis_client().set(self._redis_key(key), payload, ex=int(self.ttl + self.stale_for))
+        except Exception as e:
+            print(f"Search cache write error: {e}")
+
+
+album_search_cache = SearchResultCache(
+    "spotify:search",
+    ttl=settings.SPOTIFY_SEARCH_CACHE_TTL,
+    max_entries=settings.SPOTIFY_SEARCH_CACHE_SIZE,
+    use_redis=settings.SPOTIFY_SEARCH_CACHE_REDIS,
+)
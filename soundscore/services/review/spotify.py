@@ -1,51 +1,223 @@
 import requests
 import base64
+import random
+import threading
+import time
 from django.conf import settings
 
-def get_token():
-    """Get Spotify access token"""
-    client_id = settings.SPOTIFY_CLIENT_ID
-    client_secret = settings.SPOTIFY_CLIENT_SECRET
+from .rate_limit import RateLimited, TokenBucket
+from .search_cache import album_search_cache
 
-    auth_string = f"{client_id}:{client_secret}"
-    auth_bytes = auth_string.encode('utf-8')
-    auth_base64 = base64.b64encode(auth_bytes).decode('utf-8')
+# Refresh the access token this many seconds before Spotify expires it
+TOKEN_EXPIRY_MARGIN = 60
+# (connect, read) timeouts for every Spotify request
+REQUEST_TIMEOUT = (3.05, 10)
+# Exponential backoff between retries, with full jitter
+RETRY_BACKOFF_BASE = 0.25
+RETRY_BACKOFF_CAP = 2
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
 
-    url = "https://accounts.spotify.com/api/token"
-    headers = {
-        "Authorization": f"Basic {auth_base64}",
-        "Content-Type": "application/x-www-form-urlencoded"
-    }
-    data = {"grant_type": "client_credentials"}
 
-    response = requests.post(url, headers=headers, data=data)
-    response_data = response.json()
+class SpotifyUnavailable(Exception):
+    """Spotify could not answer within the request's wait and retry budget"""
+
+
+class SpotifyClient:
+    """
+    Process-wide Spotify Web API client using the client-credentials flow.
+
+    The access token is cached until shortly before ``expires_in`` and
+    refreshed under a lock, so concurrent searches share a single token
+    request. All calls go through one pooled ``requests.Session``.
+
+    API calls take a token from a bucket shared across workers, honour
+    ``Retry-After`` on 429 by pausing every worker, and retry 429/5xx and
+    connection errors with jittered backoff. A call that cannot finish within
+    SPOTIFY_MAX_WAIT raises SpotifyUnavailable instead of queueing up.
+    """
+
+    def __init__(self, api_url=None, token_url=None):
+        self.api_url = api_url or settings.SPOTIFY_API_URL
+        self.token_url = token_url or settings.SPOTIFY_TOKEN_URL
+        self.limiter = TokenBucket("spotify", settings.SPOTIFY_RATE_LIMIT, settings.SPOTIFY_RATE_BURST)
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._token = None
+        self._expires_at = 0
+        self.stats = {"token_requests": 0, "token_reuses": 0, "failures": 0, "retries": 0, "throttled": 0}
+
+    def get_token(self):
+        token = self._token
+        if token and time.time() < self._expires_at - TOKEN_EXPIRY_MARGIN:
+            self.stats["token_reuses"] += 1
+            return token
+
+        with self._lock:
+            # Another thread may have refreshed it while we waited for the lock
+            if self._token and time.time() < self._expires_at - TOKEN_EXPIRY_MARGIN:
+                self.stats["token_reuses"] += 1
+                return self._token
+            self._request_token()
+            return self._token
+
+    def invalidate(self):
+        """Drop the cached token, e.g. after Spotify rejected it."""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0
+
+    def get(self, path, params=None):
+        """
+        GET an API path within the rate limit, retrying throttled and failed
+        calls. Returns the response, or None if no token could be obtained.
+        """
+        deadline = time.monotonic() + settings.SPOTIFY_MAX_WAIT
+        reauthenticated = False
+        for attempt in range(settings.SPOTIFY_MAX_RETRIES + 1):
+            try:
+                self.limiter.acquire(deadline)
+            except RateLimited as e:
+                raise SpotifyUnavailable(str(e))
+
+            token = self.get_token()
+            if not token:
+                return None
+            try:
+                response = self._session.get(
+                    f"{self.api_url}{path}",
+                    params=params,
+                    headers={"Authorization": f"Bearer {token}"},
+                    timeout=REQUEST_TIMEOUT,
+                )
+            except requests.RequestException as e:
+                print(f"Spotify request error: {e}")
+                self._backoff(attempt, deadline)
+                continue
+
+            if response.status_code == 401 and not reauthenticated:
+                reauthenticated = True
+                self.invalidate()
+                continue
+            if response.status_code == 429:
+                self.stats["throttled"] += 1
+                self.limiter.pause(self._retry_after(response))
+                self.stats["retries"] += 1
+                continue
+            if response.status_code in RETRYABLE_STATUSES:
+                self._backoff(attempt, deadline)
+                continue
+            return response
+
+        raise SpotifyUnavailable("Spotify did not respond after retries")
+
+    def get_stats(self):
+        return dict(self.stats)
+
+    def _retry_after(self, response):
+        try:
+            return max(float(response.headers.get("Retry-After", 1)), 0.1)
+        except ValueError:
+            return 1
+
+    def _backoff(self, attempt, deadline):
+        delay = random.uniform(0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt))
+        if time.monotonic() + delay > deadline:
+            raise SpotifyUnavailable("Spotify did not respond in time")
+        self.stats["retries"] += 1
+        time.sleep(delay)
+
+    # Internal helper, always called with self._lock held
 
-    return response_data.get("access_token")
+    def _request_token(self):
+        auth_string = f"{settings.SPOTIFY_CLIENT_ID}:{settings.SPOTIFY_CLIENT_SECRET}"
+        auth_base64 = base64.b64encode(auth_string.encode('utf-8')).decode('utf-8')
+        headers = {
+            "Authorization": f"Basic {auth_base64}",
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        try:
+            response = self._session.post(
+                self.token_url, headers=headers, data={"grant_type": "client_credentials"}, timeout=REQUEST_TIMEOUT
+            )
+            response_data = response.json()
+            self._token = response_data.get("access_token")
+            self._expires_at = time.time() + int(response_data.get("expires_in", 3600))
+            self.stats["token_requests"] += 1
+        except (requests.RequestException, ValueError) as e:
+            print(f"Spotify token error: {e}")
+            self.stats["failures"] += 1
+            self._token = None
+            self._expires_at = 0
+
+
+_client = SpotifyClient()
+
+
+def get_spotify_client():
+    return _client
+
+
+def get_token():
+    """Get Spotify access token"""
+    return _client.get_token()
 
 def search_albums(artist_name):
-    """Search albums by artist name"""
-    token = get_token()
-    if not token:
-        return {"error": "Could not authenticate with Spotify"}
+    """Search albums by artist name, served from the search cache when possible"""
+    cached = album_search_cache.get(artist_name, "album")
+    if cached is not None:
+        return cached
 
-    url = f"https://api.spotify.com/v1/search?q={artist_name}&type=album&limit=10"
-    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        response = _client.get("/search", params={"q": artist_name, "type": "album", "limit": 10})
+    except SpotifyUnavailable as e:
+        print(f"Spotify search unavailable: {e}")
+        stale = album_search_cache.get(artist_name, "album", allow_stale=True)
+        if stale is not None:
+            return stale
+        return {"error": "Spotify is busy right now, please try again shortly"}
 
-    response = requests.get(url, headers=headers)
+    if response is None:
+        return {"error": "Could not authenticate with Spotify"}
     if response.status_code != 200:
         return {"error": "Failed to fetch data from Spotify"}
 
     data = response.json()
-    albums = []
-
-    for item in data.get("albums", {}).get("items", []):
-        albums.append({
-            "id": item["id"],
-            "title": item["name"],
-            "artist": item["artists"][0]["name"] if item["artists"] else "Unknown Artist",
-            "cover_url": item["images"][0]["url"] if item["images"] else None,
-            "release_date": item.get("release_date", "Unknown")
-        })
-
-    return albums
\ No newline at end of file
+    albums = [_album_from_item(item) for item in data.get("albums", {}).get("items", [])]
+
+    album_search_cache.set(artist_name, "album", albums)
+    return albums
+
+
+def _album_from_item(item):
+    return {
+        "id": item["id"],
+        "title": item["name"],
+        "artist": item["artists"][0]["name"] if item.get("artists") else "Unknown Artist",
+        "cover_url": item["images"][0]["url"] if item.get("images") else None,
+        "release_date": item.get("release_date", "Unknown")
+    }
+
+
+def get_albums(spotify_ids):
+    """Album details for up to 20 Spotify ids per request; unknown ids are skipped"""
+    albums = {}
+    spotify_ids = list(dict.fromkeys(spotify_ids))
+    for start in range(0, len(spotify_ids), 20):
+        response = _client.get("/albums", params={"ids": ",".join(spotify_ids[start:start + 20])})
+        if response is None or response.status_code != 200:
+            continue
+        for item in response.json().get("albums", []):
+            if item:
+                albums[item["id"]] = _album_from_item(item)
+    return albums
+
+
+def find_album(title, artist=None):
+    """Best Spotify match for an album title (and artist), or None"""
+    query = f'album:"{title}"' + (f' artist:"{artist}"' if artist else "")
+    response = _client.get("/search", params={"q": query, "type": "album", "limit": 1})
+    if response is None or response.status_code != 200:
+        return None
+    items = response.json().get("albums", {}).get("items", [])
+    return _album_from_item(items[0]) if items else None
+
@@ -0,0 +1,262 @@
+from datetime import datetime, timedelta, timezone
+
+from ..redis_client import get_redis_client
+from ..user.supabase_client import get_admin_client
+
+# Window name -> age limit of the reviews it counts (None = all time)
+TRENDING_WINDOWS = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+    "all": None,
+}
+DEFAULT_WINDOW = "7d"
+
+# Bayesian average: every album starts with PRIOR_WEIGHT virtual reviews at
+# the window's mean rating, so one 5-star review cannot outrank fifty 4.5s
+PRIOR_WEIGHT = 5
+DEFAULT_MEAN = 3.0
+
+REBUILD_LOCK_KEY = "soundscore:trending:lock"
+FETCH_CHUNK = 1000
+
+# Apply a rating delta to an album and rescore it in one round trip.
+# KEYS: ranking zset, stats hash. ARGV: album id, sum delta, count delta,
+# prior weight, fallback mean
+_APPLY_DELTA = """
+local total = redis.call('hincrby', KEYS[2], ARGV[1] .. ':sum', ARGV[2])
+local count = redis.call('hincrby', KEYS[2], ARGV[1] .. ':count', ARGV[3])
+if count <= 0 then
+    redis.call('hdel', KEYS[2], ARGV[1] .. ':sum', ARGV[1] .. ':count')
+    redis.call('zrem', KEYS[1], ARGV[1])
+    return nil
+end
+local mean = tonumber(redis.call('hget', KEYS[2], 'mean') or ARGV[5])
+local prior = tonumber(ARGV[4])
+local score = (prior * mean + total) / (prior + count)
+redis.call('zadd', KEYS[1], score, ARGV[1])
+return tostring(score)
+"""
+
+
+def ranking_key(window):
+    return f"soundscore:trending:{window}"
+
+
+def stats_key(window):
+    return f"soundscore:trending:{window}:stats"
+
+
+def bayesian_score(rating_sum, rating_count, mean, prior_weight=PRIOR_WEIGHT):
+    return (prior_weight * mean + rating_sum) / (prior_weight + rating_count)
+
+
+def _parse_timestamp(value):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    # Reviews are written with naive timestamps, which Postgres stores as UTC
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _windows_for(created_at, now=None):
+    """Windows a review created at ``created_at`` currently counts towards"""
+    now = now or datetime.now(timezone.utc)
+    created = _parse_timestamp(created_at)
+    return [
+        window for window, age in TRENDING_WINDOWS.items()
+        if age is None or (created is not None and now - created <= age)
+    ]
+
+
+def _apply_review(review, sign):
+    if not review or review.get('album_id') is None or review.get('rating') is None:
+        return
+    try:
+        redis_client = get_redis_client()
+        pipe = redis_client.pipeline()
+        for window in _windows_for(review.get('created_at')):
+            pipe.eval(
+                _APPLY_DELTA, 2, ranking_key(window), stats_key(window),
+                review['album_id'], sign * int(review['rating']), sign, PRIOR_WEIGHT, DEFAULT_MEAN,
+            )
+        pipe.execute()
+    except Exception as e:
+        print(f"Trending update error: {e}")
+
+
+def review_added(review):
+    _apply_review(review, 1)
+
+
+def review_removed(review):
+    _apply_review(review, -1)
+
+
+def review_changed(old_review, new_review):
+    _apply_review(old_review, -1)
+    _apply_review(new_review, 1)
+
+
+def _fetch_all(query_factory):
+    """Page through a PostgREST query that may exceed the server's row cap"""
+    rows, start = [], 0
+    while True:
+        chunk = query_factory().range(start, start + FETCH_CHUNK - 1).execute().data or []
+        rows.extend(chunk)
+        if len(chunk) < FETCH_CHUNK:
+            return rows
+        start += FETCH_CHUNK
+
+
+def _collect_totals(client, now):
+    """Return {window: {album_id: [rating_sum, rating_count]}} from Supabase"""
+    totals = {window: {} for window in TRENDING_WINDOWS}
+
+    # All time comes straight from the trigger-maintained aggregates
+    for stats in _fetch_all(lambda: client.table('soundscore_albumstats')
+                            .select('album_id, rating_sum, rating_count')
+                            .gt('rating_count', 0)
+                            .order('album_id')):
+        totals["all"][stats['album_id']] = [stats['rating_sum'], stats['rating_count']]
+
+    # The widest bounded window covers the shorter ones, so one scan is enough
+    widest = max(age for age in TRENDING_WINDOWS.values() if age is not None)
+    cutoff = (now - widest).isoformat()
+    for review in _fetch_all(lambda: client.table('soundscore_review')
+                             .select('album_id, rating, created_at')
+                             .gte('created_at', cutoff)
+                             .order('id')):
+        for window in _windows_for(review.get('created_at'), now):
+            if window == "all":
+                continue
+            entry = totals[window].setdefault(review['album_id'], [0, 0])
+            entry[0] += review['rating']
+            entry[1] += 1
+
+    return totals
+
+
+def rebuild_trending(now=None):
+    """
+    Recompute every window from Supabase and swap the rankings in atomically.
+
+    Incremental updates only ever add reviews to the bounded windows, so this
+    is what ages old reviews out; run it periodically. Returns the number of
+    ranked albums per window.
+    """
+    client = get_admin_client()
+    if not client:
+        return {"error": "Could not connect to Supabase"}
+
+    now = now or datetime.now(timezone.utc)
+    try:
+        totals = _collect_totals(client, now)
+    except Exception as e:
+        return {"error": f"Error rebuilding trending albums: {str(e)}"}
+
+    redis_client = get_redis_client()
+    pipe = redis_client.pipeline()
+    ranked = {}
+    for window, albums in totals.items():
+        overall_count = sum(count for _, count in albums.values())
+        mean = sum(total for total, _ in albums.values()) / overall_count if overall_count else DEFAULT_MEAN
+
+        tmp_ranking, tmp_stats = f"{ranking_key(window)}:tmp", f"{stats_key(window)}:tmp"
+        pipe.delete(tmp_ranking, tmp_stats)
+        stats = {"mean": mean, "built_at": now.isoformat()}
+        scores = {}
+        for album_id, (total, count) in albums.items():
+            stats[f"{album_id}:sum"] = total
+            stats[f"{album_id}:count"] = count
+            scores[album_id] = bayesian_score(total, count, mean)
+        pipe.hset(tmp_stats, mapping=stats)
+        pipe.rename(tmp_stats, stats_key(window))
+        if scores:
+            pipe.zadd(tmp_ranking, scores)
+            pipe.rename(tmp_ranking, ranking_key(window))
+        else:
+            pipe.delete(ranking_key(window))
+        ranked[window] = len(scores)
+    pipe.execute()
+    return ranked
+
+
+def _ensure_built(redis_client, window):
+    """Build the rankings on first use; only one caller at a time does the work"""
+    if redis_client.hexists(stats_key(window), "built_at"):
+        return
+    if redis_client.set(REBUILD_LOCK_KEY, 1, nx=True, ex=120):
+        try:
+            rebuild_trending()
+        finally:
+            redis_client.delete(REBUILD_LOCK_KEY)
+
+
+def get_trending_albums(window=DEFAULT_WINDOW, page=1, page_size=10):
+    """
+    One page of the trending leaderboard for ``window``, best first.
+
+    Reads a slice of a Redis sorted set, so the cost does not depend on how
+    many albums or reviews exist; only the albums on the page are fetched.
+    """
+    if window not in TRENDING_WINDOWS:
+        return {"error": f"Unknown window '{window}'"}
+    page = max(int(page), 1)
+    page_size = max(min(int(page_size), 50), 1)
+    start = (page - 1) * page_size
+
+    try:
+        redis_client = get_redis_client()
+        _ensure_built(redis_client, window)
+
+        ranking = redis_client.zrevrange(ranking_key(window), start, start + page_size - 1, withscores=True)
+        total = redis_client.zcard(ranking_key(window))
+        album_ids = [int(album_id) for album_id, _ in ranking]
+
+        albums = {}
+        counts = []
+        if album_ids:
+            fields = []
+            for album_id in album_ids:
+                fields += [f"{album_id}:sum", f"{album_id}:count"]
+            counts = redis_client.hmget(stats_key(window), fields)
+
+            client = get_admin_client()
+            response = client.table('soundscore_album') \
+                .select('id, title, artist, cover_image, spotify_id') \
+                .in_('id', album_ids) \
+                .execute()
+            albums = {album['id']: album for album in response.data or []}
+
+        results = []
+        for position, (album_id, score) in enumerate(ranking):
+            album = albums.get(int(album_id))
+            if not album:
+                continue
+            rating_sum = int(counts[position * 2] or 0)
+            rating_count = int(counts[position * 2 + 1] or 0)
+            avg = rating_sum / rating_count if rating_count else 0
+            results.append({
+                **album,
+                'rank': start + position + 1,
+                'score': round(score, 3),
+                'avg_rating': avg,
+                'avg_rating_rounded': round(avg),
+                'review_count': rating_count,
+            })
+
+        return {
+            "window": window,
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "has_more": start + page_size < total,
+            "albums": results,
+        }
+
+    except Exception as e:
+        return {"error": f"Error fetching trending albums: {str(e)}"}
@@ -0,0 +1,92 @@
+import threading
+import time
+
+from django.core.cache import cache
+
+# How long a caller without the refresh lock waits for the first value
+MISS_WAIT_SECONDS = 2
+MISS_POLL_INTERVAL = 0.05
+
+
+def _is_error(value):
+    return isinstance(value, dict) and "error" in value
+
+
+class StaleWhileRevalidateCache:
+    """
+    Django-cache entry that keeps serving its last good value after it goes
+    stale while a single background thread reloads it.
+
+    ``fresh_for`` is how long a value counts as fresh and ``keep_for`` how
+    long a stale value may still be served. Only the caller that wins the
+    refresh lock (``cache.add``) runs the loader, so a popular key that expires
+    causes one reload instead of a stampede. Loader results shaped like
+    ``{"error": ...}`` are never cached.
+
+    Invalidation bumps a version counter (``cache.incr``, atomic in Redis)
+    instead of rewriting the entry. An entry stored under an older version
+    counts as stale, including one written by a refresh that was already
+    running when the invalidation happened.
+    """
+
+    def __init__(self, key, loader, fresh_for=60, keep_for=60 * 60, lock_timeout=30):
+        self.key = key
+        self.lock_key = f"{key}:refresh-lock"
+        self.version_key = f"{key}:version"
+        self.loader = loader
+        self.fresh_for = fresh_for
+        self.keep_for = keep_for
+        self.lock_timeout = lock_timeout
+
+    def get(self):
+        found = cache.get_many([self.key, self.version_key])
+        entry = found.get(self.key)
+        if entry is not None:
+            if not self._is_fresh(entry, found.get(self.version_key, 0)) and self._acquire():
+                threading.Thread(target=self._refresh, daemon=True).start()
+            return entry["value"]
+
+        if self._acquire():
+            return self._refresh()
+
+        # Someone else is loading it: wait for their value rather than piling on
+        deadline = time.time() + MISS_WAIT_SECONDS
+        while time.time() < deadline:
+            time.sleep(MISS_POLL_INTERVAL)
+            entry = cache.get(self.key)
+            if entry is not None:
+                return entry["value"]
+        return self.loader()
+
+    def invalidate(self):
+        """Mark the value stale; the next read still gets it and triggers a reload"""
+        # The counter never expires, so a version number is never reused
+        if not cache.add(self.version_key, 1, None):
+            cache.incr(self.version_key)
+
+    def clear(self):
+        self.invalidate()
+        cache.delete_many([self.key, self.lock_key])
+
+    @staticmethod
+    def _is_fresh(entry, version):
+        return entry["fresh_until"] > time.time() and entry.get("version", 0) == version
+
+    def _acquire(self):
+        return cache.add(self.lock_key, 1, self.lock_timeout)
+
+    def _refresh(self):
+        try:
+            # Read before loading: an invalidation during the load leaves this entry stale
+            version = cache.get(self.version_key, 0)
+            value = self.loader()
+            if not _is_error(value):
+                entry = {"value": value, "fresh_until": time.time() + self.fresh_for, "version": version}
+                cache.set(self.key, entry, self.keep_for)
+            return value
+        except Exception as e:
+            print(f"Cache refresh error for {self.key}: {e}")
+            entry = cache.get(self.key)
+            return entry["value"] if entry is not None else {"error": str(e)}
+        finally:
+            cache.delete(self.lock_key)
@@ -1,5 +1,6 @@
 from .supabase_client import authenticate_with_jwt
 from datetime import datetime
+from ..autocomplete import user_indexed
 
 def add_user_supabase(username, password, email):
     client = authenticate_with_jwt()
@@ -27,6 +28,8 @@ def add_user_supabase(username, password, email):
         
         if not user_insert.data:
             return {"error": "Failed to create user record"}
+
+        user_indexed(username)
         
         return {
             "success": True,
@@ -0,0 +1,137 @@
+from supabase import acreate_client, AsyncClientOptions
+from decouple import config
+import asyncio
+import time
+import weakref
+
+from .supabase_client import TOKEN_REFRESH_MARGIN
+
+
+class _LoopState:
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.client = None
+        self.refresh_token = None
+        self.expires_at = 0
+
+
+class AsyncSupabaseClientRegistry:
+    """
+    Async counterpart of SupabaseClientRegistry for the Channels consumer.
+
+    Keeps one signed-in AsyncClient per event loop, so every coroutine on a
+    worker shares the same HTTP connection pool and never touches the sync
+    thread pool. The token is refreshed lazily when it is close to expiring.
+    """
+
+    def __init__(self):
+        self._states = weakref.WeakKeyDictionary()
+        self.stats = {"sign_ins": 0, "refreshes": 0, "reuses": 0, "failures": 0}
+
+    async def get_client(self):
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState()
+
+        if state.client is not None and time.time() < state.expires_at - TOKEN_REFRESH_MARGIN:
+            self.stats["reuses"] += 1
+            return state.client
+
+        async with state.lock:
+            if state.client is not None and time.time() < state.expires_at - TOKEN_REFRESH_MARGIN:
+                self.stats["reuses"] += 1
+                return state.client
+            if state.client is not None and state.refresh_token:
+                await self._refresh(state)
+            if state.client is None:
+                await self._sign_in(state)
+            return state.client
+
+    async def _sign_in(self, state):
+        try:
+            client = await acreate_client(
+                config("SUPABASE_URL"),
+                config("SUPABASE_KEY"),
+                options=AsyncClientOptions(auto_refresh_token=False),
+            )
+            response = await client.auth.sign_in_with_password({
+                'email': config("SUPABASE_EMAIL"),
+                'password': config("SUPABASE_PASSWORD")
+            })
+            state.client = client
+            self._apply_session(state, response.session)
+            self.stats["sign_ins"] += 1
+        except Exception as e:
+            print(f"Async JWT authentication error: {e}")
+            self.stats["failures"] += 1
+            state.client = None
+            state.expires_at = 0
+
+    async def _refresh(self, state):
+        try:
+            response = await state.client.auth.refresh_session(state.refresh_token)
+            self._apply_session(state, response.session)
+            self.stats["refreshes"] += 1
+        except Exception as e:
+            print(f"Async JWT refresh error, signing in again: {e}")
+            state.client = None
+            state.refresh_token = None
+            state.expires_at = 0
+
+    def _apply_session(self, state, session):
+        state.client.postgrest.auth(session.access_token)
+        state.refresh_token = session.refresh_token
+        state.expires_at = session.expires_at or (time.time() + (session.expires_in or 3600))
+
+
+_registry = AsyncSupabaseClientRegistry()
+
+
+async def get_async_client():
+    """Return the signed-in AsyncClient for the running event loop, or None."""
+    return await _registry.get_client()
+
+
+def get_async_client_stats():
+    return dict(_registry.stats)
+
+
+# Awaitable equivalents of the table / RPC calls used across the views
+
+async def select_rows(table, columns="*", filters=None, in_filters=None, order=None, desc=False, limit=None):
+    client = await get_async_client()
+    if not client:
+        return []
+    query = client.table(table).select(columns)
+    for column, value in (filters or {}).items():
+        query = query.eq(column, value)
+    for column, values in (in_filters or {}).items():
+        query = query.in_(column, list(values))
+    if order:
+        query = query.order(order, desc=desc)
+    if limit:
+        query = query.limit(limit)
+    response = await query.execute()
+    return response.data or []
+
+
+async def select_one(table, columns="*", filters=None):
+    rows = await select_rows(table, columns, filters=filters, limit=1)
+    return rows[0] if rows else None
+
+
+async def insert_row(table, data):
+    client = await get_async_client()
+    if not client:
+        return None
+    response = await client.table(table).insert(data).execute()
+    return response.data[0] if response.data else None
+
+
+async def call_rpc(function_name, params=None):
+    client = await get_async_client()
+    if not client:
+        return None
+    response = await client.rpc(function_name, params or {}).execute()
+    return response.data
@@ -1,4 +1,7 @@
 from .supabase_client import authenticate_with_jwt
+from .user_lookup import invalidate_supabase_user_id
+from .profile import invalidate_profile
+from ..autocomplete import user_removed
 from postgrest import APIError
 
 def delete_user_data_supabase(username):
@@ -29,10 +32,14 @@ def delete_user_data_supabase(username):
         print(f"Delete reviews response: {delete_reviews_response.data}")
 
 
-        # 3. Delete the user from the soundscore_user table
+        # 3. Delete the user from the soundscore_user table (their
+        # soundscore_userstats row goes with it, ON DELETE CASCADE)
         print(f"Attempting to delete user from soundscore_user table, id: {supabase_user_id}")
         delete_user_response = client.table('soundscore_user').delete().eq('id', supabase_user_id).execute()
         print(f"Delete user response: {delete_user_response.data}")
+        invalidate_supabase_user_id(username)
+        user_removed(username)
+        invalidate_profile(supabase_user_id)
 
         # Check for errors specifically
         # Assuming no exception means success for now.
@@ -0,0 +1,91 @@
+from ..swr_cache import StaleWhileRevalidateCache
+from ..review.review_pages import REVIEWS_PAGE_SIZE, paginate_reviews
+from .supabase_client import authenticate_with_jwt
+
+FAVORITES_LIMIT = 12
+
+_REVIEW_COLUMNS = 'id, rating, text, is_favorite, created_at, soundscore_album(title, artist, cover_image, spotify_id)'
+_STATS_COLUMNS = 'review_count, rating_sum, favorite_count, rating_1, rating_2, rating_3, rating_4, rating_5'
+
+
+def get_user_reviews_page(client, user_id, cursor=None, page_size=REVIEWS_PAGE_SIZE):
+    """One page of a user's reviews, newest first, served by review_user_recent_idx"""
+    query = client.table('soundscore_review') \
+        .select(_REVIEW_COLUMNS) \
+        .eq('user_id', int(user_id))
+    return paginate_reviews(query, cursor, page_size)
+
+
+def get_user_stats(client, user_id):
+    """
+    Review count, average, favorites count and rating histogram for a user,
+    read from the trigger-maintained soundscore_userstats row.
+    """
+    response = client.table('soundscore_userstats') \
+        .select(_STATS_COLUMNS) \
+        .eq('user_id', int(user_id)) \
+        .limit(1) \
+        .execute()
+    row = (response.data or [{}])[0]
+
+    review_count = row.get('review_count') or 0
+    return {
+        "review_count": review_count,
+        "average_rating": round(row['rating_sum'] / review_count, 1) if review_count else None,
+        "favorite_count": row.get('favorite_count') or 0,
+        "histogram": {rating: row.get(f'rating_{rating}') or 0 for rating in range(1, 6)},
+    }
+
+
+def _load_profile(user_id):
+    client = authenticate_with_jwt()
+    if not client:
+        return {"error": "Could not connect to Supabase"}
+
+    user_response = client.table('soundscore_user') \
+        .select('id, username, profile_picture') \
+        .eq('id', user_id) \
+        .limit(1) \
+        .execute()
+    if not user_response.data:
+        return {"error": "User not found"}
+
+    favorites_response = client.table('soundscore_review') \
+        .select(_REVIEW_COLUMNS) \
+        .eq('user_id', user_id) \
+        .eq('is_favorite', True) \
+        .order('created_at', desc=True) \
+        .limit(FAVORITES_LIMIT) \
+        .execute()
+
+    return {
+        "user": user_response.data[0],
+        "stats": get_user_stats(client, user_id),
+        "favorites": favorites_response.data or [],
+        "first_page": get_user_reviews_page(client, user_id),
+    }
+
+
+def _profile_cache(user_id):
+    user_id = int(user_id)
+    return StaleWhileRevalidateCache(f"profile:{user_id}", lambda: _load_profile(user_id), fresh_for=60)
+
+
+def get_profile_snapshot(user_id):
+    """
+    The cached profile header, stats, favorites and first page of reviews
+    shared by the reviews and profile pages, or {"error": ...}.
+    """
+    try:
+        return _profile_cache(user_id).get()
+    except Exception as e:
+        return {"error": f"Error loading profile: {str(e)}"}
+
+
+def invalidate_profile(user_id):
+    """
+    Drop the snapshot after a write by or about this user. It is cleared
+    rather than marked stale so the author sees their change immediately.
+    """
+    if user_id:
+        _profile_cache(user_id).clear()
@@ -1,36 +1,173 @@
-from supabase import create_client
+from supabase import create_client, ClientOptions
 from decouple import config
+import functools
+import threading
+import time
 import jwt
 
+# Refresh the access token this many seconds before Supabase expires it
+TOKEN_REFRESH_MARGIN = 60
+
+
 def get_supabase_client():
     url = config("SUPABASE_URL")
     key = config("SUPABASE_KEY")
-    supabase = create_client(url, key)
+    # Token refresh is driven by SupabaseClientRegistry, not by gotrue's own timer
+    supabase = create_client(url, key, options=ClientOptions(auto_refresh_token=False))
 
     return supabase
 
 
+class SupabaseClientRegistry:
+    """
+    Process-wide holder for the authenticated Supabase client.
+
+    Signs in once, keeps the session and refreshes the access token in a
+    background timer shortly before it expires, so callers get a ready client
+    without any auth round trip. If PostgREST still answers 401 (an expired
+    or revoked JWT) the session is dropped and the next caller signs in again.
+    Safe to use from sync views and from the Channels consumer (through
+    database_sync_to_async).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Counters get their own lock so the lock-free fast path never waits on a sign-in
+        self._stats_lock = threading.Lock()
+        self._client = None
+        self._admin_client = None
+        self._refresh_token = None
+        self._expires_at = 0
+        self._timer = None
+        self.stats = {"sign_ins": 0, "refreshes": 0, "reuses": 0, "failures": 0, "rejections": 0}
+
+    def get_client(self):
+        # Fast path: a live client with a token that is not about to expire
+        client = self._client
+        if client is not None and time.time() < self._expires_at - TOKEN_REFRESH_MARGIN:
+            self._count("reuses")
+            return client
+
+        with self._lock:
+            # Another thread may have signed in while we waited for the lock
+            if self._client is not None and time.time() < self._expires_at - TOKEN_REFRESH_MARGIN:
+                self._count("reuses")
+                return self._client
+            if self._client is not None and self._refresh_token:
+                self._refresh()
+            if self._client is None or time.time() >= self._expires_at - TOKEN_REFRESH_MARGIN:
+                self._sign_in()
+            return self._client
+
+    def get_admin_client(self):
+        if self._admin_client is None:
+            with self._lock:
+                if self._admin_client is None:
+                    url = config("SUPABASE_URL")
+                    key = config("SUPABASE_SERVICE_KEY")  # Service key, NOT anon key!
+                    self._admin_client = create_client(url, key)
+        return self._admin_client
+
+    def invalidate(self, client=None):
+        """
+        Drop the cached session, e.g. after Supabase rejected the token. With
+        ``client``, only if that client is still the current one.
+        """
+        with self._lock:
+            if client is not None and self._client is not client:
+                return
+            self._cancel_timer()
+            self._client = None
+            self._refresh_token = None
+            self._expires_at = 0
+
+    def get_stats(self):
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _on_response(self, client, response):
+        # Only PostgREST rejections of this client's token; auth endpoints answer 400 on bad credentials
+        if response.status_code != 401 or self._client is not client:
+            return
+        print(f"Supabase rejected the access token ({response.request.url.path}), signing in again")
+        self._count("rejections")
+        self.invalidate(client)
+
+    # Internal helpers, always called with self._lock held
+
+    def _sign_in(self):
+        try:
+            client = get_supabase_client()
+            response = client.auth.sign_in_with_password({
+                'email': config("SUPABASE_EMAIL"),
+                'password': config("SUPABASE_PASSWORD")
+            })
+            self._client = client
+            self._apply_session(response.session)
+            self._count("sign_ins")
+        except Exception as e:
+            print(f"JWT authentication error: {e}")
+            self._count("failures")
+            self._client = None
+            self._expires_at = 0
+
+    def _refresh(self):
+        try:
+            response = self._client.auth.refresh_session(self._refresh_token)
+            self._apply_session(response.session)
+            self._count("refreshes")
+        except Exception as e:
+            print(f"JWT refresh error, signing in again: {e}")
+            self._client = None
+            self._refresh_token = None
+            self._expires_at = 0
+
+    def _apply_session(self, session):
+        # supabase-py builds a new PostgREST client on every auth event, so hook each one
+        postgrest = self._client.postgrest
+        postgrest.auth(session.access_token)
+        postgrest.session.event_hooks["response"].append(functools.partial(self._on_response, self._client))
+        self._refresh_token = session.refresh_token
+        self._expires_at = session.expires_at or (time.time() + (session.expires_in or 3600))
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        self._cancel_timer()
+        delay = max(self._expires_at - TOKEN_REFRESH_MARGIN * 2 - time.time(), 1)
+        self._timer = threading.Timer(delay, self._refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._client is None:
+                return
+            self._refresh()
+            if self._client is None:
+                self._sign_in()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+_registry = SupabaseClientRegistry()
+
+
 def authenticate_with_jwt():
-    client = get_supabase_client()
-    response = client.auth.sign_in_with_password({
-        'email': config("SUPABASE_EMAIL"),
-        'password': config("SUPABASE_PASSWORD")
-    })
-    try:
-        access_token = response.session.access_token
-        client.postgrest.auth(access_token)
-        response = client.table('soundscore_user').select('*').limit(1).execute()
-        return client
+    client = _registry.get_client()
+    return client if client is not None else False
 
 
-    except Exception as e:
-        print(f"JWT authentication error: {e}")
-        return False
-    
+def get_client_stats():
+    """Sign-in / refresh / reuse counters for the shared client."""
+    return _registry.get_stats()
 
 
 def get_admin_client():
-    url = config("SUPABASE_URL")
-    key = config("SUPABASE_SERVICE_KEY")  # Service key, NOT anon key!
-    return create_client(url, key)
-
+    return _registry.get_admin_client()
@@ -1,4 +1,7 @@
 from .supabase_client import authenticate_with_jwt, get_admin_client
+from .user_lookup import invalidate_supabase_user_id
+from .profile import invalidate_profile
+from ..autocomplete import user_indexed, user_removed
 import os
 import base64
 
@@ -12,7 +15,7 @@ def update_user_supabase(old_username, new_username, email=None, password=None,
             return {"error": "Could not connect to Supabase"}
         
         # Get the user ID from Supabase
-        user_response = client.table('soundscore_user').select('id').eq('username', old_username).limit(1).execute()
+        user_response = client.table('soundscore_user').select('id, profile_picture').eq('username', old_username).limit(1).execute()
         if not user_response.data:
             return {"error": f"User '{old_username}' not found in Supabase"}
         
@@ -68,6 +71,14 @@ def update_user_supabase(old_username, new_username, email=None, password=None,
             update_response = client.table('soundscore_user').update(update_data).eq('id', supabase_user_id).execute()
             if hasattr(update_response, 'error') and update_response.error:
                 return {"error": f"Error updating user in Supabase: {update_response.error}"}
+            profile_picture_url = update_data.get('profile_picture', user_response.data[0].get('profile_picture'))
+            if 'username' in update_data:
+                invalidate_supabase_user_id(old_username, new_username)
+                user_removed(old_username)
+                user_indexed(new_username, profile_picture_url)
+            elif 'profile_picture' in update_data:
+                user_indexed(old_username, profile_picture_url)
+            invalidate_profile(supabase_user_id)
         
         return {"success": True, "message": "User updated successfully in Supabase"}
         
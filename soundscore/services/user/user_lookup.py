@@ -0,0 +1,39 @@
+from django.core.cache import cache
+from .supabase_client import authenticate_with_jwt
+
+# Usernames rarely change, and both update and delete invalidate explicitly
+USER_ID_CACHE_TIMEOUT = 60 * 60
+
+
+def _user_id_cache_key(username):
+    return f"supabase_user_id:{username}"
+
+
+def get_supabase_user_id(username):
+    """
+    Resolve a username to its soundscore_user id, going through the shared
+    username -> id cache before asking Supabase.
+    """
+    if not username:
+        return None
+
+    key = _user_id_cache_key(username)
+    user_id = cache.get(key)
+    if user_id is not None:
+        return user_id
+
+    client = authenticate_with_jwt()
+    if not client:
+        return None
+
+    user_response = client.table('soundscore_user').select('id').eq('username', username).limit(1).execute()
+    if not user_response.data:
+        return None
+
+    user_id = user_response.data[0]['id']
+    cache.set(key, user_id, USER_ID_CACHE_TIMEOUT)
+    return user_id
+
+
+def invalidate_supabase_user_id(*usernames):
+    cache.delete_many([_user_id_cache_key(username) for username in usernames if username])
@@ -0,0 +1,49 @@
+from .supabase_client import authenticate_with_jwt
+
+MAX_PAGE_SIZE = 50
+
+
+def search_users(query, page=1, page_size=10):
+    """
+    Page through users whose username contains ``query``, prefix matches
+    first, each with its review count and average rating.
+
+    Backed by the ``search_users`` RPC (trigram index + one aggregate query);
+    one extra row is requested to tell whether another page exists.
+    """
+    query = (query or "").strip()
+    if not query:
+        return {"users": [], "page": 1, "has_more": False}
+
+    client = authenticate_with_jwt()
+    if not client:
+        return {"error": "Failed to authenticate with Supabase"}
+
+    try:
+        page = max(int(page), 1)
+        page_size = max(min(int(page_size), MAX_PAGE_SIZE), 1)
+    except (TypeError, ValueError):
+        return {"error": "page and page_size must be numbers"}
+
+    try:
+        response = client.rpc('search_users', {
+            'p_query': query,
+            'p_limit': page_size + 1,
+            'p_offset': (page - 1) * page_size,
+        }).execute()
+    except Exception as e:
+        print(f"User search error: {e}")
+        return {"error": str(e)}
+
+    rows = response.data or []
+    users = []
+    for row in rows[:page_size]:
+        users.append({
+            'id': row['id'],
+            'username': row['username'],
+            'profile_picture_url': row.get('profile_picture'),
+            'review_count': row.get('review_count') or 0,
+            'avg_rating': float(row['avg_rating']) if row.get('avg_rating') is not None else 'No ratings',
+        })
+
+    return {"users": users, "page": page, "has_more": len(rows) > page_size}
@@ -38,11 +38,11 @@ document.addEventListener('DOMContentLoaded', function() {
             // Reset load more button
             const loadMoreBtn = document.getElementById('load-more-btn');
             if (loadMoreBtn) {
-                loadMoreBtn.setAttribute('data-page', '1');
+                loadMoreBtn.setAttribute('data-cursor', '');
             }
             
             // Fetch reviews with new sort order
-            fetch(`/comments/feed/load-more/?page=0&page_size=5&exclude_ids=&sort_order=${newOrder}&comments_per_review=10`)
+            fetch(`/comments/feed/load-more/?page_size=5&sort_order=${newOrder}&comments_per_review=10`)
                 .then(response => response.json())
                 .then(data => {
                     console.log(`Received ${data.reviews.length} reviews with sort order: ${newOrder}`);
@@ -80,6 +80,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     
                     // Update load more button
                     if (loadMoreBtn) {
+                        loadMoreBtn.setAttribute('data-cursor', data.next_cursor || '');
                         loadMoreBtn.disabled = !data.has_more;
                         loadMoreBtn.classList.toggle('opacity-50', !data.has_more);
                     }
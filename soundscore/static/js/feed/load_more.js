@@ -45,8 +45,8 @@ document.addEventListener('DOMContentLoaded', function() {
     }
     
     loadMoreBtn.addEventListener('click', function() {
-        // Get current page number from button data attribute
-        let currentPage = parseInt(loadMoreBtn.getAttribute('data-page')) || 1;
+        // Get the keyset cursor for the next page from the button data attribute
+        const cursor = loadMoreBtn.getAttribute('data-cursor') || '';
         
         // Get sort order
         const sortToggleBtn = document.getElementById('sort-toggle');
@@ -56,12 +56,8 @@ document.addEventListener('DOMContentLoaded', function() {
         loadMoreBtn.disabled = true;
         loadMoreBtn.innerHTML = '<span>Loading...</span>';
         
-        // Get IDs of reviews already displayed to avoid duplicates
-        const displayedReviewIds = Array.from(document.querySelectorAll('[data-review-id]'))
-            .map(el => el.getAttribute('data-review-id')).join(',');
-        
         // Fetch more reviews
-        fetch(`/comments/feed/load-more/?page=${currentPage}&page_size=5&exclude_ids=${displayedReviewIds}&sort_order=${sortOrder}&comments_per_review=10`)
+        fetch(`/comments/feed/load-more/?cursor=${encodeURIComponent(cursor)}&page_size=5&sort_order=${sortOrder}&comments_per_review=10`)
             .then(response => response.json())
             .then(data => {
                 console.log("Load more response:", data);
@@ -97,10 +93,11 @@ document.addEventListener('DOMContentLoaded', function() {
                         }
                     });
                     
-                    // Update page number for next load
-                    loadMoreBtn.setAttribute('data-page', (currentPage + 1).toString());
                 }
                 
+                // Remember where the next page starts
+                loadMoreBtn.setAttribute('data-cursor', data.next_cursor || '');
+                
                 // Update button state
                 loadMoreBtn.disabled = !data.has_more;
                 if (!data.has_more) {
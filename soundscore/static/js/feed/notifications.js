@@ -61,11 +61,48 @@ document.addEventListener('DOMContentLoaded', function() {
       .catch(error => console.error('Error marking all as read:', error));
     }
     
-    // Load notification count on page load
-    loadNotificationCount();
+    // Unread count and new notifications are pushed over a WebSocket.
+    // Polling is only used while the socket is down.
+    let pollTimer = null;
+    let reconnectDelay = 1000;
+    connectNotificationSocket();
     
-    // Periodically check for new notifications (every 60 seconds)
-    setInterval(loadNotificationCount, 60000);
+    function connectNotificationSocket() {
+      const wsScheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
+      const socket = new WebSocket(`${wsScheme}://${window.location.host}/ws/notifications/`);
+      
+      socket.onopen = function() {
+        reconnectDelay = 1000;
+        if (pollTimer) {
+          clearInterval(pollTimer);
+          pollTimer = null;
+        }
+      };
+      
+      socket.onmessage = function(event) {
+        const data = JSON.parse(event.data);
+        if (typeof data.unread_count === 'number') {
+          updateNotificationCount(data.unread_count);
+        } else if (data.notification) {
+          // The server did not know the count yet, ask for it once
+          loadNotificationCount();
+        }
+        if (data.notification && isDropdownOpen) {
+          notificationList.querySelector('.no-notifications')?.classList.add('hidden');
+          const firstItem = notificationList.querySelector('.notification-item');
+          notificationList.insertBefore(createNotificationElement(data.notification), firstItem);
+        }
+      };
+      
+      socket.onclose = function() {
+        if (!pollTimer) {
+          loadNotificationCount();
+          pollTimer = setInterval(loadNotificationCount, 60000);
+        }
+        setTimeout(connectNotificationSocket, reconnectDelay);
+        reconnectDelay = Math.min(reconnectDelay * 2, 60000);
+      };
+    }
     
     function openDropdown() {
       notificationDropdown.classList.remove('hidden');
@@ -1,3 +1,642 @@
-from django.test import TestCase
+import base64
+import csv
+import io
+import json
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+from django.core.cache import cache
+from supabase import ClientOptions, create_client
+
+from .services.autocomplete import PrefixIndex
+from .services.feed import notification_queue
+from .services.feed.like_service import SQLiteLikeStore, toggle_review_like
+from .services.review import spotify
+from .services.review.review_export import EXPORT_ERROR_MARKER, export_csv, export_ndjson, open_user_reviews
+from .services.review.review_import import normalize_row
+from .services.review.review_pages import decode_cursor, encode_cursor
+from .services.review.review_writes import SQLiteReviewStore, delete_review, edit_review, save_review
+from .services.review.rate_limit import RateLimited, TokenBucket
+from .services.review.search_cache import SearchResultCache
+from .services.review.trending import DEFAULT_MEAN, PRIOR_WEIGHT, bayesian_score
+from .services.swr_cache import StaleWhileRevalidateCache
+from .services.user import supabase_client
+
+
+class FakeSpotify:
+    """
+    Local stand-in for the Spotify accounts and Web API endpoints.
+
+    POST /token always hands out a token; every GET pops the next scripted
+    (status, headers, body) response, or answers 200 with ``default`` once
+    the script runs out. Paths of the API calls are kept in ``requests``.
+    """
+
+    def __init__(self, default=None):
+        self.default = default or {"albums": {"items": []}}
+        self.script = []
+        self.requests = []
+        self.token_requests = 0
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                fake.token_requests += 1
+                self._send(200, {}, {"access_token": "test-token", "expires_in": 3600})
+
+            def do_GET(self):
+                fake.requests.append(self.path)
+                status, headers, body = fake.script.pop(0) if fake.script else (200, {}, fake.default)
+                self._send(status, headers, body)
+
+            def _send(self, status, headers, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+ALBUM_ITEM = {
+    "id": "album1",
+    "name": "OK Computer",
+    "artists": [{"name": "Radiohead"}],
+    "images": [{"url": "https://example.com/cover.jpg"}],
+    "release_date": "1997-05-21",
+}
+
+
+# No Redis in tests: every bucket runs on its per-process fallback
+@mock.patch.object(TokenBucket, "_redis", return_value=None)
+class TokenBucketTests(SimpleTestCase):
+
+    def test_burst_up_to_capacity_then_waits_for_refill(self, _redis):
+        bucket = TokenBucket("test", rate=10, capacity=3)
+        deadline = time.monotonic() + 0.05
+        for _ in range(3):
+            bucket.acquire(deadline)
+
+        with self.assertRaises(RateLimited) as raised:
+            bucket.acquire(time.monotonic() + 0.01)
+        self.assertAlmostEqual(raised.exception.retry_in, 0.1, delta=0.02)
+
+    def test_acquire_sleeps_until_a_token_is_refilled(self, _redis):
+        bucket = TokenBucket("test", rate=20, capacity=1)
+        bucket.acquire(time.monotonic() + 0.01)
+
+        started = time.monotonic()
+        bucket.acquire(started + 1)
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+
+    def test_pause_holds_every_caller_off(self, _redis):
+        bucket = TokenBucket("test", rate=100, capacity=10)
+        bucket.pause(0.5)
+
+        with self.assertRaises(RateLimited) as raised:
+            bucket.acquire(time.monotonic() + 0.1)
+        self.assertGreater(raised.exception.retry_in, 0.4)
+
+
+@override_settings(SPOTIFY_MAX_WAIT=2, SPOTIFY_MAX_RETRIES=3, SPOTIFY_RATE_LIMIT=100, SPOTIFY_RATE_BURST=100)
+@mock.patch.object(TokenBucket, "_redis", return_value=None)
+class SpotifyClientTests(SimpleTestCase):
+
+    def setUp(self):
+        self.fake = FakeSpotify()
+        self.addCleanup(self.fake.close)
+        self.client = spotify.SpotifyClient(api_url=self.fake.url, token_url=f"{self.fake.url}/token")
+
+    def test_429_waits_for_retry_after_then_retries(self, _redis):
+        self.fake.script.append((429, {"Retry-After": "0.3"}, {}))
+
+        started = time.monotonic()
+        response = self.client.get("/search", params={"q": "radiohead"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+        self.assertEqual(len(self.fake.requests), 2)
+        self.assertEqual(self.client.get_stats()["throttled"], 1)
+
+    def test_retry_after_beyond_the_wait_budget_gives_up(self, _redis):
+        self.fake.script.append((429, {"Retry-After": "30"}, {}))
+
+        started = time.monotonic()
+        with self.assertRaises(spotify.SpotifyUnavailable):
+            self.client.get("/search", params={"q": "radiohead"})
+
+        # Fails fast instead of sleeping out the pause, and sends nothing more
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(len(self.fake.requests), 1)
+
+    def test_token_is_reused_across_calls(self, _redis):
+        self.client.get("/search")
+        self.client.get("/search")
+
+        self.assertEqual(self.fake.token_requests, 1)
+        self.assertEqual(self.client.get_stats()["token_reuses"], 1)
+
+
+@override_settings(SPOTIFY_MAX_WAIT=1, SPOTIFY_MAX_RETRIES=3, SPOTIFY_RATE_LIMIT=100, SPOTIFY_RATE_BURST=100)
+@mock.patch.object(TokenBucket, "_redis", return_value=None)
+class SearchCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.fake = FakeSpotify(default={"albums": {"items": [ALBUM_ITEM]}})
+        self.addCleanup(self.fake.close)
+        client = spotify.SpotifyClient(api_url=self.fake.url, token_url=f"{self.fake.url}/token")
+        self.cache = SearchResultCache("test:search", ttl=60)
+        for patcher in (mock.patch.object(spotify, "_client", client),
+                        mock.patch.object(spotify, "album_search_cache", self.cache)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_repeated_search_is_served_from_cache(self, _redis):
+        first = spotify.search_albums("Radiohead")
+        # Case and spacing do not make a new cache entry
+        second = spotify.search_albums("  radiohead ")
+
+        self.assertEqual(first, second)
+        self.assertEqual(first[0]["title"], "OK Computer")
+        self.assertEqual(len(self.fake.requests), 1)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_stale_result_is_served_while_spotify_is_throttling(self, _redis):
+        self.cache.ttl = 0
+        spotify.search_albums("Radiohead")
+        self.fake.script.append((429, {"Retry-After": "30"}, {}))
+
+        results = spotify.search_albums("Radiohead")
+
+        self.assertEqual(results[0]["id"], "album1")
+        self.assertEqual(self.cache.get_stats()["stale_hits"], 1)
+        self.assertEqual(len(self.fake.requests), 2)
+
+
+class ToggleReviewLikeTests(SimpleTestCase):
+
+    def setUp(self):
+        self.store = SQLiteLikeStore()
+        self.store.add_review(1, author_id=10)
+        self.client = self.store.as_client()
+
+    def test_first_toggle_likes_the_review(self):
+        result = toggle_review_like(self.client, 20, 1)
+
+        self.assertEqual(result, {"liked": True, "like_count": 1, "author_id": 10})
+
+    def test_second_toggle_unlikes_it(self):
+        toggle_review_like(self.client, 20, 1)
+        result = toggle_review_like(self.client, 20, 1)
+
+        self.assertEqual(result, {"liked": False, "like_count": 0, "author_id": 10})
+
+    def test_like_count_covers_every_user(self):
+        for user_id in (20, 21, 22):
+            toggle_review_like(self.client, user_id, 1)
+        result = toggle_review_like(self.client, 21, 1)
+
+        self.assertFalse(result["liked"])
+        self.assertEqual(result["like_count"], 2)
+
+    def test_missing_review_is_an_error(self):
+        self.assertEqual(toggle_review_like(self.client, 20, 999), {"error": "Review not found"})
+
+
+class ReviewWriteTests(SimpleTestCase):
+    OWNER, OTHER = 1, 2
+
+    def setUp(self):
+        self.store = SQLiteReviewStore()
+        self.client = self.store.as_client()
+        self.review = save_review(self.client, self.OWNER, "album1", 4, text="Great",
+                                  album_title="OK Computer", album_artist="Radiohead")
+
+    def _rating(self):
+        row = self.store.connection.execute(
+            "SELECT rating FROM soundscore_review WHERE id = ?", (self.review["review_id"],)
+        ).fetchone()
+        return row["rating"] if row else None
+
+    def test_save_creates_the_album_and_review(self):
+        self.assertTrue(self.review["album_created"])
+        self.assertTrue(self.review["review_created"])
+        self.assertEqual(self.review["album_artist"], "Radiohead")
+
+    def test_saving_again_updates_the_owners_review(self):
+        result = save_review(self.client, self.OWNER, "album1", 2)
+
+        self.assertEqual(result["review_id"], self.review["review_id"])
+        self.assertFalse(result["review_created"])
+        self.assertEqual(result["previous_rating"], 4)
+        self.assertEqual(self._rating(), 2)
+
+    def test_another_user_saving_the_album_gets_their_own_review(self):
+        result = save_review(self.client, self.OTHER, "album1", 1)
+
+        self.assertTrue(result["review_created"])
+        self.assertFalse(result["album_created"])
+        self.assertNotEqual(result["review_id"], self.review["review_id"])
+        self.assertEqual(self._rating(), 4)
+
+    def test_owner_can_edit(self):
+        result = edit_review(self.client, self.OWNER, self.review["review_id"], 5, text="Even better")
+
+        self.assertEqual((result["previous_rating"], result["rating"]), (4, 5))
+        self.assertEqual(self._rating(), 5)
+
+    def test_edit_by_someone_else_looks_like_a_missing_review(self):
+        result = edit_review(self.client, self.OTHER, self.review["review_id"], 1)
+
+        self.assertEqual(result, {"error": "Review not found"})
+        self.assertEqual(self._rating(), 4)
+
+    def test_owner_can_delete(self):
+        result = delete_review(self.client, self.OWNER, self.review["review_id"])
+
+        self.assertEqual(result["spotify_id"], "album1")
+        self.assertIsNone(self._rating())
+
+    def test_delete_by_someone_else_leaves_the_review(self):
+        result = delete_review(self.client, self.OTHER, self.review["review_id"])
+
+        self.assertEqual(result, {"error": "Review not found"})
+        self.assertEqual(self._rating(), 4)
+
+    def test_out_of_range_rating_is_rejected(self):
+        result = save_review(self.client, self.OWNER, "album1", 6)
+
+        self.assertIn("error", result)
+        self.assertEqual(self._rating(), 4)
+
+
+class DispatchBatchTests(SimpleTestCase):
+
+    def setUp(self):
+        self.inserted = []
+        self.redis = mock.MagicMock()
+        self.pipe = self.redis.pipeline.return_value
+        for patcher in (mock.patch.object(notification_queue, "create_notifications_bulk", self._insert),
+                        mock.patch.object(notification_queue, "get_redis_client", return_value=self.redis),
+                        mock.patch.object(notification_queue.time, "sleep")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _insert(self, rows):
+        # Any batch holding a row without a recipient is rejected as a whole
+        if any(row["recipient_id"] is None for row in rows):
+            raise RuntimeError("null value in column recipient_id")
+        self.inserted.extend(rows)
+
+    def _events(self, *recipients, attempts=0):
+        return [{"row": {"recipient_id": recipient}, "attempts": attempts} for recipient in recipients]
+
+    def _pushed(self):
+        return [(key, json.loads(raw)) for (key, raw), _ in self.pipe.lpush.call_args_list]
+
+    def test_good_batch_is_inserted_in_one_go(self):
+        self.assertEqual(notification_queue.dispatch_batch(self._events(1, 2, 3)), (3, 0, 0))
+        self.assertEqual(len(self.inserted), 3)
+        self.redis.pipeline.assert_not_called()
+
+    def test_only_the_bad_row_is_requeued(self):
+        result = notification_queue.dispatch_batch(self._events(1, None, 3))
+
+        self.assertEqual(result, (2, 1, 0))
+        self.assertEqual([row["recipient_id"] for row in self.inserted], [1, 3])
+        self.assertEqual(self._pushed(), [(notification_queue.QUEUE_KEY, {"row": {"recipient_id": None}, "attempts": 1})])
+
+    def test_bad_row_out_of_attempts_is_dead_lettered(self):
+        events = self._events(1, 2) + self._events(None, attempts=notification_queue.MAX_ATTEMPTS - 1)
+
+        self.assertEqual(notification_queue.dispatch_batch(events), (2, 0, 1))
+        self.assertEqual(self._pushed()[0][0], notification_queue.DEAD_LETTER_KEY)
+
+
+class PrefixIndexTests(SimpleTestCase):
+
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.build([
+            ("album", "a1", "OK Computer", {"artist": "Radiohead"}, 10),
+            ("album", "a2", "Computer World", {"artist": "Kraftwerk"}, 3),
+            ("artist", "radiohead", "Radiohead", {}, 25),
+            ("user", "bjork_fan", "Björk_fan", {}, 1),
+        ])
+
+    def _ids(self, query, **kwargs):
+        return [result["id"] for result in self.index.search(query, **kwargs)]
+
+    def test_prefix_matches_any_word_start(self):
+        self.assertEqual(set(self._ids("comp")), {"a1", "a2"})
+
+    def test_match_on_the_start_of_the_label_ranks_first(self):
+        # "OK Computer" is more popular but only matches on its second word
+        self.assertEqual(self._ids("comp"), ["a2", "a1"])
+
+    def test_query_is_case_and_accent_insensitive(self):
+        self.assertEqual(self._ids("  BJORK"), ["bjork_fan"])
+
+    def test_kinds_filter(self):
+        self.assertEqual(self._ids("radio", kinds={"artist"}), ["radiohead"])
+        self.assertEqual(self._ids("radio", kinds={"album"}), [])
+
+    def test_rename_rekeys_the_entry(self):
+        self.index.add("album", "a2", "Trans-Europe Express", {"artist": "Kraftwerk"})
+
+        self.assertEqual(self._ids("comp"), ["a1"])
+        self.assertEqual(self._ids("trans"), ["a2"])
+        # Popularity survives the rename
+        self.assertEqual(self.index.search("trans")[0]["popularity"], 3)
+
+    def test_remove_and_bump(self):
+        self.index.remove("album", "a1")
+        self.index.bump("album", "a2", 5)
+
+        results = self.index.search("comp")
+        self.assertEqual([(r["id"], r["popularity"]) for r in results], [("a2", 8)])
+
+
+class SupabaseClientRegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                payload = json.dumps({"code": "PGRST303", "message": "JWT expired"}).encode()
+                self.send_response(401)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_port}"
+        session = types.SimpleNamespace(access_token="token", refresh_token="refresh", expires_at=None, expires_in=3600)
+
+        def signed_in_client():
+            client = create_client(url, "anon-key", options=ClientOptions(auto_refresh_token=False))
+            client.auth.sign_in_with_password = lambda credentials: types.SimpleNamespace(session=session)
+            return client
+
+        for patcher in (mock.patch.object(supabase_client, "get_supabase_client", signed_in_client),
+                        mock.patch.object(supabase_client, "config", return_value="test")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.registry = supabase_client.SupabaseClientRegistry()
+        self.addCleanup(self.registry.invalidate)
+
+    def test_client_is_reused_while_the_token_is_fresh(self):
+        self.assertIs(self.registry.get_client(), self.registry.get_client())
+        self.assertEqual(self.registry.get_stats()["reuses"], 1)
+
+    def test_rejected_token_drops_the_session(self):
+        client = self.registry.get_client()
+        with self.assertRaises(Exception):
+            client.table("soundscore_review").select("id").execute()
+
+        self.assertIsNot(self.registry.get_client(), client)
+        stats = self.registry.get_stats()
+        self.assertEqual((stats["rejections"], stats["sign_ins"]), (1, 2))
+
+
+class FeedCursorTests(SimpleTestCase):
+
+    def test_round_trip(self):
+        review = {"created_at": "2026-10-18T09:15:02.123456+00:00", "id": 42}
+        cursor = encode_cursor(review)
+
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor), ("2026-10-18T09:15:02.123456+00:00", 42))
+
+    def test_malformed_cursors_decode_to_none(self):
+        def encoded(raw):
+            return base64.urlsafe_b64encode(raw).decode()
+
+        for cursor in ("", "not a cursor!", "é", encoded(b"\xff\xfe"),
+                       encoded(b"2026-10-18T09:15:02+00:00"),
+                       encoded(b"2026-10-18T09:15:02+00:00|abc"),
+                       encoded(b"yesterday|42")):
+            with self.subTest(cursor=cursor):
+                self.assertIsNone(decode_cursor(cursor))
+
+
+class NormalizeRowTests(SimpleTestCase):
+
+    def test_csv_row_with_loose_headers(self):
+        row = normalize_row({" Album ": " OK Computer ", "ARTIST": "Radiohead", "Rating": "4",
+                             "review": "Still great", "is_favorite": "Yes", "date": "2024-01-02T03:04:05Z"})
+
+        self.assertEqual(row, {
+            "spotify_id": None,
+            "title": "OK Computer",
+            "artist": "Radiohead",
+            "rating": 4,
+            "text": "Still great",
+            "is_favorite": True,
+            "created_at": "2024-01-02T03:04:05+00:00",
+        })
+
+    def test_rating_on_another_scale_becomes_stars(self):
+        self.assertEqual(normalize_row({"spotify_id": "a1", "rating": 7}, scale=10)["rating"], 4)
+        self.assertEqual(normalize_row({"spotify_id": "a1", "rating": 1}, scale=100)["rating"], 1)
+
+    def test_bad_date_is_dropped_not_the_row(self):
+        row = normalize_row({"spotify_id": "a1", "rating": 3, "created_at": "last week"})
+
+        self.assertIsNone(row["created_at"])
+        self.assertFalse(row["is_favorite"])
+
+    def test_unusable_rows(self):
+        for raw in (["a1", 4], None, {}, {"rating": 4},
+                    {"spotify_id": "a1"}, {"spotify_id": "a1", "rating": "great"},
+                    {"spotify_id": "a1", "rating": "nan"}, {"spotify_id": "a1", "rating": 0},
+                    {"spotify_id": "a1", "rating": 6}):
+            with self.subTest(raw=raw):
+                self.assertIsNone(normalize_row(raw))
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                                       "LOCATION": "swr-tests"}})
+class StaleWhileRevalidateCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.loaded = threading.Event()
+
+    def _loader(self):
+        self.calls += 1
+        self.loaded.set()
+        return {"version": self.calls}
+
+    def _refreshed(self):
+        # The background reload runs on its own thread
+        self.assertTrue(self.loaded.wait(1))
+        deadline = time.monotonic() + 1
+        while cache.get("swr:test:refresh-lock") and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_fresh_value_is_loaded_once(self):
+        swr = StaleWhileRevalidateCache("swr:test", self._loader, fresh_for=60)
+
+        self.assertEqual(swr.get(), {"version": 1})
+        self.assertEqual(swr.get(), {"version": 1})
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_value_is_served_while_reloading(self):
+        swr = StaleWhileRevalidateCache("swr:test", self._loader, fresh_for=0)
+        swr.get()
+        self.loaded.clear()
+
+        self.assertEqual(swr.get(), {"version": 1})
+        self._refreshed()
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(cache.get("swr:test")["value"], {"version": 2})
+
+    def test_invalidate_makes_the_value_stale(self):
+        swr = StaleWhileRevalidateCache("swr:test", self._loader, fresh_for=60)
+        swr.get()
+        self.loaded.clear()
+        swr.invalidate()
+
+        # Still answered from the old value, with one reload behind it
+        self.assertEqual(swr.get(), {"version": 1})
+        self._refreshed()
+        self.assertEqual(swr.get(), {"version": 2})
+        self.assertEqual(self.calls, 2)
+
+    def test_errors_are_not_cached(self):
+        swr = StaleWhileRevalidateCache("swr:test", lambda: {"error": "Supabase is down"})
+
+        self.assertEqual(swr.get(), {"error": "Supabase is down"})
+        self.assertIsNone(cache.get("swr:test"))
+
+
+class BayesianScoreTests(SimpleTestCase):
+
+    def test_album_without_reviews_scores_the_mean(self):
+        self.assertEqual(bayesian_score(0, 0, DEFAULT_MEAN), DEFAULT_MEAN)
+
+    def test_one_perfect_review_does_not_beat_many_good_ones(self):
+        single = bayesian_score(5, 1, 3.5)
+        many = bayesian_score(4.5 * 50, 50, 3.5)
+
+        self.assertLess(single, many)
+        self.assertAlmostEqual(single, (PRIOR_WEIGHT * 3.5 + 5) / (PRIOR_WEIGHT + 1))
+
+    def test_score_approaches_the_plain_average(self):
+        self.assertAlmostEqual(bayesian_score(4 * 10000, 10000, 2.0), 4.0, places=2)
+        self.assertEqual(bayesian_score(12, 3, 2.0, prior_weight=0), 4.0)
+
+
+class FakeReviewQuery:
+    """Just enough of the PostgREST query builder for iter_user_reviews"""
+
+    def __init__(self, rows, fail=False):
+        self.rows, self.fail, self.requests = rows, fail, 0
+        self.after = self.count = None
+
+    def table(self, name):
+        return self
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def order(self, column):
+        return self
+
+    def gt(self, column, value):
+        self.after = value
+        return self
+
+    def limit(self, count):
+        self.count = count
+        return self
+
+    def execute(self):
+        self.requests += 1
+        if self.fail:
+            raise RuntimeError("Supabase is down")
+        rows = [row for row in self.rows if row["id"] > self.after][:self.count]
+        return types.SimpleNamespace(data=rows)
+
+
+class ReviewExportTests(SimpleTestCase):
+    REVIEW = {
+        "spotify_id": "album1", "title": "OK Computer", "artist": "Radiohead", "rating": 5,
+        "text": 'Says "hi",\nover two lines', "is_favorite": True,
+        "created_at": "2024-01-02T03:04:05+00:00", "updated_at": None,
+    }
+
+    def _failing(self, reviews):
+        yield from reviews
+        raise RuntimeError("connection reset")
+
+    def test_csv_can_be_imported_back(self):
+        text = "".join(export_csv([self.REVIEW]))
+        rows = list(csv.DictReader(io.StringIO(text)))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["text"], self.REVIEW["text"])
+        imported = normalize_row(rows[0])
+        self.assertEqual((imported["spotify_id"], imported["rating"], imported["is_favorite"]), ("album1", 5, True))
+
+    def test_empty_csv_export_is_just_the_header(self):
+        self.assertEqual("".join(export_csv([])).strip(), ",".join(
+            ["spotify_id", "title", "artist", "rating", "text", "is_favorite", "created_at", "updated_at"]))
+
+    def test_ndjson_is_one_object_per_line(self):
+        lines = list(export_ndjson([self.REVIEW, {**self.REVIEW, "title": "Björk"}]))
+
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(all(line.endswith("\n") for line in lines))
+        self.assertEqual(json.loads(lines[1])["title"], "Björk")
+        self.assertIn("Björk", lines[1])
+
+    def test_failure_mid_stream_ends_with_a_marker(self):
+        csv_lines = list(export_csv(self._failing([self.REVIEW])))
+        ndjson_lines = list(export_ndjson(self._failing([self.REVIEW])))
+
+        self.assertTrue(csv_lines[-1].startswith(f"{EXPORT_ERROR_MARKER} Export incomplete"))
+        self.assertIn("connection reset", json.loads(ndjson_lines[-1])["error"])
+
+    def test_reviews_are_read_in_chunks(self):
+        rows = [{"id": i, "rating": 4, "soundscore_album": {"spotify_id": f"a{i}"}} for i in range(1, 6)]
+        client = FakeReviewQuery(rows)
+
+        reviews = list(open_user_reviews(client, 1, chunk_size=2))
+
+        self.assertEqual([review["spotify_id"] for review in reviews], ["a1", "a2", "a3", "a4", "a5"])
+        self.assertEqual(client.requests, 3)
+
+    def test_supabase_failure_raises_before_streaming(self):
+        with self.assertRaises(RuntimeError):
+            open_user_reviews(FakeReviewQuery([], fail=True), 1)
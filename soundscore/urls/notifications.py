@@ -1,8 +1,13 @@
 from ..views import feed
-from django.urls import path
+from ..views.notifications import NotificationConsumer
+from django.urls import path, re_path
 
 urlpatterns = [
     path('', feed.get_notifications, name='notifications'),
     path('unread-count/', feed.get_unread_count_view, name='unread_count'),
     path('mark-all-as-read/', feed.mark_all_read, name='mark_all_as_read'),
-]
\ No newline at end of file
+]
+
+websocket_urlpatterns = [
+    re_path(r'ws/notifications/$', NotificationConsumer.as_asgi()),
+]
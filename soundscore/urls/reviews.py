@@ -9,6 +9,12 @@ urlpatterns = [
     path('delete-review/<str:review_id>/', reviews.delete_review, name='delete_review'),
     path('search/albums/', reviews.search_albums_api_view, name='search_albums_api'),
     path('api/search-albums/', reviews.search_albums_api_view, name='search_albums_api_alias'),
+    path('api/autocomplete/', reviews.autocomplete_api, name='autocomplete_api'),
+    path('api/trending/', reviews.trending_albums_api, name='trending_albums_api'),
+    path('api/import/', reviews.import_reviews_api, name='import_reviews_api'),
+    path('api/export/', reviews.export_reviews_api, name='export_reviews_api'),
+    path('api/album/<str:spotify_id>/', reviews.album_detail_api, name='album_detail_api'),
+    path('album/<str:spotify_id>/', reviews.album_detail, name='album_detail'),
     path('api/create-review/', reviews.create_review_api, name='create_review_api_alias'),  # Optional extra alias
     path('user/<str:username>/', reviews.user_profile, name='user_profile'),
     path('feed/', reviews.feed, name='feed'),
@@ -10,5 +10,6 @@ urlpatterns = [
     path('account/<str:username>/delete/', users.delete_account, name='delete_account'),
     path('account/<str:username>/delete/confirm/', users.delete_account_confirm, name='delete_account_confirm'),
     path('profile/<str:username>/', reviews.user_profile, name='profile'),
+    path('api/search/', users.search_users_api, name='search_users_api'),
     
 ]
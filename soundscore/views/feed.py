@@ -3,8 +3,12 @@ from django.views.decorators.http import require_POST, require_GET
 from django.contrib.auth.decorators import login_required
 import json
 from ..services.user.supabase_client import authenticate_with_jwt
-from ..services.feed.notification import create_notification, get_user_notifications, mark_notification_as_read, mark_all_as_read, get_unread_count
+from ..services.feed.notification import get_user_notifications, mark_notification_as_read, mark_all_as_read, get_unread_count
 from ..services.feed.notification import get_unread_count
+from ..services.feed.feed_assembler import FeedAssembler
+from ..services.feed.feed_pagination import fetch_feed_page
+from ..services.feed.like_service import toggle_review_like
+from ..services.feed.notification_queue import enqueue_notification
 
 @login_required
 @require_POST
@@ -22,12 +26,10 @@ def post_comment(request):
         if not client:
             return JsonResponse({"error": "Supabase connection failed"}, status=500)
 
-        user_resp = client.table("soundscore_user").select("id").eq("username", request.user.username).limit(1).execute()
-        if not user_resp.data:
+        user_id = request.supabase_user_id
+        if not user_id:
             return JsonResponse({"error": "User not found"}, status=404)
 
-        user_id = user_resp.data[0]["id"]
-
         comment_data = {
             "review_id": review_id,
             "user_id": user_id,
@@ -60,55 +62,26 @@ def toggle_like(request):
                 return JsonResponse({"error": "Supabase connection failed"}, status=500)
 
             # Get current user
-            user_resp = client.table("soundscore_user").select("id").eq("username", request.user.username).limit(1).execute()
-            if not user_resp.data:
+            user_id = request.supabase_user_id
+            if not user_id:
                 return JsonResponse({"error": "User not found"}, status=404)
-            
-            user_id = user_resp.data[0]["id"]
-
-            # Check if already liked
-            like_check = client.table("soundscore_review_like").select("id") \
-                .eq("user_id", user_id) \
-                .eq("review_id", review_id) \
-                .limit(1) \
-                .execute()
-
-            if like_check.data:
-                # Unlike - delete the like record
-                client.table("soundscore_review_like").delete().eq("id", like_check.data[0]["id"]).execute()
-                liked = False
-            else:
-                # Like - add a like record
-                client.table("soundscore_review_like").insert({
-                    "user_id": user_id,
-                    "review_id": review_id
-                }).execute()
-                liked = True
-
-            # Get the current count DIRECTLY without using RPC
-            count_query = client.table("soundscore_review_like") \
-                .select("*", count="exact") \
-                .eq("review_id", review_id) \
-                .execute()
-                
-            # The count is in the count attribute of the response
-            like_count = count_query.count if hasattr(count_query, 'count') else 0
+
+            # Flip the like, read the new count and the author in one round trip
+            result = toggle_review_like(client, user_id, review_id)
+            if "error" in result:
+                return JsonResponse({"error": result["error"]}, status=404 if result["error"] == "Review not found" else 500)
+
+            liked = result["liked"]
+            like_count = result["like_count"]
 
             # After successfully adding a like
             if liked:  # If the review was liked (not unliked)
-                # Get the review author ID
-                author_id_response = client.table('soundscore_review').select('user_id').eq('id', review_id).limit(1).execute()
-                
-                if author_id_response.data and author_id_response.data[0]['user_id'] != user_id:  # Don't notify if liking own review
-                    author_id = author_id_response.data[0]['user_id']
+                if result["author_id"] != user_id:  # Don't notify if liking own review
+                    author_id = result["author_id"]
                     
-                    # Get username for the notification message
-                    username_response = client.table('soundscore_user').select('username').eq('id', user_id).limit(1).execute()
-                    username = username_response.data[0]['username'] if username_response.data else "Someone"
-                    
-                    # Create notification
-                    message = f"@{username} liked your review!"
-                    create_notification(
+                    # Queue the notification; the dispatch worker writes it
+                    message = f"@{request.user.username} liked your review!"
+                    enqueue_notification(
                         recipient_id=author_id,
                         actor_id=user_id,
                         notification_type='like',
@@ -133,12 +106,11 @@ def toggle_like(request):
 @require_GET
 def load_more_reviews(request):
     try:
-        page = int(request.GET.get("page", 0))
         page_size = int(request.GET.get("page_size", 5))
         comments_per_review = int(request.GET.get('comments_per_review', 10))
         
-        # Calculate offset based on page and page_size
-        offset = page * page_size  # Add this line - offset wasn't defined before
+        # Opaque keyset cursor returned by the previous page (empty for the first page)
+        cursor = request.GET.get("cursor", "")
         
         # Add sort order parameter
         sort_order = request.GET.get("sort_order", "desc").lower()
@@ -147,123 +119,33 @@ def load_more_reviews(request):
         if sort_order not in ["asc", "desc"]:
             sort_order = "desc"
         
-        # Get list of IDs to exclude
-        exclude_ids = []
-        exclude_ids_param = request.GET.get("exclude_ids", "")
-        if exclude_ids_param:
-            exclude_ids = [int(id) for id in exclude_ids_param.split(',') if id.isdigit()]
-        
-        print(f"\n[DEBUG] ====== LOAD MORE REVIEWS ======")
-        print(f"[DEBUG] Request params: page={page}, page_size={page_size}, offset={offset}, sort_order={sort_order}")
-        print(f"[DEBUG] Excluding {len(exclude_ids)} IDs: {exclude_ids}")
-        print(f"[DEBUG] Comments per review: {comments_per_review}")
-        
         client = authenticate_with_jwt()
         if not client:
-            print("[DEBUG] ❌ Supabase connection failed")
             return JsonResponse({"error": "Supabase connection failed"}, status=500)
         
-        print(f"[DEBUG] ✓ Supabase connected, calling RPC 'get_feed_reviews'")
-        
-        # Get total count
-        try:
-            # Count total reviews
-            sql_response = client.rpc('execute_sql', {'sql_query': 'SELECT COUNT(*) FROM soundscore_review'}).execute()
-            total_reviews = sql_response.data[0].get('count', 0) if sql_response.data else 0
-            print(f"[DEBUG] Total reviews in database: {total_reviews}")
-            
-            # Count reviews excluding the ones we've seen
-            if exclude_ids:
-                exclude_list = ','.join(str(id) for id in exclude_ids)
-                remaining_query = f"SELECT COUNT(*) FROM soundscore_review WHERE id NOT IN ({exclude_list})"
-                remaining_response = client.rpc('execute_sql', {'sql_query': remaining_query}).execute()
-                remaining = remaining_response.data[0].get('count', 0) if remaining_response.data else 0
-                print(f"[DEBUG] Reviews remaining after excluding {len(exclude_ids)} IDs: {remaining}")
-            else:
-                remaining = total_reviews
-        except Exception as e:
-            print(f"[DEBUG] Debug query error: {str(e)}")
-            remaining = 0  # Default to 0 if query fails
-        
-        # Call the RPC with exclude_ids parameter
-        response = client.rpc('get_feed_reviews', {
-            'p_limit': page_size,
-            'p_offset': 0,  # Don't use offset with exclude_ids approach
-            'p_exclude_ids': exclude_ids,
-            'p_sort_order': sort_order
-        }).execute()
-        
-        print(f"[DEBUG] RPC response data type: {type(response.data)}")
-        print(f"[DEBUG] RPC returned {len(response.data) if response.data else 0} reviews")
-        
-        if not response.data:
-            print("[DEBUG] ❌ No reviews returned from RPC")
-            return JsonResponse({"reviews": [], "has_more": False}, status=200)
+        # has_more comes from fetching one extra row, no COUNT(*) needed
+        reviews, next_cursor, has_more = fetch_feed_page(client, cursor=cursor, page_size=page_size, sort_order=sort_order)
         
-        reviews = response.data
-        processed_reviews = []
-        
-        # Process reviews...
-        print(f"[DEBUG] Processing {len(reviews)} reviews...")
-        for review in reviews:
-            review_id = review.get('id')
-            
-            # Get comment count
-            try:
-                comment_count_response = client.table('soundscore_comment') \
-                    .select('*', count='exact') \
-                    .eq('review_id', review_id) \
-                    .execute()
-                review['comment_count'] = comment_count_response.count if hasattr(comment_count_response, 'count') else 0
-                
-                # Get comments for display - use comments_per_review instead of hardcoded 2
-                comments_response = client.table('soundscore_comment') \
-                    .select('*, soundscore_user(username, profile_picture)') \
-                    .eq('review_id', review_id) \
-                    .order('created_at', desc=True) \
-                    .limit(comments_per_review) \
-                    .execute()
-                review['comments'] = comments_response.data if comments_response.data else []
-            except Exception as e:
-                print(f"[DEBUG] Error getting comments for review {review_id}: {str(e)}")
-                review['comment_count'] = 0
-                review['comments'] = []
-            
-            # Check if liked by current user
-            try:
-                user_resp = client.table("soundscore_user").select("id").eq("username", request.user.username).limit(1).execute()
-                if user_resp.data:
-                    user_id = user_resp.data[0]["id"]
-                    like_check = client.table("soundscore_review_like") \
-                        .select("id") \
-                        .eq("user_id", user_id) \
-                        .eq("review_id", review_id) \
-                        .limit(1) \
-                        .execute()
-                    review['is_liked'] = bool(like_check.data)
-                else:
-                    review['is_liked'] = False
-            except Exception as e:
-                print(f"[DEBUG] Error checking likes for review {review_id}: {str(e)}")
-                review['is_liked'] = False
-            
-            # Add the processed review to our results
-            processed_reviews.append(review)
-        
-        # Better has_more calculation
-        loaded_count = len(exclude_ids) + len(reviews)
-        has_more = loaded_count < total_reviews
-        
-        print(f"[DEBUG] Loaded so far: {loaded_count}/{total_reviews} reviews, has_more={has_more}")
-        print(f"[DEBUG] Returning {len(processed_reviews)} processed reviews")
-        return JsonResponse({"reviews": processed_reviews, "has_more": has_more})
+        if not reviews:
+            return JsonResponse({"reviews": [], "has_more": False, "next_cursor": None}, status=200)
+
+        # Comments, like counts and liked flags in a fixed number of batched queries
+        assembler = FeedAssembler(client, viewer_id=request.supabase_user_id, comments_per_review=comments_per_review)
+        processed_reviews = assembler.assemble(reviews)
+
+        return JsonResponse({
+            "reviews": processed_reviews,
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+            "query_count": assembler.query_count + 1,
+        })
 
     except Exception as e:
         import traceback
-        print(f"[DEBUG] Error in load_more_reviews: {str(e)}")
+        print(f"Error in load_more_reviews: {str(e)}")
         print(traceback.format_exc())
         # IMPORTANT: Return a JsonResponse in the exception handler
-        return JsonResponse({"error": str(e), "reviews": [], "has_more": False}, status=500)
+        return JsonResponse({"error": str(e), "reviews": [], "has_more": False, "next_cursor": None}, status=500)
 
 @login_required
 @require_GET
@@ -273,13 +155,10 @@ def get_notifications(request):
         if not client:
             return JsonResponse({"error": "Authentication failed"}, status=401)
         
-        # Get user ID from username
-        user_response = client.table('soundscore_user').select('id').eq('username', request.user.username).limit(1).execute()
-        if not user_response.data:
+        user_id = request.supabase_user_id
+        if not user_id:
             return JsonResponse({"error": "User not found"}, status=404)
         
-        user_id = user_response.data[0]['id']
-        
         # Get parameters
         limit = int(request.GET.get('limit', 10))
         offset = int(request.GET.get('offset', 0))
@@ -318,13 +197,10 @@ def mark_all_read(request):
         if not client:
             return JsonResponse({"error": "Authentication failed"}, status=401)
         
-        # Get user ID from username
-        user_response = client.table('soundscore_user').select('id').eq('username', request.user.username).limit(1).execute()
-        if not user_response.data:
+        user_id = request.supabase_user_id
+        if not user_id:
             return JsonResponse({"error": "User not found"}, status=404)
         
-        user_id = user_response.data[0]['id']
-        
         result = mark_all_as_read(user_id)
         return JsonResponse({"success": True})
     except Exception as e:
@@ -339,17 +215,10 @@ def get_unread_count_view(request):
         if not client:
             return JsonResponse({"error": "Authentication failed"}, status=401)
 
-        user_resp = client.table("soundscore_user") \
-            .select("id") \
-            .eq("username", request.user.username) \
-            .limit(1) \
-            .execute()
-
-        if not user_resp.data:
+        user_id = request.supabase_user_id
+        if not user_id:
             return JsonResponse({"error": "User not found"}, status=404)
 
-        user_id = user_resp.data[0]["id"]
-
         count = get_unread_count(user_id)
         return JsonResponse({"unread_count": count})
     except Exception as e:
@@ -366,11 +235,9 @@ def get_notification_details(request, notification_id):
         if not client:
             return JsonResponse({"error": "Authentication failed"}, status=401)
 
-        # Get user ID from username
-        user_resp = client.table("soundscore_user").select("id").eq("username", request.user.username).limit(1).execute()
-        if not user_resp.data:
+        user_id = request.supabase_user_id
+        if not user_id:
             return JsonResponse({"error": "User not found"}, status=404)
-        user_id = user_resp.data[0]["id"]
 
         # Get the notification with details
         notifications = get_user_notifications_with_details(user_id, limit=1, offset=0, unread_only=False)
@@ -1,8 +1,7 @@
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
-from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
-from soundscore.services.user.supabase_client import authenticate_with_jwt
+from soundscore.services.group import chat_service
 from datetime import datetime, timedelta
 from django.utils.timezone import now
 
@@ -41,7 +40,7 @@ class GroupChatConsumer(AsyncWebsocketConsumer):
                 # Get user data from Supabase using username
                 user_data = await self.get_user_data_by_username(username)
                 user_id = user_data.get("id") if user_data else self.user.id
-                profile_pic = user_data.get("profile_picture", "/static/images/default.jpg")
+                profile_pic = (user_data or {}).get("profile_picture") or "/static/images/default.jpg"
 
                 # Save message with correct user_id
                 await self.save_message(self.group_id, user_id, message)
@@ -103,79 +102,26 @@ class GroupChatConsumer(AsyncWebsocketConsumer):
             "users": event["users"],
         }))
 
-    @database_sync_to_async
-    def get_user_data_by_username(self, username):
-        supabase = authenticate_with_jwt()
-        result = supabase.table("soundscore_user").select("id, username, profile_picture").eq("username", username).limit(1).execute()
-        if result.data and len(result.data) > 0:
-            return result.data[0]
-        else:
-            return None
-
-    @database_sync_to_async
-    def save_message(self, group_id, user_id, content):
-        supabase = authenticate_with_jwt()
-        supabase.table("chat_group_message").insert({
-            "group_id": group_id,
-            "user_id": user_id,
-            "content": content,
-        }).execute()
-
-    @database_sync_to_async
-    def set_online_status(self, user_id, group_id, is_online):
+    async def get_user_data_by_username(self, username):
+        return await chat_service.get_user_by_username(username)
+
+    async def save_message(self, group_id, user_id, content):
+        await chat_service.save_message(group_id, user_id, content)
+
+    async def set_online_status(self, user_id, group_id, is_online):
         """
         Updates the user's online status in the database for a specific group.
         This is called by the consumer's connect/disconnect.
         """
         print(f"CONSUMER: Internal set_online_status via RPC: user_id={user_id}, group_id={group_id}, is_online={is_online}")
-        supabase = authenticate_with_jwt()
-        try:
-            supabase.rpc("upsert_group_user_online", {
-                "_group_id": group_id,
-                "_user_id": user_id,
-                "_is_online": is_online
-            }).execute()
-        except Exception as e:
-            print(f"CONSUMER: Error in internal set_online_status RPC call: {e}")
+        await chat_service.set_online_status(group_id, user_id, is_online)
 
-    @database_sync_to_async
-    def get_users_with_online_status(self, group_id): # Renamed for clarity
+    async def get_users_with_online_status(self, group_id): # Renamed for clarity
         """
         Fetches all members of the group and their current online status.
         """
         print(f"CONSUMER: Fetching users with online status for group {group_id}")
-        supabase = authenticate_with_jwt()
-        
-        members_response = supabase.table("chat_group_member") \
-            .select("user_id, soundscore_user(username, profile_picture)") \
-            .eq("group_id", group_id).execute()
-        
-        if not members_response.data:
-            print(f"CONSUMER: No members found for group {group_id}")
-            return []
-
-        member_details_map = {
-            m["user_id"]: {
-                "username": m["soundscore_user"]["username"] if m.get("soundscore_user") else "Unknown User",
-                "profile_picture": m["soundscore_user"].get("profile_picture", "/static/images/default.jpg") if m.get("soundscore_user") else "/static/images/default.jpg"
-            } for m in members_response.data
-        }
-
-        online_status_response = supabase.table("group_user_online") \
-            .select("user_id, is_online") \
-            .eq("group_id", group_id) \
-            .in_("user_id", list(member_details_map.keys())) \
-            .execute()
-            
-        online_status_map = {row["user_id"]: row["is_online"] for row in online_status_response.data}
-        
-        users_list = []
-        for user_id, details in member_details_map.items():
-            users_list.append({
-                "username": details["username"],
-                "profile_picture": details["profile_picture"], # Frontend might use this
-                "is_online": online_status_map.get(user_id, False) # Default to False
-            })
+        users_list = await chat_service.get_members_with_online_status(group_id)
         print(f"CONSUMER: Fetched users for broadcast: {users_list}")
         return users_list
 
@@ -45,10 +45,7 @@ def create_group(request):
         category = request.POST.get("category")
         privacy = request.POST.get("privacy")
         supabase = authenticate_with_jwt()
-        user_id = supabase.table("soundscore_user") \
-            .select("id") \
-            .eq("username", request.user.username) \
-            .execute().data[0]["id"]
+        user_id = request.supabase_user_id
 
         cover_image = request.FILES.get("cover_image")
         cover_url = None
@@ -93,10 +90,7 @@ def create_group(request):
 @login_required
 def group_room(request, group_id):
     supabase = authenticate_with_jwt()
-    user_id = supabase.table("soundscore_user") \
-        .select("id") \
-        .eq("username", request.user.username) \
-        .execute().data[0]["id"]
+    user_id = request.supabase_user_id
 
     group = supabase.table("chat_group").select("*").eq("id", group_id).execute().data[0]
     members = supabase.table("chat_group_member") \
@@ -157,11 +151,7 @@ def group_room(request, group_id):
 def join_group(request, group_id):
     """Add the current user to a group if not already a member"""
     supabase = authenticate_with_jwt()
-
-    user_id = supabase.table("soundscore_user") \
-        .select("id") \
-        .eq("username", request.user.username) \
-        .execute().data[0]["id"]
+    user_id = request.supabase_user_id
     
     print(f"Joining group {group_id} for user {user_id}")
     
@@ -219,15 +209,11 @@ def set_online_status(request):
          print("User not authenticated in set_online_status")
          return JsonResponse({"ok": False, "error": "User not authenticated"}, status=401)
 
-    user_query = supabase.table("soundscore_user") \
-        .select("id") \
-        .eq("username", request.user.username) \
-        .execute()
-    if not user_query.data:
+    if not request.supabase_user_id:
         print(f"User not found in Supabase: {request.user.username}")
         return JsonResponse({"ok": False, "error": "User not found"}, status=404)
         
-    user_id = int(user_query.data[0]["id"])
+    user_id = int(request.supabase_user_id)
     # print("user_id (int):", user_id) # Already have this
 
     # Update status in database
@@ -0,0 +1,56 @@
+import json
+from asgiref.sync import sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+from soundscore.middleware import SESSION_USER_ID_KEY, SESSION_USERNAME_KEY
+from soundscore.services.user.async_supabase_client import select_one
+from soundscore.services.feed.notification import get_unread_count
+from soundscore.services.feed.notification_counter import notification_group_name
+
+
+class NotificationConsumer(AsyncWebsocketConsumer):
+    """
+    Per-user socket that receives the unread count and new notifications as
+    they happen, replacing the unread-count polling endpoint.
+    """
+
+    async def connect(self):
+        self.user = self.scope["user"]
+        self.group_name = None
+        if not self.user.is_authenticated:
+            await self.close()
+            return
+
+        self.user_id = await self.resolve_user_id()
+        if not self.user_id:
+            await self.close()
+            return
+
+        self.group_name = notification_group_name(self.user_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        # Initial count comes from the per-user counter (seeded on a miss)
+        unread_count = await sync_to_async(get_unread_count, thread_sensitive=False)(self.user_id)
+        await self.send(text_data=json.dumps({
+            "type": "unread_count",
+            "unread_count": unread_count,
+        }))
+
+    async def disconnect(self, close_code):
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def resolve_user_id(self):
+        # SupabaseUserMiddleware already stored the id in the session for HTTP requests
+        session = self.scope.get("session")
+        if session and session.get(SESSION_USERNAME_KEY) == self.user.username and session.get(SESSION_USER_ID_KEY):
+            return session[SESSION_USER_ID_KEY]
+        user = await select_one("soundscore_user", "id", filters={"username": self.user.username})
+        return user["id"] if user else None
+
+    async def notification_update(self, event):
+        await self.send(text_data=json.dumps({
+            "type": "notification",
+            "unread_count": event.get("unread_count"),
+            "notification": event.get("notification"),
+        }))
@@ -2,19 +2,29 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
-from django.http import JsonResponse, HttpResponseForbidden
-from django.db.models import Avg
-from datetime import datetime
+from django.http import JsonResponse, HttpResponseForbidden, StreamingHttpResponse
+import io
 import json
-from ..models import User, Album, Review
-from ..services.review.spotify import search_albums
+from ..models import User
+from ..services.review.album_catalog import search_albums_catalog_first
+from ..services.review.album_ratings import get_album_ratings
+from ..services.user.user_search import search_users
+from ..services.user.user_lookup import get_supabase_user_id
+from ..services.user.profile import get_profile_snapshot, get_user_reviews_page
+from ..services.autocomplete import autocomplete
+from ..services.review.review_import import ReviewImporter, detect_format, iter_review_rows
+from ..services.review.review_export import EXPORT_FORMATS, open_user_reviews
+from ..services.review.album_detail import get_album_detail, get_album_reviews_page
 from ..services.review.add_review import add_review_supabase
 from ..services.review.edit_review import edit_review_supabase
 from ..services.review.delete_review import delete_review_supabase
 from ..services.user.supabase_client import authenticate_with_jwt, get_admin_client
 from ..services.feed.comment_service import get_comments_for_review  # You'll create this
+from ..services.feed.feed_assembler import FeedAssembler
+from ..services.feed.feed_pagination import fetch_feed_page
 from django.views.decorators.cache import cache_page
 from ..services.review.top_albums import get_top_3_albums
+from ..services.review.trending import get_trending_albums, DEFAULT_WINDOW
 
 @login_required
 def create_review(request, username):
@@ -24,7 +34,7 @@ def create_review(request, username):
     if request.method == 'POST':
         query = request.POST.get('artist_name', '').strip()
         if query:
-            search_results = search_albums(query)
+            search_results = search_albums_catalog_first(query)
 
     context = {
         'search_results': search_results,
@@ -58,22 +68,10 @@ def create_review_api(request):
         except ValueError:
             return JsonResponse({"error": "Rating must be a number"}, status=400)
         
-        # IMPORTANT: Look up the Supabase user ID by username instead of using Django's ID
-        
-        client = authenticate_with_jwt()
-        if not client:
-            return JsonResponse({"error": "Failed to authenticate with Supabase"}, status=500)
-        
-        # Get the username from Django's user object
-        username = request.user.username
-        
-        # Query Supabase to get the user ID
-        user_response = client.table('soundscore_user').select('id').eq('username', username).limit(1).execute()
-        
-        if not user_response.data:
-            return JsonResponse({"error": f"User '{username}' not found in Supabase"}, status=404)
-            
-        supabase_user_id = user_response.data[0]['id']
+        # IMPORTANT: Use the Supabase user ID (resolved by SupabaseUserMiddleware), not Django's ID
+        supabase_user_id = request.supabase_user_id
+        if not supabase_user_id:
+            return JsonResponse({"error": f"User '{request.user.username}' not found in Supabase"}, status=404)
         
         # Call the Supabase function with the CORRECT user ID
         result = add_review_supabase(
@@ -84,7 +82,8 @@ def create_review_api(request):
             album_artist=album_artist, 
             album_cover=album_cover,
             text=review_text,
-            is_favorite=is_favorite
+            is_favorite=is_favorite,
+            username=request.user.username,
         )
         
         # Check if there was an error
@@ -103,54 +102,112 @@ def create_review_api(request):
     except Exception as e:
         return JsonResponse({"error": f"An error occurred: {str(e)}"}, status=500)
 
-def reviews(request, username):
-    user = get_object_or_404(User, username=username)
+@login_required
+@require_POST
+def import_reviews_api(request):
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({"error": "A CSV or NDJSON file is required"}, status=400)
+
+    supabase_user_id = request.supabase_user_id
+    if not supabase_user_id:
+        return JsonResponse({"error": f"User '{request.user.username}' not found in Supabase"}, status=404)
+
+    try:
+        scale = float(request.POST.get('scale', 5))
+        resume_from = int(request.POST.get('resume_from', 0))
+    except ValueError:
+        return JsonResponse({"error": "scale and resume_from must be numbers"}, status=400)
 
-    # Get Supabase client
     client = authenticate_with_jwt()
     if not client:
-        messages.error(request, "Could not connect to Supabase.")
-        return redirect('home')
+        return JsonResponse({"error": "Failed to authenticate with Supabase"}, status=500)
 
-    # Get Supabase user ID by username - ADD profile_picture to select
-    user_response = client.table('soundscore_user').select('id, profile_picture').eq('username', username).limit(1).execute()
-    if not user_response.data:
+    fmt = request.POST.get('format') or detect_format(upload.name)
+    importer = ReviewImporter(client, supabase_user_id, scale=scale, overwrite=request.POST.get('overwrite') == 'true')
+    # Decode the upload lazily so large files are never read into memory at once
+    stream = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+    try:
+        stats = importer.run(iter_review_rows(stream, fmt), resume_from=resume_from)
+    except Exception as e:
+        # rows_done lets the client retry with resume_from
+        return JsonResponse({"error": f"Import stopped: {str(e)}", "rows_done": importer.rows_done}, status=500)
+
+    return JsonResponse({"success": True, "rows_done": importer.rows_done, **stats})
+
+@login_required
+def export_reviews_api(request):
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return JsonResponse({"error": "format must be csv or ndjson"}, status=400)
+
+    supabase_user_id = request.supabase_user_id
+    if not supabase_user_id:
+        return JsonResponse({"error": f"User '{request.user.username}' not found in Supabase"}, status=404)
+
+    client = authenticate_with_jwt()
+    if not client:
+        return JsonResponse({"error": "Failed to authenticate with Supabase"}, status=500)
+
+    # Fetch the first chunk up front so a Supabase failure is still a 500
+    try:
+        reviews = open_user_reviews(client, supabase_user_id)
+    except Exception as e:
+        return JsonResponse({"error": f"Export failed: {str(e)}"}, status=500)
+
+    render_rows, content_type = EXPORT_FORMATS[fmt]
+    response = StreamingHttpResponse(render_rows(reviews), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{request.user.username}-reviews.{fmt}"'
+    return response
+
+def _profile_page(request, username):
+    """The shared profile snapshot plus the requested page of reviews, or None"""
+    supabase_user_id = get_supabase_user_id(username)
+    if not supabase_user_id:
         messages.error(request, f"User '{username}' not found in Supabase.")
-        return redirect('home')
-    supabase_user_id = user_response.data[0]['id']
-    
-    # Add profile picture URL to user object
-    if user_response.data[0].get('profile_picture'):
-        user.profile_picture_url = user_response.data[0]['profile_picture']
+        return None
 
-    # Fetch all reviews for this user, including album info
-    all_reviews_response = client.table('soundscore_review')\
-        .select('*, soundscore_album(title, artist, cover_image, spotify_id)')\
-        .eq('user_id', supabase_user_id)\
-        .order('created_at', desc=True)\
-        .execute()
-    all_reviews = all_reviews_response.data or []
+    snapshot = get_profile_snapshot(supabase_user_id)
+    if "error" in snapshot:
+        messages.error(request, snapshot["error"])
+        return None
 
-    for review in all_reviews:
-        if 'created_at' not in review:
-            review['created_at'] = datetime.now().isoformat()
+    cursor = request.GET.get('cursor')
+    if not cursor:
+        return snapshot, snapshot["first_page"]
 
-    # Fetch favorite reviews
-    favorite_reviews = [review for review in all_reviews if review.get('is_favorite')]
+    client = authenticate_with_jwt()
+    if not client:
+        messages.error(request, "Could not connect to Supabase.")
+        return None
+    try:
+        return snapshot, get_user_reviews_page(client, supabase_user_id, cursor)
+    except Exception as e:
+        messages.error(request, f"Error loading reviews: {str(e)}")
+        return None
 
-    # Calculate average rating
-    if all_reviews:
-        avg = sum(r['rating'] for r in all_reviews) / len(all_reviews)
-        average_rating = f"{avg:.1f}"
-    else:
-        average_rating = "N/A"
+def reviews(request, username):
+    user = get_object_or_404(User, username=username)
 
+    profile = _profile_page(request, username)
+    if profile is None:
+        return redirect('home')
+    snapshot, page = profile
+    stats = snapshot["stats"]
+
+    # Add profile picture URL to user object
+    if snapshot["user"].get('profile_picture'):
+        user.profile_picture_url = snapshot["user"]['profile_picture']
+
+    average_rating = stats["average_rating"]
     context = {
         'user': user,
-        'all_reviews': all_reviews,
-        'favorite_albums': favorite_reviews,
-        'total_reviews': len(all_reviews),
-        'average_rating': average_rating,
+        'all_reviews': page["reviews"],
+        'next_cursor': page["next_cursor"],
+        'is_first_page': not request.GET.get('cursor'),
+        'favorite_albums': snapshot["favorites"],
+        'total_reviews': stats["review_count"],
+        'average_rating': f"{average_rating:.1f}" if average_rating is not None else "N/A",
     }
     return render(request, 'reviews/reviews.html', context)
 
@@ -163,33 +220,13 @@ def edit_review(request, review_id):
         return redirect('home')
     
     # Get the Supabase user ID for the current user
-    username = request.user.username
-    user_response = client.table('soundscore_user').select('id').eq('username', username).limit(1).execute()
-    
-    if not user_response.data:
-        messages.error(request, f"User '{username}' not found in Supabase.")
+    supabase_user_id = request.supabase_user_id
+    if not supabase_user_id:
+        messages.error(request, f"User '{request.user.username}' not found in Supabase.")
         return redirect('home')
     
-    supabase_user_id = user_response.data[0]['id']
-    
-    # Get the review from Supabase
-    review_response = client.table('soundscore_review')\
-        .select('*, soundscore_album(title, artist, cover_image, spotify_id)')\
-        .eq('id', review_id)\
-        .limit(1)\
-        .execute()
-    
-    if not review_response.data:
-        messages.error(request, "Review not found.")
-        return redirect('reviews.reviews', username=request.user.username)
-    
-    review = review_response.data[0]
-    
-    # Ensure the logged-in user is the owner of the review
-    if review['user_id'] != supabase_user_id:
-        return HttpResponseForbidden("You are not allowed to edit this review.")
-
-    # Handle POST request - editing the review
+    # Handle POST request - editing the review. The update is scoped to the
+    # owner server-side, so it needs no prior fetch
     if request.method == 'POST':
         try:
             rating = int(request.POST.get('rating'))
@@ -201,7 +238,9 @@ def edit_review(request, review_id):
                 review_id=review_id,
                 rating=rating,
                 text=text,
-                is_favorite=is_favorite
+                is_favorite=is_favorite,
+                user_id=supabase_user_id,
+                client=client
             )
             
             if "error" in result:
@@ -215,7 +254,24 @@ def edit_review(request, review_id):
             messages.error(request, "Invalid rating value.")
         except Exception as e:
             messages.error(request, f"Error updating review: {str(e)}")
+
+    # Get the review from Supabase
+    review_response = client.table('soundscore_review')\
+        .select('*, soundscore_album(title, artist, cover_image, spotify_id)')\
+        .eq('id', review_id)\
+        .limit(1)\
+        .execute()
     
+    if not review_response.data:
+        messages.error(request, "Review not found.")
+        return redirect('reviews.reviews', username=request.user.username)
+    
+    review = review_response.data[0]
+    
+    # Ensure the logged-in user is the owner of the review
+    if review['user_id'] != supabase_user_id:
+        return HttpResponseForbidden("You are not allowed to edit this review.")
+
     # If GET request, display the form pre-filled with review data
     context = {
         'review': review,
@@ -242,9 +298,82 @@ def search_albums_api_view(request):
     if not query:
          return JsonResponse({"error": "Search query is required"}, status=400)
     
-    albums = search_albums(query)
+    albums = search_albums_catalog_first(query)
     return JsonResponse({"albums": albums})
 
+def autocomplete_api(request):
+    query = request.GET.get('q', '')
+    try:
+        limit = int(request.GET.get('limit', 8))
+    except ValueError:
+        return JsonResponse({"error": "limit must be a number"}, status=400)
+    kinds = {kind for kind in request.GET.get('types', '').split(',') if kind} or None
+
+    return JsonResponse({"results": autocomplete(query, limit=limit, kinds=kinds)})
+
+def trending_albums_api(request):
+    try:
+        page = int(request.GET.get('page', 1))
+        page_size = int(request.GET.get('page_size', 10))
+    except ValueError:
+        return JsonResponse({"error": "page and page_size must be numbers"}, status=400)
+
+    result = get_trending_albums(request.GET.get('window', DEFAULT_WINDOW), page, page_size)
+    if "error" in result:
+        return JsonResponse(result, status=400 if result["error"].startswith("Unknown window") else 500)
+    return JsonResponse(result)
+
+def _album_page(spotify_id, cursor):
+    """The cached album detail plus the requested page of reviews, or {"error": ...}"""
+    detail = get_album_detail(spotify_id)
+    if "error" in detail:
+        return detail
+    if not cursor or detail["album"]["id"] is None:
+        return {**detail, "page": detail["first_page"]}
+
+    client = authenticate_with_jwt()
+    if not client:
+        return {"error": "Could not connect to Supabase"}
+    try:
+        return {**detail, "page": get_album_reviews_page(client, detail["album"]["id"], cursor)}
+    except Exception as e:
+        return {"error": f"Error loading reviews: {str(e)}"}
+
+def album_detail(request, spotify_id):
+    cursor = request.GET.get('cursor')
+    detail = _album_page(spotify_id, cursor)
+    if "error" in detail:
+        messages.error(request, detail["error"])
+        return redirect('discover')
+
+    stats = detail["stats"]
+    review_count = stats["review_count"]
+    context = {
+        'album': detail["album"],
+        'review_count': review_count,
+        'avg_rating': stats["average_rating"],
+        # Highest rating first, with each bar's share of all reviews
+        'histogram': [
+            {'rating': rating, 'count': count, 'percent': round(count * 100 / review_count) if review_count else 0}
+            for rating, count in sorted(stats["histogram"].items(), reverse=True)
+        ],
+        'album_reviews': detail["page"]["reviews"],
+        'next_cursor': detail["page"]["next_cursor"],
+        'is_first_page': not cursor,
+    }
+    return render(request, 'reviews/album_detail.html', context)
+
+def album_detail_api(request, spotify_id):
+    detail = _album_page(spotify_id, request.GET.get('cursor'))
+    if "error" in detail:
+        return JsonResponse(detail, status=404 if detail["error"] == "Album not found" else 500)
+    return JsonResponse({
+        "album": detail["album"],
+        "stats": detail["stats"],
+        "reviews": detail["page"]["reviews"],
+        "next_cursor": detail["page"]["next_cursor"],
+    })
+
 @login_required
 def discover(request):
     query = request.GET.get('q', '').strip()
@@ -259,7 +388,7 @@ def discover(request):
     # --- Spotify album/artist search remains unchanged ---
     if query:
         try:
-            spotify_album_results = search_albums(query)
+            spotify_album_results = search_albums_catalog_first(query)
             spotify_album_results_cache = spotify_album_results
             if isinstance(spotify_album_results, dict) and 'error' in spotify_album_results:
                 messages.error(request, f"Spotify Error: {spotify_album_results['error']}")
@@ -271,6 +400,14 @@ def discover(request):
             spotify_album_results = []
             spotify_album_results_cache = spotify_album_results
 
+        # One soundscore_albumstats request for every album on the page, shared by both sections
+        album_ratings = {}
+        if search_type in ['all', 'albums', 'artists'] and spotify_album_results:
+            try:
+                album_ratings = get_album_ratings(album.get('id') for album in spotify_album_results)
+            except Exception as e:
+                messages.error(request, "Could not load album ratings.")
+
         # --- Process Albums (unchanged) ---
         if search_type in ['all', 'albums'] and isinstance(spotify_album_results, list):
             try:
@@ -280,11 +417,9 @@ def discover(request):
                     if not album_id:
                         continue
                     current_album = album_data.copy()
-                    try:
-                        avg_rating = get_album_avg_rating(album_id)
-                    except Exception as helper_e:
-                        avg_rating = None
-                    current_album['avg_rating'] = avg_rating if avg_rating is not None else 'Not rated'
+                    rating = album_ratings.get(album_id)
+                    current_album['avg_rating'] = rating['avg_rating'] if rating else 'Not rated'
+                    current_album['review_count'] = rating['review_count'] if rating else 0
                     processed_albums.append(current_album)
                 results['albums'] = processed_albums
             except KeyError as ke:
@@ -302,11 +437,9 @@ def discover(request):
                     if not artist_name or not album_id:
                         continue
                     current_album_for_artist = album_data.copy()
-                    try:
-                        avg_rating = get_album_avg_rating(album_id)
-                    except Exception as helper_e:
-                        avg_rating = None
-                    current_album_for_artist['avg_rating'] = avg_rating if avg_rating is not None else 'Not rated'
+                    rating = album_ratings.get(album_id)
+                    current_album_for_artist['avg_rating'] = rating['avg_rating'] if rating else 'Not rated'
+                    current_album_for_artist['review_count'] = rating['review_count'] if rating else 0
                     if artist_name not in artists_dict:
                         artists_dict[artist_name] = {'name': artist_name, 'albums': []}
                     artists_dict[artist_name]['albums'].append(current_album_for_artist)
@@ -316,54 +449,14 @@ def discover(request):
             except Exception as e:
                 messages.error(request, "Error processing artist results.")
 
-        # --- Search Users (SUPABASE version) ---
+        # --- Search Users (indexed search_users RPC) ---
         if search_type in ['all', 'users']:
-            try:
-                client = authenticate_with_jwt()
-                if not client:
-                    messages.error(request, "Could not connect to Supabase.")
-                    results['users'] = []
-                else:
-                    # Query users from Supabase
-                    user_response = client.table('soundscore_user') \
-                        .select('id,username,profile_picture') \
-                        .ilike('username', f'%{query}%') \
-                        .limit(10) \
-                        .execute()
-                    user_data = user_response.data or []
-                    user_list = []
-                    for user in user_data:
-                        supabase_user_id = user['id']
-                        # Fetch reviews for this user from Supabase
-                        review_response = client.table('soundscore_review') \
-                            .select('rating') \
-                            .eq('user_id', supabase_user_id) \
-                            .execute()
-                        review_data = review_response.data or []
-                        review_count = len(review_data)
-                        if review_count > 0:
-                            avg_rating = round(
-                                sum(r['rating'] for r in review_data if r.get('rating') is not None) / review_count, 1
-                            )
-                        else:
-                            avg_rating = 'No ratings'
-                        
-                        # Ensure profile_picture is handled correctly
-                        # Supabase storage URLs might need specific handling if not public
-                        profile_picture_url = user.get('profile_picture') 
-                        # If using Supabase storage and URLs aren't public, you might need 
-                        # to generate signed URLs or ensure the bucket is public.
-                        # For now, we assume the stored value is a direct URL or None.
-
-                        user_list.append({
-                            'username': user['username'],
-                            'profile_picture_url': profile_picture_url, # Pass the URL/path to the template
-                            'review_count': review_count,
-                            'avg_rating': avg_rating
-                        })
-                    results['users'] = user_list
-            except Exception as e:
-                messages.error(request, f"Could not fetch user results from Supabase: {e}")
+            user_results = search_users(query, page=request.GET.get('user_page', 1))
+            if "error" in user_results:
+                messages.error(request, f"Could not fetch user results from Supabase: {user_results['error']}")
+            else:
+                results['users'] = user_results['users']
+                results['users_has_more'] = user_results['has_more']
 
 
     context = {
@@ -375,57 +468,23 @@ def discover(request):
 
 @login_required
 def user_profile(request, username):
-    client = authenticate_with_jwt()
-    if not client:
-        messages.error(request, "Could not connect to Supabase.")
-        return redirect('home')
-
-    # Get user from Supabase
-    user_response = client.table('soundscore_user').select('id,username,profile_picture').eq('username', username).limit(1).execute()
-    if not user_response.data:
-        messages.error(request, f"User '{username}' not found in Supabase.")
+    profile = _profile_page(request, username)
+    if profile is None:
         return redirect('home')
-    profile_user = user_response.data[0]
-    supabase_user_id = profile_user['id']
-
-    # Get reviews by this user from Supabase, ordered by created_at desc
-    reviews_response = client.table('soundscore_review') \
-        .select('*, soundscore_album(title, artist, cover_image, spotify_id)') \
-        .eq('user_id', supabase_user_id) \
-        .order('created_at', desc=True) \
-        .execute()
-    user_reviews = reviews_response.data or []
-
-    # Calculate review statistics
-    review_count = len(user_reviews)
-    if review_count > 0:
-        avg_rating = round(
-            sum(r['rating'] for r in user_reviews if r.get('rating') is not None) / review_count, 1
-        )
-    else:
-        avg_rating = None
+    snapshot, page = profile
+    stats = snapshot["stats"]
 
     context = {
-        'profile_user': profile_user,
-        'user_reviews': user_reviews,
-        'review_count': review_count,
-        'avg_rating': avg_rating,
+        'profile_user': snapshot["user"],
+        'user_reviews': page["reviews"],
+        'next_cursor': page["next_cursor"],
+        'is_first_page': not request.GET.get('cursor'),
+        'review_count': stats["review_count"],
+        'avg_rating': stats["average_rating"],
         'is_own_profile': request.user.username == username
     }
     return render(request, 'reviews/user_profile.html', context)
 
-# Helper
-
-def get_album_avg_rating(spotify_id):
-    try:
-        db_album = Album.objects.filter(spotify_id=spotify_id).first()
-        if db_album:
-            avg_rating = Review.objects.filter(album=db_album).aggregate(Avg('rating'))['rating__avg']
-            return round(avg_rating, 1) if avg_rating is not None else None
-    except Album.DoesNotExist:
-        pass
-    return None
-
 @cache_page(60)
 @login_required
 def feed(request):
@@ -437,90 +496,20 @@ def feed(request):
         return render(request, 'reviews/feed.html', {'error': "Could not connect to Supabase."})
         
     try:
-        # Fetch reviews - same as before
-        reviews_response = client.table('soundscore_review')\
-            .select('*, soundscore_album(*), soundscore_user(*)')\
-            .order('created_at', desc=True)\
-            .limit(10)  # REDUCED from 20 to 10
-            
-        # Execute the query
-        reviews_response = reviews_response.execute()
-        reviews = reviews_response.data or []
-        
-        # Get all review IDs at once
-        review_ids = [review["id"] for review in reviews]
-        
-        # OPTIMIZATION 1: Batch fetch all comments at once
-        if review_ids:
-            all_comments = {}
-            comments_response = client.table('soundscore_comment')\
-                .select('*, soundscore_user(id, username, profile_picture)')\
-                .in_('review_id', review_ids)\
-                .order('created_at', desc=False)\
-                .execute()
-                
-            # Group comments by review_id
-            for comment in comments_response.data or []:
-                review_id = comment['review_id']
-                if review_id not in all_comments:
-                    all_comments[review_id] = []
-                all_comments[review_id].append(comment)
+        # First keyset page; load_more_reviews continues from next_cursor
+        reviews, next_cursor, has_more = fetch_feed_page(client, page_size=10, sort_order="desc")
         
-        # OPTIMIZATION 2: Batch count all likes at once
-        all_likes = {}
-        if review_ids:
-            try:
-                likes_count_response = client.table("soundscore_review_like")\
-                    .select("review_id", count="exact")\
-                    .in_("review_id", review_ids)\
-                    .group_by('review_id')\
-                    .execute()
-                
-                if likes_count_response.data:
-                    for item in likes_count_response.data:
-                        all_likes[item['review_id']] = item['count']
-            except:
-                # Fallback if group by fails
-                for review_id in review_ids:
-                    count_query = client.table("soundscore_review_like")\
-                        .select("*", count="exact")\
-                        .eq("review_id", review_id)\
-                        .execute()
-                    all_likes[review_id] = count_query.count if hasattr(count_query, 'count') else 0
-                
-        # OPTIMIZATION 3: If logged in, batch fetch user likes in one query
-        user_liked_reviews = set()
-        if request.user.is_authenticated and review_ids:
-            user_resp = client.table("soundscore_user").select("id").eq("username", request.user.username).limit(1).execute()
-            if user_resp.data:
-                user_id = user_resp.data[0]["id"]
-                user_likes = client.table("soundscore_review_like")\
-                    .select("review_id")\
-                    .eq("user_id", user_id)\
-                    .in_("review_id", review_ids)\
-                    .execute()
-                
-                user_liked_reviews = {like["review_id"] for like in user_likes.data or []}
+        # Comments, like counts and liked flags in a fixed number of batched queries
+        assembler = FeedAssembler(client, viewer_id=request.supabase_user_id, comments_per_review=3)
+        assembler.assemble(reviews)
 
         top_albums = get_top_3_albums()
 
-
-        # Now assign all the data to each review
-        for review in reviews:
-            review_id = review["id"]
-            # Assign comments (limited to 3 most recent)
-            review["comments"] = all_comments.get(review_id, [])[:3] 
-            review["comment_count"] = len(all_comments.get(review_id, []))
-            
-            # Assign like count
-            review["like_count"] = all_likes.get(review_id, 0)
-            
-            # Assign liked status
-            review["is_liked"] = review_id in user_liked_reviews
-
         context = {
             'reviews': reviews,
             'top_albums': top_albums,
+            'next_cursor': next_cursor or '',
+            'has_more': has_more,
         }
             
         # Render with optimized data
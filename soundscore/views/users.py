@@ -3,12 +3,14 @@ from django.contrib import messages
 from django.contrib.auth import login as auth_login, logout as auth_logout
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_POST, require_GET
+from django.http import JsonResponse
 from ..models import User
 from ..services.user.supabase_client import authenticate_with_jwt
 from ..services.user.add_user import add_user_supabase
 from ..services.user.update_user import update_user_supabase
 from ..services.user.delete_user import delete_user_data_supabase
+from ..services.user.user_search import search_users
 from ..validation.pydantic_schemas import RegisterSchema
 from pydantic import ValidationError
 
@@ -208,3 +210,21 @@ def delete_account(request):
 @login_required
 def delete_account_confirm(request):
     return render(request, 'users/delete_account_confirm.html')
+
+@login_required
+@require_GET
+def search_users_api(request):
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({"error": "Search query is required"}, status=400)
+
+    try:
+        page = int(request.GET.get('page', 1))
+        page_size = int(request.GET.get('page_size', 10))
+    except ValueError:
+        return JsonResponse({"error": "page and page_size must be numbers"}, status=400)
+
+    result = search_users(query, page, page_size)
+    if "error" in result:
+        return JsonResponse(result, status=500)
+    return JsonResponse(result)
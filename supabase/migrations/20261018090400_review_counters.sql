@@ -0,0 +1,60 @@
+-- Likes and comments are written through PostgREST, so the counters on the
+-- review row are maintained by triggers. reconcile_review_counters() repairs
+-- any drift and backfills existing reviews.
+ALTER TABLE soundscore_review
+    ADD COLUMN IF NOT EXISTS like_count integer NOT NULL DEFAULT 0 CHECK (like_count >= 0),
+    ADD COLUMN IF NOT EXISTS comment_count integer NOT NULL DEFAULT 0 CHECK (comment_count >= 0);
+
+CREATE OR REPLACE FUNCTION soundscore_review_like_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE soundscore_review SET like_count = like_count + 1 WHERE id = NEW.review_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE soundscore_review SET like_count = GREATEST(like_count - 1, 0) WHERE id = OLD.review_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS review_like_count ON soundscore_review_like;
+CREATE TRIGGER review_like_count
+    AFTER INSERT OR DELETE ON soundscore_review_like
+    FOR EACH ROW EXECUTE FUNCTION soundscore_review_like_count();
+
+CREATE OR REPLACE FUNCTION soundscore_review_comment_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE soundscore_review SET comment_count = comment_count + 1 WHERE id = NEW.review_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE soundscore_review SET comment_count = GREATEST(comment_count - 1, 0) WHERE id = OLD.review_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS review_comment_count ON soundscore_comment;
+CREATE TRIGGER review_comment_count
+    AFTER INSERT OR DELETE ON soundscore_comment
+    FOR EACH ROW EXECUTE FUNCTION soundscore_review_comment_count();
+
+CREATE OR REPLACE FUNCTION reconcile_review_counters() RETURNS integer AS $$
+DECLARE
+    repaired integer;
+BEGIN
+    WITH actual AS (
+        SELECT r.id,
+               (SELECT count(*) FROM soundscore_review_like l WHERE l.review_id = r.id) AS likes,
+               (SELECT count(*) FROM soundscore_comment c WHERE c.review_id = r.id) AS comments
+        FROM soundscore_review r
+    )
+    UPDATE soundscore_review r
+    SET like_count = actual.likes, comment_count = actual.comments
+    FROM actual
+    WHERE r.id = actual.id
+      AND (r.like_count <> actual.likes OR r.comment_count <> actual.comments);
+    GET DIAGNOSTICS repaired = ROW_COUNT;
+    RETURN repaired;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+SELECT reconcile_review_counters();
@@ -0,0 +1,30 @@
+-- Flip a like in one round trip: lock the review, delete or insert the like
+-- and return the new state with the trigger-maintained like_count.
+CREATE OR REPLACE FUNCTION toggle_review_like(p_user_id bigint, p_review_id bigint)
+RETURNS TABLE (liked boolean, like_count integer, author_id bigint) AS $$
+DECLARE
+    removed integer;
+BEGIN
+    -- Serialize toggles on the same review so double clicks cannot race
+    PERFORM 1 FROM soundscore_review r WHERE r.id = p_review_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    DELETE FROM soundscore_review_like l
+    WHERE l.user_id = p_user_id AND l.review_id = p_review_id;
+    GET DIAGNOSTICS removed = ROW_COUNT;
+
+    IF removed = 0 THEN
+        INSERT INTO soundscore_review_like (user_id, review_id) VALUES (p_user_id, p_review_id);
+        liked := true;
+    ELSE
+        liked := false;
+    END IF;
+
+    -- like_count was already adjusted by the review_like_count trigger
+    SELECT r.like_count, r.user_id INTO like_count, author_id
+    FROM soundscore_review r WHERE r.id = p_review_id;
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
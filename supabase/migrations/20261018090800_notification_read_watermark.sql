@@ -0,0 +1,25 @@
+-- "Mark all as read" moves a per-user watermark instead of updating every
+-- notification row.
+ALTER TABLE soundscore_user ADD COLUMN IF NOT EXISTS notifications_read_at timestamptz;
+
+-- Unread counting only looks at notifications newer than the watermark
+CREATE INDEX IF NOT EXISTS soundscore_notification_recipient_created
+    ON soundscore_notification (recipient_id, created_at DESC);
+
+-- Stamped with the database clock, so it orders correctly against
+-- notification created_at values whatever the app server's clock says
+CREATE OR REPLACE FUNCTION mark_notifications_read(p_user_id bigint)
+RETURNS timestamptz AS $$
+    UPDATE soundscore_user SET notifications_read_at = now()
+    WHERE id = p_user_id
+    RETURNING notifications_read_at;
+$$ LANGUAGE sql;
+
+-- Notifications with the recipient's watermark already applied: "seen" is
+-- true for rows marked read individually or older than the watermark, so
+-- listings and unread counts need no separate watermark lookup
+CREATE OR REPLACE VIEW soundscore_notification_inbox WITH (security_invoker = true) AS
+SELECT n.*,
+       (n.is_read OR (u.notifications_read_at IS NOT NULL AND n.created_at <= u.notifications_read_at)) AS seen
+FROM soundscore_notification n
+JOIN soundscore_user u ON u.id = n.recipient_id;
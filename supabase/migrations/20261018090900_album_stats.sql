@@ -0,0 +1,84 @@
+-- Per-album rating aggregates. Reviews are written through PostgREST, so a
+-- trigger on soundscore_review keeps them current and top albums becomes an
+-- index scan instead of an aggregate over every review.
+CREATE TABLE IF NOT EXISTS soundscore_albumstats (
+    album_id bigint PRIMARY KEY REFERENCES soundscore_album (id) ON DELETE CASCADE,
+    rating_sum integer NOT NULL DEFAULT 0,
+    rating_count integer NOT NULL DEFAULT 0,
+    rating_1 integer NOT NULL DEFAULT 0,
+    rating_2 integer NOT NULL DEFAULT 0,
+    rating_3 integer NOT NULL DEFAULT 0,
+    rating_4 integer NOT NULL DEFAULT 0,
+    rating_5 integer NOT NULL DEFAULT 0,
+    avg_rating double precision NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS albumstats_top_idx
+    ON soundscore_albumstats (avg_rating DESC, rating_count DESC);
+
+-- Every column is clamped at 0 and the average is 0 once no reviews are
+-- left, so a drifted row can never go negative or divide by zero
+CREATE OR REPLACE FUNCTION soundscore_album_stats_apply(p_album_id bigint, p_rating integer, p_sign integer)
+RETURNS void AS $$
+BEGIN
+    INSERT INTO soundscore_albumstats (album_id) VALUES (p_album_id)
+    ON CONFLICT (album_id) DO NOTHING;
+
+    UPDATE soundscore_albumstats SET
+        rating_sum = GREATEST(rating_sum + p_sign * p_rating, 0),
+        rating_count = GREATEST(rating_count + p_sign, 0),
+        rating_1 = GREATEST(rating_1 + CASE WHEN p_rating = 1 THEN p_sign ELSE 0 END, 0),
+        rating_2 = GREATEST(rating_2 + CASE WHEN p_rating = 2 THEN p_sign ELSE 0 END, 0),
+        rating_3 = GREATEST(rating_3 + CASE WHEN p_rating = 3 THEN p_sign ELSE 0 END, 0),
+        rating_4 = GREATEST(rating_4 + CASE WHEN p_rating = 4 THEN p_sign ELSE 0 END, 0),
+        rating_5 = GREATEST(rating_5 + CASE WHEN p_rating = 5 THEN p_sign ELSE 0 END, 0),
+        avg_rating = CASE
+            WHEN rating_count + p_sign > 0
+            THEN GREATEST(rating_sum + p_sign * p_rating, 0)::float / (rating_count + p_sign)
+            ELSE 0
+        END
+    WHERE album_id = p_album_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION soundscore_review_album_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM soundscore_album_stats_apply(OLD.album_id, OLD.rating, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM soundscore_album_stats_apply(NEW.album_id, NEW.rating, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS review_album_stats ON soundscore_review;
+CREATE TRIGGER review_album_stats
+    AFTER INSERT OR DELETE OR UPDATE OF rating, album_id ON soundscore_review
+    FOR EACH ROW EXECUTE FUNCTION soundscore_review_album_stats();
+
+CREATE OR REPLACE FUNCTION rebuild_album_stats() RETURNS integer AS $$
+DECLARE
+    rebuilt integer;
+BEGIN
+    DELETE FROM soundscore_albumstats;
+    INSERT INTO soundscore_albumstats
+        (album_id, rating_sum, rating_count, rating_1, rating_2, rating_3, rating_4, rating_5, avg_rating)
+    SELECT album_id,
+           sum(rating),
+           count(*),
+           count(*) FILTER (WHERE rating = 1),
+           count(*) FILTER (WHERE rating = 2),
+           count(*) FILTER (WHERE rating = 3),
+           count(*) FILTER (WHERE rating = 4),
+           count(*) FILTER (WHERE rating = 5),
+           avg(rating)::float
+    FROM soundscore_review
+    GROUP BY album_id;
+    GET DIAGNOSTICS rebuilt = ROW_COUNT;
+    RETURN rebuilt;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+SELECT rebuild_album_stats();
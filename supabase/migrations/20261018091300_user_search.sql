@@ -0,0 +1,45 @@
+-- Username search for discover: a trigram index makes both prefix and
+-- substring ILIKE matches indexable, and the RPC returns each match with its
+-- review count and average rating from a single aggregate query.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS soundscore_user_username_trgm
+    ON soundscore_user USING GIN (lower(username) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS soundscore_review_user_rating
+    ON soundscore_review (user_id, rating);
+
+CREATE OR REPLACE FUNCTION search_users(p_query text, p_limit integer DEFAULT 10, p_offset integer DEFAULT 0)
+RETURNS TABLE (
+    id bigint,
+    username varchar,
+    profile_picture varchar,
+    review_count bigint,
+    avg_rating numeric
+) AS $$
+#variable_conflict use_column
+DECLARE
+    pattern text := '%' || replace(replace(replace(lower(p_query), '\', '\\'), '%', '\%'), '_', '\_') || '%';
+    prefix text := replace(replace(replace(lower(p_query), '\', '\\'), '%', '\%'), '_', '\_') || '%';
+BEGIN
+    RETURN QUERY
+    WITH matched AS (
+        SELECT u.id, u.username, u.profile_picture
+        FROM soundscore_user u
+        WHERE lower(u.username) LIKE pattern
+        ORDER BY lower(u.username) LIKE prefix DESC,
+                 similarity(lower(u.username), lower(p_query)) DESC,
+                 u.username
+        LIMIT p_limit OFFSET p_offset
+    )
+    SELECT m.id, m.username, m.profile_picture,
+           count(r.id) AS review_count,
+           round(avg(r.rating), 1) AS avg_rating
+    FROM matched m
+    LEFT JOIN soundscore_review r ON r.user_id = m.id
+    GROUP BY m.id, m.username, m.profile_picture
+    ORDER BY lower(m.username) LIKE prefix DESC,
+             similarity(lower(m.username), lower(p_query)) DESC,
+             m.username;
+END;
+$$ LANGUAGE plpgsql STABLE;
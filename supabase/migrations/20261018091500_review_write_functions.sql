@@ -0,0 +1,140 @@
+-- Review writes in one round trip each. Every function runs in the RPC's
+-- transaction, locks the rows it changes and returns what the caller needs to
+-- refresh caches, rankings and indexes (album ids, the old and new rating and
+-- the review's created_at). Rating aggregates follow via review_album_stats.
+CREATE OR REPLACE FUNCTION save_review(
+    p_user_id bigint,
+    p_spotify_id text,
+    p_rating integer,
+    p_text text DEFAULT '',
+    p_is_favorite boolean DEFAULT false,
+    p_album_title text DEFAULT NULL,
+    p_album_artist text DEFAULT NULL,
+    p_album_cover text DEFAULT NULL
+)
+RETURNS TABLE (
+    review_id bigint,
+    album_id bigint,
+    spotify_id varchar,
+    album_artist varchar,
+    album_created boolean,
+    review_created boolean,
+    previous_rating integer,
+    rating integer,
+    created_at timestamptz
+) AS $$
+#variable_conflict use_column
+DECLARE
+    v_album_id bigint;
+    v_artist varchar;
+    v_album_created boolean := false;
+    v_previous integer;
+BEGIN
+    IF p_rating < 1 OR p_rating > 5 THEN
+        RAISE EXCEPTION 'Rating must be between 1 and 5';
+    END IF;
+
+    SELECT a.id, a.artist INTO v_album_id, v_artist
+    FROM soundscore_album a WHERE a.spotify_id = p_spotify_id;
+
+    IF v_album_id IS NULL THEN
+        IF p_album_title IS NULL OR p_album_artist IS NULL THEN
+            RAISE EXCEPTION 'Album title and artist are required to create a new album';
+        END IF;
+        INSERT INTO soundscore_album (spotify_id, title, artist, cover_image)
+        VALUES (p_spotify_id, p_album_title, p_album_artist, p_album_cover)
+        ON CONFLICT (spotify_id) DO NOTHING
+        RETURNING id, artist INTO v_album_id, v_artist;
+
+        IF v_album_id IS NULL THEN
+            -- Lost a race with a concurrent insert of the same album
+            SELECT a.id, a.artist INTO v_album_id, v_artist
+            FROM soundscore_album a WHERE a.spotify_id = p_spotify_id;
+        ELSE
+            v_album_created := true;
+        END IF;
+    END IF;
+
+    SELECT r.rating INTO v_previous
+    FROM soundscore_review r
+    WHERE r.user_id = p_user_id AND r.album_id = v_album_id
+    FOR UPDATE;
+
+    RETURN QUERY
+    INSERT INTO soundscore_review AS r
+        (user_id, album_id, rating, text, is_favorite, created_at, updated_at, like_count, comment_count)
+    VALUES
+        (p_user_id, v_album_id, p_rating, coalesce(p_text, ''), p_is_favorite, now(), now(), 0, 0)
+    ON CONFLICT (user_id, album_id) DO UPDATE
+        SET rating = EXCLUDED.rating,
+            text = EXCLUDED.text,
+            is_favorite = EXCLUDED.is_favorite,
+            updated_at = now()
+    RETURNING r.id, r.album_id, p_spotify_id::varchar, v_artist, v_album_created,
+              v_previous IS NULL, v_previous, r.rating, r.created_at;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION edit_review(
+    p_user_id bigint,
+    p_review_id bigint,
+    p_rating integer,
+    p_text text DEFAULT '',
+    p_is_favorite boolean DEFAULT false
+)
+RETURNS TABLE (
+    review_id bigint,
+    album_id bigint,
+    spotify_id varchar,
+    album_artist varchar,
+    previous_rating integer,
+    rating integer,
+    created_at timestamptz
+) AS $$
+#variable_conflict use_column
+DECLARE
+    v_previous integer;
+BEGIN
+    IF p_rating < 1 OR p_rating > 5 THEN
+        RAISE EXCEPTION 'Rating must be between 1 and 5';
+    END IF;
+
+    -- Scoped by owner: someone else's review looks exactly like a missing one
+    SELECT r.rating INTO v_previous
+    FROM soundscore_review r
+    WHERE r.id = p_review_id AND r.user_id = p_user_id
+    FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    UPDATE soundscore_review r
+    SET rating = p_rating,
+        text = coalesce(p_text, ''),
+        is_favorite = p_is_favorite,
+        updated_at = now()
+    FROM soundscore_album a
+    WHERE r.id = p_review_id AND a.id = r.album_id
+    RETURNING r.id, r.album_id, a.spotify_id, a.artist, v_previous, r.rating, r.created_at;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION delete_review(p_user_id bigint, p_review_id bigint)
+RETURNS TABLE (
+    review_id bigint,
+    album_id bigint,
+    spotify_id varchar,
+    album_artist varchar,
+    rating integer,
+    created_at timestamptz
+) AS $$
+#variable_conflict use_column
+BEGIN
+    RETURN QUERY
+    DELETE FROM soundscore_review r
+    USING soundscore_album a
+    WHERE r.id = p_review_id AND r.user_id = p_user_id AND a.id = r.album_id
+    RETURNING r.id, r.album_id, a.spotify_id, a.artist, r.rating, r.created_at;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,2 @@
+-- Keyset chunks for the review export: WHERE user_id = ? AND id > ? ORDER BY id
+CREATE INDEX IF NOT EXISTS review_user_id_idx ON soundscore_review (user_id, id);
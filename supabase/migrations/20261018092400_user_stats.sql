@@ -0,0 +1,83 @@
+-- Per-user review aggregates for the profile header. Same approach as the
+-- album aggregates: reviews are written through Supabase, so a trigger on
+-- soundscore_review keeps the per-user record current.
+CREATE TABLE IF NOT EXISTS soundscore_userstats (
+    user_id bigint PRIMARY KEY REFERENCES soundscore_user (id) ON DELETE CASCADE,
+    review_count integer NOT NULL DEFAULT 0,
+    rating_sum integer NOT NULL DEFAULT 0,
+    favorite_count integer NOT NULL DEFAULT 0,
+    rating_1 integer NOT NULL DEFAULT 0,
+    rating_2 integer NOT NULL DEFAULT 0,
+    rating_3 integer NOT NULL DEFAULT 0,
+    rating_4 integer NOT NULL DEFAULT 0,
+    rating_5 integer NOT NULL DEFAULT 0
+);
+
+-- Profile review pages and the favorites strip, newest first
+CREATE INDEX IF NOT EXISTS review_user_recent_idx
+    ON soundscore_review (user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS review_user_favorites_idx
+    ON soundscore_review (user_id, created_at DESC) WHERE is_favorite;
+
+-- Every column is clamped at 0, so a drifted row can never go negative
+CREATE OR REPLACE FUNCTION soundscore_user_stats_apply(
+    p_user_id bigint, p_rating integer, p_favorite boolean, p_sign integer
+) RETURNS void AS $$
+BEGIN
+    INSERT INTO soundscore_userstats (user_id) VALUES (p_user_id)
+    ON CONFLICT (user_id) DO NOTHING;
+
+    UPDATE soundscore_userstats SET
+        review_count = GREATEST(review_count + p_sign, 0),
+        rating_sum = GREATEST(rating_sum + p_sign * p_rating, 0),
+        favorite_count = GREATEST(favorite_count + CASE WHEN p_favorite THEN p_sign ELSE 0 END, 0),
+        rating_1 = GREATEST(rating_1 + CASE WHEN p_rating = 1 THEN p_sign ELSE 0 END, 0),
+        rating_2 = GREATEST(rating_2 + CASE WHEN p_rating = 2 THEN p_sign ELSE 0 END, 0),
+        rating_3 = GREATEST(rating_3 + CASE WHEN p_rating = 3 THEN p_sign ELSE 0 END, 0),
+        rating_4 = GREATEST(rating_4 + CASE WHEN p_rating = 4 THEN p_sign ELSE 0 END, 0),
+        rating_5 = GREATEST(rating_5 + CASE WHEN p_rating = 5 THEN p_sign ELSE 0 END, 0)
+    WHERE user_id = p_user_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION soundscore_review_user_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM soundscore_user_stats_apply(OLD.user_id, OLD.rating, OLD.is_favorite, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM soundscore_user_stats_apply(NEW.user_id, NEW.rating, NEW.is_favorite, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS review_user_stats ON soundscore_review;
+CREATE TRIGGER review_user_stats
+    AFTER INSERT OR DELETE OR UPDATE OF rating, is_favorite, user_id ON soundscore_review
+    FOR EACH ROW EXECUTE FUNCTION soundscore_review_user_stats();
+
+CREATE OR REPLACE FUNCTION rebuild_user_stats() RETURNS integer AS $$
+DECLARE
+    rebuilt integer;
+BEGIN
+    DELETE FROM soundscore_userstats;
+    INSERT INTO soundscore_userstats
+        (user_id, review_count, rating_sum, favorite_count, rating_1, rating_2, rating_3, rating_4, rating_5)
+    SELECT user_id,
+           count(*),
+           sum(rating),
+           count(*) FILTER (WHERE is_favorite),
+           count(*) FILTER (WHERE rating = 1),
+           count(*) FILTER (WHERE rating = 2),
+           count(*) FILTER (WHERE rating = 3),
+           count(*) FILTER (WHERE rating = 4),
+           count(*) FILTER (WHERE rating = 5)
+    FROM soundscore_review
+    GROUP BY user_id;
+    GET DIAGNOSTICS rebuilt = ROW_COUNT;
+    RETURN rebuilt;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+SELECT rebuild_user_stats();
@@ -0,0 +1,3 @@
+-- Album page reviews, newest first: WHERE album_id = ? ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS review_album_recent_idx
+    ON soundscore_review (album_id, created_at DESC, id DESC);
@@ -0,0 +1,19 @@
+-- The newest p_per_review comments of each review on a feed page, ranked in
+-- the database so the rows sent back grow with the page size rather than
+-- with how many comments those reviews have. Returns soundscore_comment
+-- rows, so callers can still embed soundscore_user through PostgREST.
+CREATE INDEX IF NOT EXISTS soundscore_comment_review_created
+    ON soundscore_comment (review_id, created_at DESC);
+
+CREATE OR REPLACE FUNCTION recent_review_comments(p_review_ids bigint[], p_per_review integer)
+RETURNS SETOF soundscore_comment AS $$
+    SELECT (ranked.c).*
+    FROM (
+        SELECT c,
+               row_number() OVER (PARTITION BY c.review_id ORDER BY c.created_at DESC, c.id DESC) AS rn
+        FROM soundscore_comment c
+        WHERE c.review_id = ANY (p_review_ids)
+    ) ranked
+    WHERE ranked.rn <= p_per_review
+    ORDER BY (ranked.c).review_id, (ranked.c).created_at DESC, (ranked.c).id DESC;
+$$ LANGUAGE sql STABLE;
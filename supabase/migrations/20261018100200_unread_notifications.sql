@@ -0,0 +1,30 @@
+-- Unread notifications bounded by the read watermark. Filtering the inbox
+-- view on its computed "seen" column visits the recipient's whole history;
+-- here created_at > notifications_read_at is an index condition on
+-- soundscore_notification_recipient_created, so the cost follows the
+-- activity since "mark all as read", not the history before it.
+CREATE OR REPLACE FUNCTION count_unread_notifications(p_user_id bigint)
+RETURNS integer AS $$
+    SELECT count(*)::integer
+    FROM soundscore_notification n
+    WHERE n.recipient_id = p_user_id
+      AND n.created_at > coalesce(
+          (SELECT u.notifications_read_at FROM soundscore_user u WHERE u.id = p_user_id),
+          '-infinity'::timestamptz)
+      AND NOT n.is_read;
+$$ LANGUAGE sql STABLE;
+
+-- Newest first; returns soundscore_notification rows so PostgREST can still
+-- embed the actor, review and comment
+CREATE OR REPLACE FUNCTION unread_notifications(p_user_id bigint, p_limit integer DEFAULT 20, p_offset integer DEFAULT 0)
+RETURNS SETOF soundscore_notification AS $$
+    SELECT n.*
+    FROM soundscore_notification n
+    WHERE n.recipient_id = p_user_id
+      AND n.created_at > coalesce(
+          (SELECT u.notifications_read_at FROM soundscore_user u WHERE u.id = p_user_id),
+          '-infinity'::timestamptz)
+      AND NOT n.is_read
+    ORDER BY n.created_at DESC
+    LIMIT p_limit OFFSET p_offset;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,25 @@
+-- Full-text album catalog on the Supabase table. The generated column is
+-- computed for every existing soundscore_album row when it is added, so the
+-- catalog starts out covering all albums that were ever reviewed.
+ALTER TABLE soundscore_album ADD COLUMN IF NOT EXISTS release_date varchar(20);
+
+ALTER TABLE soundscore_album ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(artist, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS soundscore_album_search_idx
+    ON soundscore_album USING GIN (search_vector);
+
+-- p_query is a prefix tsquery such as 'radio:* & ok:*', built by the app
+-- from the word characters of the user's input; title matches rank first
+CREATE OR REPLACE FUNCTION search_album_catalog(p_query text, p_limit integer DEFAULT 10)
+RETURNS TABLE (spotify_id varchar, title varchar, artist varchar, cover_image varchar, release_date varchar) AS $$
+    SELECT a.spotify_id, a.title, a.artist, a.cover_image, a.release_date
+    FROM soundscore_album a
+    WHERE a.search_vector @@ to_tsquery('simple', p_query)
+      AND a.spotify_id IS NOT NULL
+    ORDER BY ts_rank(a.search_vector, to_tsquery('simple', p_query)) DESC, a.id
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;